@@ -0,0 +1,94 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 17 Oct 2026
+
+'''
+'''
+benchmark of the peak memory and the time of reading a large CSV data set in a dictionary
+of lists (ImportCSVdata.Input_data) against reading it in chunks of NumPy arrays
+(ImportChunkedData.CSV_chunks) and computing the running measures of a column.
+every reader runs in its own process so that their peak memory can be compared.
+usage: python -m dream.KnowledgeExtraction.Benchmarks.ChunkedImport [number of rows]
+'''
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy
+
+READERS=['list', 'chunks']
+
+# ===========================================================================
+# writes a CSV data set of processing times of stations with the given number of rows
+# ===========================================================================
+def writeDataSet(fileName, rows):
+    random=numpy.random.RandomState(0)
+    with open(fileName, 'w') as csvFile:
+        csvFile.write('Station,Part,ProcTime\n')
+        for start in xrange(0, rows, 100000):
+            size=min(100000, rows-start)
+            stations=random.randint(1, 10, size)
+            times=random.gamma(2, 1.5, size)
+            csvFile.writelines('St%d,P%d,%.4f\n' % (stations[i], start+i, times[i]) for i in xrange(size))
+
+# ===========================================================================
+# reads the data set with the given reader, returns the mean processing time,
+# the time it took and the peak memory (RSS) of the process in MB
+# ===========================================================================
+def read(fileName, reader):
+    start=time.time()
+    if reader=='list':
+        from dream.KnowledgeExtraction.ImportCSVdata import ImportCSVdata
+        dictData=ImportCSVdata().Input_data(fileName)
+        mean=numpy.mean([float(value) for value in dictData['ProcTime']])
+    else:
+        from dream.KnowledgeExtraction.ImportChunkedData import ImportChunkedData
+        from dream.KnowledgeExtraction.StatisticalMeasures import RunningMeasures
+        runningMeasures=RunningMeasures()
+        for chunk in ImportChunkedData().CSV_chunks(fileName, columns=['ProcTime']):
+            runningMeasures.update(chunk['ProcTime'])
+        mean=runningMeasures.mean
+    return mean, time.time()-start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024.
+
+def main(argv=None):
+    argv=argv or sys.argv[1:]
+    if argv and argv[0]=='--read':
+        print '%r %r %r' % read(argv[1], argv[2])
+        return
+    rows=int(argv[0]) if argv else 1000000
+    fd, fileName=tempfile.mkstemp(suffix='.csv')
+    os.close(fd)
+    try:
+        writeDataSet(fileName, rows)
+        print '%d rows, %.1f MB' % (rows, os.path.getsize(fileName)/1048576.)
+        for reader in READERS:
+            output=subprocess.check_output([sys.executable, '-m', 'dream.KnowledgeExtraction.Benchmarks.ChunkedImport',
+                                            '--read', fileName, reader])
+            mean, duration, peakMemory=map(float, output.split())
+            print '    %s: mean %.6f, %.2f s, peak memory %.1f MB' % (reader, mean, duration, peakMemory)
+    finally:
+        os.remove(fileName)
+
+if __name__ == '__main__':
+    main()
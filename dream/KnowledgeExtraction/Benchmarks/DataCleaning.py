@@ -0,0 +1,103 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 17 Oct 2026
+
+'''
+'''
+benchmark of the throughput of the missing value and outlier handling of the KE tool: the
+per value loops that ReplaceMissingValues and DetectOutliers used before, against the same
+steps on every column with the current methods and on all the columns at once with
+CleaningPipeline.
+usage: python -m dream.KnowledgeExtraction.Benchmarks.DataCleaning [number of columns] [samples per column]
+'''
+
+import sys
+import time
+
+import numpy
+
+from dream.KnowledgeExtraction.StatisticalMeasures import StatisticalMeasures
+from dream.KnowledgeExtraction.ReplaceMissingValues import ReplaceMissingValues
+from dream.KnowledgeExtraction.DetectOutliers import DetectOutliers
+from dream.KnowledgeExtraction.CleaningPipeline import CleaningPipeline
+
+# ===========================================================================
+# the per value loops of ReplaceWithMean and DeleteOutliers as they were
+# ===========================================================================
+def loopReplaceWithMean(mylist):
+    measures=StatisticalMeasures()
+    mean=measures.mean([value for value in mylist if value != ''])
+    for i, value in enumerate(mylist):
+        if value == '':
+            mylist[i]=mean
+    return mylist
+
+def loopDeleteOutliers(mylist):
+    measures=StatisticalMeasures()
+    quantile=measures.quantile(mylist)
+    IQ=quantile[3]-quantile[1]
+    LIF=quantile[1]-1.5*IQ
+    UIF=quantile[3]+1.5*IQ
+    return [value for value in mylist if not (float(value)<float(LIF) or float(value)>float(UIF))]
+
+# ===========================================================================
+# returns the processing times of the stations with 1% missing values
+# ===========================================================================
+def getColumns(columns, samples):
+    random=numpy.random.RandomState(0)
+    columnDict={}
+    for i in range(columns):
+        values=random.gamma(2, 1.5, samples).tolist()
+        for index in random.randint(0, samples, samples//100):
+            values[index]=''
+        columnDict['M%d' % (i+1)]=values
+    return columnDict
+
+def main(argv=None):
+    argv=argv or sys.argv[1:]
+    columns=int(argv[0]) if argv else 4
+    samples=int(argv[1]) if len(argv)>1 else 1000000
+    columnDict=getColumns(columns, samples)
+    print '%d columns of %d samples, replace with mean and delete outliers' % (columns, samples)
+    timeDict={}
+    start=time.time()
+    loopDict=dict((name, loopDeleteOutliers(loopReplaceWithMean(list(values)))) for name, values in columnDict.iteritems())
+    timeDict['loops']=time.time()-start
+    start=time.time()
+    methodDict=dict((name, DetectOutliers().DeleteOutliers(ReplaceMissingValues().ReplaceWithMean(list(values))))
+                    for name, values in columnDict.iteritems())
+    timeDict['methods']=time.time()-start
+    start=time.time()
+    pipelineDict=CleaningPipeline().replaceWithMean().deleteOutliers().run(columnDict)
+    timeDict['pipeline']=time.time()-start
+    #The columns read by ImportChunkedData are float arrays with NaN for the empty cells
+    arrayDict=dict((name, numpy.array([numpy.nan if value=='' else value for value in values]))
+                   for name, values in columnDict.iteritems())
+    start=time.time()
+    CleaningPipeline().replaceWithMean().deleteOutliers().run(arrayDict)
+    timeDict['pipeline on arrays']=time.time()-start
+    for name in sorted(columnDict):
+        assert len(loopDict[name])==len(methodDict[name])==len(pipelineDict[name])
+    for method in ['loops', 'methods', 'pipeline', 'pipeline on arrays']:
+        print '    %s: %.3f s, %.2f million samples per second' \
+                % (method, timeDict[method], columns*samples/timeDict[method]/1e6)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 17 Oct 2026
+
+'''
+'''
+benchmark of the Kolmogorov-Smirnov distribution fitting (DistFittest.ks_test) of the
+NumPy implementation against the R one (RDistributionFitting, if RPy2 and R are installed),
+on the processing times of the KE tool examples.
+usage: python -m dream.KnowledgeExtraction.Benchmarks.DistributionFittingBackends [workbook.xls ...]
+the processing times are read from the first worksheet of every workbook
+'''
+
+import os
+import sys
+import time
+
+import xlrd
+
+from dream.KnowledgeExtraction.ImportExceldata import ImportExceldata
+from dream.KnowledgeExtraction.DistributionFitting import DistFittest
+
+KE_EXAMPLES=os.path.join(os.path.dirname(__file__), '..', 'KEtool_examples')
+DEFAULT_WORKBOOKS=[os.path.join('KEGUI_integration', 'Mockup_ProcessingTimes.xls'),
+                   os.path.join('TwoServers', 'inputsTwoServers.xls'),
+                   os.path.join('TwoParallelStations', 'inputData.xls')]
+
+# ===========================================================================
+# returns the data samples of the first worksheet of the workbook by their name,
+# without the cells that are not numbers
+# ===========================================================================
+def getDataSamples(path):
+    workbook=xlrd.open_workbook(path)
+    worksheetDict=ImportExceldata().Input_data(workbook.sheet_names()[0], workbook)
+    sampleDict={}
+    for name, values in worksheetDict.iteritems():
+        values=[value for value in values if isinstance(value, float)]
+        if len(values)>1:
+            sampleDict[name]=values
+    return sampleDict
+
+# ===========================================================================
+# returns the fitted distributions of the samples and the time it took
+# ===========================================================================
+def fitSamples(distFittest, sampleDict):
+    start=time.time()
+    fitDict={}
+    for name, values in sampleDict.iteritems():
+        fitDict[name]=distFittest.ks_test(values)
+    return fitDict, time.time()-start
+
+def main(argv=None):
+    argv=argv or sys.argv[1:]
+    workbooks=argv or [os.path.join(KE_EXAMPLES, workbook) for workbook in DEFAULT_WORKBOOKS]
+    try:
+        from dream.KnowledgeExtraction.RDistributionFitting import DistFittest as RDistFittest
+    except ImportError:
+        RDistFittest=None
+        print 'RPy2 or R is not installed, only the NumPy implementation is timed'
+    for workbook in workbooks:
+        sampleDict=getDataSamples(workbook)
+        DistFittest.cache.clear()
+        fitDict, numpyTime=fitSamples(DistFittest(), sampleDict)
+        cachedFitDict, cachedTime=fitSamples(DistFittest(), sampleDict)
+        print '%s (%d samples): NumPy %.4f s, NumPy cached %.4f s' \
+                % (os.path.basename(workbook), len(sampleDict), numpyTime, cachedTime)
+        if RDistFittest is not None:
+            rFitDict, rTime=fitSamples(RDistFittest(), sampleDict)
+            print '    R %.4f s, %.1f times slower' % (rTime, rTime/numpyTime)
+        for name in sorted(fitDict):
+            line='    %s: %s' % (name, fitDict[name])
+            if RDistFittest is not None:
+                line+=' / R: %s' % rFitDict[name]
+            print line
+
+if __name__ == '__main__':
+    main()
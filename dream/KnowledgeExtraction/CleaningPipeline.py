@@ -0,0 +1,162 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 17 Oct 2026
+
+'''
+from itertools import compress
+
+import numpy
+
+from ImportChunkedData import toArray
+
+#The methods of the CleaningPipeline object that are steps of the pipeline
+STEPS=['deleteMissingValues','replaceWithZero','replaceWithMean','replaceWithMedian','deleteOutliers','deleteExtremeOutliers']
+
+def missingMask(values):                #returns a boolean array that is True for the missing values ('', None or NaN) of a column
+    array=toArray(values)
+    if array.dtype==object:
+        return numpy.array([value is None or value=='' for value in values],dtype=bool)
+    return numpy.isnan(array)
+
+def toMaskedArray(columnList):          #stacks columns of the same length in a masked array with a row per column, the missing values are NaN
+    array=numpy.empty((len(columnList),len(columnList[0])))
+    for row,values in enumerate(columnList):
+        array[row]=toArray(values)
+    return numpy.ma.MaskedArray(array,mask=numpy.zeros(array.shape,dtype=bool))
+
+def present(masked):                    #the values of a masked array that are neither deleted (masked) nor missing (NaN)
+    return ~numpy.ma.getmaskarray(masked)&~numpy.isnan(masked.data)
+
+def rowQuantiles(masked,probabilities):     #the quantiles of the present values of every row, as numpy.percentile (type 7 in R) gives them
+    valid=present(masked)
+    counts=valid.sum(axis=1)
+    indexList=[]
+    for probability in probabilities:
+        indices=probability*(counts-1)
+        below=numpy.maximum(numpy.floor(indices).astype(int),0)
+        above=numpy.minimum(below+1,numpy.maximum(counts-1,0))
+        indexList.append((indices,below,above))
+    #The values that are not present go to the end, only the values at the indices of the quantiles are put in their sorted place
+    kth=numpy.unique(numpy.concatenate([numpy.concatenate((below,above)) for indices,below,above in indexList]))
+    partitioned=numpy.partition(numpy.where(valid,masked.data,numpy.inf),kth,axis=1)
+    rows=numpy.arange(len(counts))
+    quantileList=[]
+    with numpy.errstate(all='ignore'):
+        for indices,below,above in indexList:
+            weightAbove=indices-below
+            quantile=partitioned[rows,below]*(1.0-weightAbove)+partitioned[rows,above]*weightAbove
+            quantile[counts==0]=numpy.nan
+            quantileList.append(quantile)
+    return quantileList
+
+def rowMeans(masked):                   #the means of the present values of every row, accumulated in extended precision as StatisticalMeasures.mean
+    valid=present(masked)
+    counts=valid.sum(axis=1)
+    extendedArray=numpy.where(valid,masked.data,0).astype(numpy.longdouble)
+    with numpy.errstate(all='ignore'):
+        extendedMean=extendedArray.sum(axis=1)/counts
+        extendedMean+=numpy.where(valid,extendedArray-extendedMean[:,None],0).sum(axis=1)/counts
+    return extendedMean.astype(float)
+
+def fences(masked,factor):              #the lower and upper fences (Q1-factor*IQR, Q3+factor*IQR) of every row
+    Q1,Q3=rowQuantiles(masked,[0.25,0.75])
+    IQ=Q3-Q1
+    return Q1-factor*IQ,Q3+factor*IQ
+
+#The CleaningPipeline object
+class CleaningPipeline(object):
+#A sequence of steps that handle the missing values and the outliers of many data columns at once. The columns of the same
+#length are stacked in a masked array, the missing values are NaN and the deleted values are masked, so every step is one
+#vectorized operation on all of them. The steps are chained, e.g. CleaningPipeline().replaceWithMean().deleteOutliers(),
+#and are the same as the methods of ReplaceMissingValues and DetectOutliers applied one after the other on every column
+    def __init__(self,steps=()):
+        self.steps=[]
+        for step in steps:
+            self.addStep(step)
+
+    def addStep(self,step):
+        if step not in STEPS:
+            raise ValueError('unknown cleaning step %r' % step)
+        self.steps.append(step)
+        return self
+
+    def deleteMissingValues(self):          #Delete the missing values
+        return self.addStep('deleteMissingValues')
+
+    def replaceWithZero(self):              #Replace the missing values with zero
+        return self.addStep('replaceWithZero')
+
+    def replaceWithMean(self):              #Replace the missing values with the mean of the other values
+        return self.addStep('replaceWithMean')
+
+    def replaceWithMedian(self):            #Replace the missing values with the median of the other values
+        return self.addStep('replaceWithMedian')
+
+    def deleteOutliers(self):               #Delete the mild and extreme outliers, the values beyond the inner fences [Q1-1.5*IQR,Q3+1.5*IQR]
+        return self.addStep('deleteOutliers')
+
+    def deleteExtremeOutliers(self):        #Delete only the extreme outliers, the values beyond the outer fences [Q1-3*IQR,Q3+3*IQR]
+        return self.addStep('deleteExtremeOutliers')
+
+    def apply(self,masked):                 #applies the steps on a masked array with a column per row, in place
+        for step in self.steps:
+            missing=numpy.isnan(masked.data)&~numpy.ma.getmaskarray(masked)
+            if step=='deleteMissingValues':
+                masked[missing]=numpy.ma.masked
+                continue
+            if step in ('replaceWithZero','replaceWithMean','replaceWithMedian'):
+                if not missing.any():
+                    continue
+                if step=='replaceWithZero':
+                    replacement=numpy.zeros(len(masked))
+                elif step=='replaceWithMean':
+                    replacement=rowMeans(masked)
+                else:
+                    replacement=rowQuantiles(masked,[0.5])[0]
+                masked.data[missing]=numpy.broadcast_to(replacement[:,None],masked.shape)[missing]
+                continue
+            lower,upper=fences(masked,1.5 if step=='deleteOutliers' else 3)
+            with numpy.errstate(invalid='ignore'):
+                outliers=(masked.data<lower[:,None])|(masked.data>upper[:,None])
+            masked[outliers]=numpy.ma.masked
+        return masked
+
+    def run(self,columns):                  #runs the pipeline on a list or a dictionary of columns and returns the cleaned columns as float arrays
+        if isinstance(columns,dict):
+            names=list(columns)
+            return type(columns)(zip(names,self.run([columns[name] for name in names])))
+        cleanedList=[None]*len(columns)
+        indexDict={}                        #The columns of the same length are stacked in one array
+        for index,values in enumerate(columns):
+            indexDict.setdefault(len(values),[]).append(index)
+        for length,indexList in indexDict.iteritems():
+            if not length:
+                for index in indexList:
+                    cleanedList[index]=numpy.empty(0)
+                continue
+            masked=self.apply(toMaskedArray([columns[index] for index in indexList]))
+            for row,index in enumerate(indexList):
+                cleanedList[index]=masked[row].compressed()
+        return cleanedList
+
+def selectPresent(mylist,keep):         #returns the values of the list (or array) where keep is True, keeping their type
+    if isinstance(mylist,numpy.ndarray):
+        return mylist[keep]
+    return list(compress(mylist,keep))
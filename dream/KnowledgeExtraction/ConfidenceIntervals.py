@@ -22,35 +22,28 @@ Created on 16 Nov 2013
 
 @author: Panos
 '''
-from rpy2 import robjects
+import math
+
+from StatisticalMeasures import StatisticalMeasures
+from StatisticalMeasures import tQuantile
 
 #The ConfidenceIntervals object
 class ConfidenceIntervals(object):
     #Calculate the p (decimal number) confidence intervals for a sample of data
     def ConfidIntervals(self,data,p): 
-  
-        data=robjects.FloatVector(data)  #The given list changes into float vector in order to be handled by RPy2
-        alpha=1-p
-        rsqrt=robjects.r['sqrt']     #Call square root function - R function 
-        rsd=robjects.r['sd']       #Call standard deviation function - R function
-        rmean=robjects.r['mean']   #Call mean function - R function
-        t=len(data)
-        n=rsqrt(t)
-        b=rsd(data)
-
-        rqt=robjects.r['qt']       #Call the cumulative probability distribution function for t distribution
-        q=rqt((1-(alpha/2)),t-1)
-        m=rmean(data)               #Calculate the sample average value
-
-        me=q[0]*(b[0]/n[0])        #Calculate the margin of error
-
-        #Calculate the lower and the upper bound 
-        lo=m[0]-me
-        up=m[0]+me
-        l=[lo,up]
-        return l
-
-
-
-
+        return self.ConfidIntervalsList([data],p)[0]
 
+    #Calculate the p confidence intervals for many samples of data in one pass, returns a list with the [lower bound, upper bound] of every sample
+    #measuresList can be given if the statistical measures of the samples are already calculated
+    def ConfidIntervalsList(self,dataList,p,measuresList=None):
+        alpha=1-p
+        qDict={}                        #The quantile of the t distribution for every sample length
+        intervalList=[]
+        for measures in measuresList or StatisticalMeasures().measuresList(dataList):
+            t=measures['length']
+            if t not in qDict:
+                qDict[t]=tQuantile(1-(alpha/2),t-1)
+            me=qDict[t]*(measures['sd']/math.sqrt(t))    #Calculate the margin of error
+            #Calculate the lower and the upper bound 
+            intervalList.append([measures['mean']-me,measures['mean']+me])
+        return intervalList
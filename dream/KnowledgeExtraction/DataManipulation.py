@@ -23,35 +23,22 @@ Created on 16 Apr 2014
 @author: Panos
 '''
 
-import rpy2.robjects as robjects
+import numpy
 
 #The DataManipulation object
 class DataManipulation(object):
     
     def round(self, data):                      #returns the rounded values of the data sample
-        data=robjects.FloatVector(data)          ##The given list changes into float vector in order to be handled by RPy2
-        rround = robjects.r['round']            #Call the round  function-R function
-        return list(rround(data))
+        return numpy.round(numpy.asarray(data,dtype=float)).tolist()    #Halves are rounded to even, as in R
         
     def ceiling(self, data):                      #returns the smallest integers bigger than the values of the data sample
-        data=robjects.FloatVector(data)          
-        ceiling = robjects.r['ceiling']           #Call the ceiling function-R function
-        return list(ceiling(data))
+        return numpy.ceil(numpy.asarray(data,dtype=float)).tolist()
     
     def floor(self, data):                      #returns the largest integers smaller than the values of the data sample
-        data=robjects.FloatVector(data)          
-        floor = robjects.r['floor']             #Call the floor function-R function
-        return list(floor(data))
+        return numpy.floor(numpy.asarray(data,dtype=float)).tolist()
     
     def abs(self,data):                         #returns a list with the absolute values of the data sample
-        data=robjects.FloatVector(data)          
-        rabs = robjects.r['abs']                 #Call the abs function-R function
-        return list(rabs(data))
+        return numpy.abs(numpy.asarray(data,dtype=float)).tolist()
     
     def sqrt(self,data):                        #returns the square root of the values in the data sample
-        data=robjects.FloatVector(data)          
-        rsqrt = robjects.r['sqrt']              #Call the sqrt function-R function
-        return list(rsqrt(data))
-        
-    
-    
\ No newline at end of file
+        return numpy.sqrt(numpy.asarray(data,dtype=float)).tolist()
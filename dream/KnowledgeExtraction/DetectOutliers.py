@@ -22,44 +22,27 @@ Created on 24 Sep 2014
 # along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
 # ===========================================================================
 
+import numpy
+
 from StatisticalMeasures import StatisticalMeasures 
+from CleaningPipeline import toMaskedArray, fences, selectPresent
 
 #The DetectOuliers object
 class DetectOutliers(StatisticalMeasures):
 #Two different approaches to handle the outliers are included in this object, 
 #the first one delete both the mild and extreme outliers while the second approach delete only the extreme outliers in the given data set 
+#(CleaningPipeline applies them on many data sets at once)
     def DeleteOutliers(self,mylist):              #Delete the ouliers (both mild and extreme) in a given data set
-        Q1= self.quantile(mylist)[1]
-        Q3= self.quantile(mylist)[3]
-        IQ= self.IQR(mylist)
-        LIF= Q1 - 1.5*IQ                        #Calculate the lower inner fence
-        UIF= Q3 + 1.5*IQ                        #Calculate the upper inner fence
-        LOF= Q1 - 3*IQ                          #Calculate the lower outer fence
-        UOF= Q3 + 3*IQ                          #Calculate the upper outer fence
-        i=0
-        listx=[]
-        for value in mylist:                       
-            if not ((float(value)<float(LOF) or float(value)>float(UOF)) or (float(value)<float(LIF) or float(value)>float(UIF))):    #If the value is beyond the inner fence ([LIF,UIF]) on either side (mild outlier) or beyond the outer fence ([LOF,UOF]) on either side (extreme outlier) doesn't pass the control and deleted  
-                listx.append(value)
-            i+=1 
-        return listx
+        #If the value is beyond the inner fence ([LIF,UIF]) on either side (mild outlier) or beyond the outer fence ([LOF,UOF]) on either side (extreme outlier) doesn't pass the control and deleted  
+        return self.DeleteBeyondFences(mylist,1.5)
     
     def DeleteExtremeOutliers(self,mylist):            #Delete only the  extreme ouliers in a given data set
-        Q1= self.quantile(mylist)[1]
-        Q3= self.quantile(mylist)[3]
-        IQ= self.IQR(mylist)
-        LOF= Q1 - 3*IQ 
-        UOF= Q3 + 3*IQ
-        i=0
-        listx=[]
-        for value in mylist:
-            if not (float(value)<float(LOF) or float(value)>float(UOF)):           #If the value is  beyond the outer fence ([LOF,UOF]) on either side (extreme outlier) doesn't pass the control and deleted  
-                listx.append(value)
-            i+=1
-        return listx
-        
-                
-                
-                
-            
-    
\ No newline at end of file
+        #If the value is  beyond the outer fence ([LOF,UOF]) on either side (extreme outlier) doesn't pass the control and deleted  
+        return self.DeleteBeyondFences(mylist,3)
+
+    def DeleteBeyondFences(self,mylist,factor):     #Delete the values beyond the fences [Q1-factor*IQR,Q3+factor*IQR], the other values are returned as they are given
+        masked=toMaskedArray([mylist])
+        lower,upper=fences(masked,factor)
+        with numpy.errstate(invalid='ignore'):
+            keep=~((masked.data[0]<lower[0])|(masked.data[0]>upper[0]))
+        return selectPresent(mylist,keep)
@@ -23,352 +23,408 @@ Created on 19 Feb 2014
 @author: Panos
 '''
 
-import rpy2.robjects as robjects
-from rpy2.robjects.packages import importr
-import rpy2.rinterface
-from rpy2.rinterface import RRuntimeError
+import math
+import hashlib
+import threading
+from collections import OrderedDict
+from multiprocessing import Pool
+
+import numpy
 
-MASS= importr('MASS')
 #=============================================== Distribution Fitting  ============================================#
 #This script consists of two objects for distribution fitting
-#Distributions object: for maximum-likelihood fitting of univariate distributions without any information about likelihood analytical expression. 
+#Distributions object: for maximum-likelihood fitting of univariate distributions, as fitdistr of the R package MASS does
 #DistFittest object: for Kolmogorov-Smirnov distribution fitting test in order to find the best distribution fitting for the given data points
+#The fits and the tests are computed with NumPy. The former implementation, calling R through RPy2, is kept in RDistributionFitting
+
+#=============================================== numerical functions ==============================================#
+erf=numpy.vectorize(math.erf, otypes=[float])
+lgamma=numpy.vectorize(math.lgamma, otypes=[float])
+
+def gammainc(a,x):                      #The regularized lower incomplete gamma function P(a,x) of the array x
+    x=numpy.asarray(x,dtype=float)
+    result=numpy.zeros(x.shape)
+    series=(x>0)&(x<a+1)                #The series converges quickly for x<a+1
+    if series.any():
+        xs=x[series]
+        term=numpy.ones(xs.shape)/a
+        total=term.copy()
+        for n in range(1,500):
+            term*=xs/(a+n)
+            total+=term
+            if (term<total*1e-15).all():
+                break
+        result[series]=total*numpy.exp(-xs+a*numpy.log(xs)-math.lgamma(a))
+    fraction=x>=a+1                     #and the continued fraction (modified Lentz) for the others
+    if fraction.any():
+        xf=x[fraction]
+        b=xf+1-a
+        c=numpy.ones(xf.shape)/1e-300
+        d=1./b
+        h=d.copy()
+        for i in range(1,500):
+            an=-i*(i-a)
+            b+=2
+            d=an*d+b
+            d[numpy.abs(d)<1e-300]=1e-300
+            c=b+an/c
+            c[numpy.abs(c)<1e-300]=1e-300
+            d=1./d
+            delta=d*c
+            h*=delta
+            if (numpy.abs(delta-1)<1e-15).all():
+                break
+        result[fraction]=1-numpy.exp(-xf+a*numpy.log(xf)-math.lgamma(a))*h
+    return result
+
+def discreteCdf(logpmf,x):              #The cdf at x of a distribution on 0,1,2... given the log of its probability mass function
+    x=numpy.floor(numpy.asarray(x,dtype=float))
+    cdf=numpy.zeros(x.shape)
+    if (x>=0).any():
+        k=numpy.arange(int(x.max())+1)
+        cumulative=numpy.minimum(numpy.cumsum(numpy.exp(logpmf(k))),1)
+        cdf[x>=0]=cumulative[x[x>=0].astype(int)]
+    return cdf
+
+def bfgs(f,start,parscale=None,reltol=1.490116119384765625e-08,maxit=100,ndeps=1e-3):     #Minimizes the function f of the parameters list as optim in R with method BFGS (vmmin), which fitdistr uses for more than one parameter
+    parscale=numpy.ones(len(start)) if parscale is None else numpy.asarray(parscale,dtype=float)
+    n=len(start)
+    def fminfn(point):
+        with numpy.errstate(all='ignore'):      #The line search may try parameters out of the domain
+            return f(point*parscale)
+    def fmingr(point):                  #The gradient by central differences
+        gradient=numpy.zeros(n)
+        for i in range(n):
+            shifted=point.copy()
+            shifted[i]=point[i]+ndeps
+            value1=fminfn(shifted)
+            shifted[i]=point[i]-ndeps
+            value2=fminfn(shifted)
+            gradient[i]=(value1-value2)/(2*ndeps)
+        return gradient if numpy.isfinite(gradient).all() else None
+    b=numpy.asarray(start,dtype=float)/parscale
+    fmin=fminfn(b)
+    if not numpy.isfinite(fmin):
+        return None
+    g=fmingr(b)
+    if g is None:
+        return None
+    value=fmin
+    iteration=gradcount=ilast=1
+    while True:
+        if ilast==gradcount:            #Reset the approximation of the inverse hessian
+            B=numpy.identity(n)
+        X=b.copy()
+        c=g.copy()
+        t=-numpy.dot(numpy.tril(B)+numpy.tril(B,-1).T,g)
+        gradproj=numpy.dot(t,g)
+        if gradproj<0:                  #The search direction is downhill
+            steplength=1.
+            accpoint=False
+            while True:
+                b=X+steplength*t
+                count=numpy.sum(10.+X==10.+b)
+                if count<n:
+                    value=fminfn(b)
+                    accpoint=numpy.isfinite(value) and value<=fmin+gradproj*steplength*0.0001
+                    if not accpoint:
+                        steplength*=0.2
+                if count==n or accpoint:
+                    break
+            if not abs(value-fmin)>reltol*(abs(fmin)+reltol):     #The relative change is low
+                count=n
+                fmin=value
+            if count<n:                 #Making progress
+                fmin=value
+                g=fmingr(b)
+                if g is None:
+                    return None
+                gradcount+=1
+                iteration+=1
+                t=steplength*t
+                c=g-c
+                D1=numpy.dot(t,c)
+                if D1>0:
+                    X=numpy.dot(numpy.tril(B)+numpy.tril(B,-1).T,c)
+                    D2=1+numpy.dot(X,c)/D1
+                    B+=numpy.tril((D2*numpy.outer(t,t)-numpy.outer(X,t)-numpy.outer(t,X))/D1)
+                else:
+                    ilast=gradcount
+            elif ilast<gradcount:       #No progress
+                count=0
+                ilast=gradcount
+        else:                           #Uphill search, restart unless it has just restarted
+            count=0
+            if ilast==gradcount:
+                count=n
+            else:
+                ilast=gradcount
+        if iteration>=maxit:
+            break
+        if gradcount-ilast>2*n:         #Periodic restart
+            ilast=gradcount
+        if count==n and ilast==gradcount:
+            break
+    return b*parscale
+
+def kolmogorovPValue(D,n):              #The asymptotic p-value of the Kolmogorov-Smirnov statistic D for a sample of size n
+    t=math.sqrt(n)*D
+    if t<0.2:
+        return 1.
+    k=numpy.arange(1,101)
+    return float(min(max(2*numpy.sum((-1)**(k-1)*numpy.exp(-2*k**2*t**2)),0),1))
 
 #The Distributions object
 class Distributions(object):
-           
+    #Every method returns a dictionary with the distribution's and its parameters' names and the parameters' values,
+    #or None if the distribution cannot be fitted to the given data sample
+
     def Normal_distrfit(self,data):
-        data=robjects.FloatVector(data)     #The given data sample changes into float vector in order to be handled by RPy2
-        rFitDistr=robjects.r['fitdistr']    #Call FitDistr function - R function
-        try:                                        #try..except syntax to test if the data sample fits to Normal distribution
-            self.Normal= rFitDistr(data,'Normal')   #It fits the normal distribution to the given data sample
-        except RRuntimeError:                        
-            raise
-            return None                             #If it doesn't fit Return None
-        myDict = {'distributionType':'Normal','mean':self.Normal[0][0],'stdev': self.Normal[0][1],'min':0, 'max':(self.Normal[0][0]+3*self.Normal[0][1])}      #Create a dictionary with keys distribution's and distribution's parameters  names and the parameters' values                      
-        return myDict                      #If there is no Error return the dictionary with the Normal distribution parameters for the given data sample
-        
+        data=numpy.asarray(data,dtype=float)        #The given data sample changes into a NumPy array
+        if not len(data):
+            return None
+        mean=data.mean()
+        stdev=data.std()                            #The maximum likelihood estimator of the standard deviation
+        myDict = {'distributionType':'Normal','mean':float(mean),'stdev':float(stdev),'min':0, 'max':float(mean+3*stdev)}
+        return myDict
+
     def Lognormal_distrfit(self,data):
-        data=robjects.FloatVector(data)     #The given data sample changes into float vector in order to be handled by RPy2
-        rFitDistr=robjects.r['fitdistr']    #Call FitDistr function - R function
-        try:                                #try..except syntax to test if the data sample fits to Lognormal distribution
-            self.Lognormal= rFitDistr(data,'Lognormal')     #It fits the Lognormal distribution to the given data sample
-        except RRuntimeError: 
-            return None                                     #If it doesn't fit Return None
-        myDict ={'distributionType':'Lognormal','logmean':self.Lognormal[0][0],'logsd': self.Lognormal[0][1]}      #Create a dictionary with keys distribution's and distribution's parameters  names and the parameters' values                      
-        return myDict                                                #If there is no Error return the dictionary with the Lognormal distribution parameters for the given data sample
+        data=numpy.asarray(data,dtype=float)
+        if not len(data) or (data<=0).any():        #The Lognormal distribution is defined for positive values
+            return None
+        logData=numpy.log(data)
+        myDict ={'distributionType':'Lognormal','logmean':float(logData.mean()),'logsd':float(logData.std())}
+        return myDict
 
     def NegativeBinomial_distrfit(self,data):
-        data=robjects.FloatVector(data)
-        rFitDistr=robjects.r['fitdistr']
-        try:   
-            self.NegBinom= rFitDistr(data,'Negative Binomial')
-        except RRuntimeError: 
-            return None 
-        myDict = {'distributionType':'NegativeBinomial','size':self.NegBinom[0][0],'mu':self.NegBinom[0][1]}
-        return myDict   
-    
+        data=numpy.asarray(data,dtype=float)
+        if not len(data) or (data<0).any():
+            return None
+        mu=data.mean()
+        variance=data.var(ddof=1) if len(data)>1 else 0
+        size=mu**2/(variance-mu) if variance>mu else 100.
+        def minusLogLikelihood(parameters):
+            size,mu=parameters
+            if size<=0 or mu<=0:
+                return float('nan')
+            return -math.fsum(lgamma(data+size)-math.lgamma(size)-lgamma(data+1)
+                              +size*math.log(size/(size+mu))+data*math.log(mu/(size+mu)))
+        fit=bfgs(minusLogLikelihood,[size,mu])
+        if fit is None:
+            return None
+        size,mu=fit
+        myDict = {'distributionType':'NegativeBinomial','size':float(size),'mu':float(mu)}
+        return myDict
+
     def Exponential_distrfit(self,data):
-        data=robjects.FloatVector(data)    
-        rFitDistr=robjects.r['fitdistr']
-        try:    
-            self.Exp= rFitDistr(data,'Exponential')
-        except RRuntimeError: 
+        data=numpy.asarray(data,dtype=float)
+        if not len(data) or (data<0).any() or not data.sum():
             return None
-        myDict = {'distributionType':'Exp', 'mean':self.Exp[0][0]}
+        #As the R implementation, the fitted rate is given as mean
+        myDict = {'distributionType':'Exp', 'mean':float(1/data.mean())}
         return myDict
-    
+
     def Poisson_distrfit(self,data):
-        data=robjects.FloatVector(data)    
-        rFitDistr=robjects.r['fitdistr']
-        try:
-            self.Poisson= rFitDistr(data,'Poisson')
-        except RRuntimeError: 
+        data=numpy.asarray(data,dtype=float)
+        if not len(data) or (data<0).any():
             return None
-        myDict = {'distributionType':'Poisson', 'lambda':self.Poisson[0][0]}
+        myDict = {'distributionType':'Poisson', 'lambda':float(data.mean())}
         return myDict
-    
-    def Logistic_distrfit(self,data): 
-        data=robjects.FloatVector(data)   
-        rFitDistr=robjects.r['fitdistr']
-        try:
-            self.Logist= rFitDistr(data,'logistic')
-        except RRuntimeError: 
+
+    def Logistic_distrfit(self,data):
+        data=numpy.asarray(data,dtype=float)
+        if len(data)<2:
             return None
-        myDict = {'distributionType':'Logistic', 'location':self.Logist[0][0],'scale':self.Logist[0][1]}
+        def minusLogLikelihood(parameters):
+            location,scale=parameters
+            if scale<=0:
+                return float('nan')
+            z=numpy.abs((data-location)/scale)
+            return math.fsum(z+numpy.log(scale*(1+numpy.exp(-z))**2))
+        quartiles=numpy.percentile(data,[25,75])
+        fit=bfgs(minusLogLikelihood,[numpy.median(data),(quartiles[1]-quartiles[0])/2])
+        if fit is None:
+            return None
+        location,scale=fit
+        myDict = {'distributionType':'Logistic', 'location':float(location),'scale':float(scale)}
         return myDict
-   
-    def Geometric_distrfit(self,data): 
-        data=robjects.FloatVector(data)   
-        rFitDistr=robjects.r['fitdistr']
-        try:
-            self.Geom= rFitDistr(data,'Geometric')
-        except RRuntimeError: 
+
+    def Geometric_distrfit(self,data):
+        data=numpy.asarray(data,dtype=float)
+        if not len(data) or (data<0).any():
             return None
-        myDict = {'distributionType':'Geometric','probability':self.Geom[0][0]}
+        myDict = {'distributionType':'Geometric','probability':float(1/(1+data.mean()))}
         return myDict
-    
+
     def Gamma_distrfit(self,data):
-        data=robjects.FloatVector(data)
-        rFitDistr=robjects.r['fitdistr']
-        try:    
-            self.Gam=rFitDistr(data,'Gamma') 
-        except RRuntimeError: 
+        data=numpy.asarray(data,dtype=float)
+        if len(data)<2 or (data<=0).any():
             return None
-        myDict = {'distributionType':'Gamma','shape':self.Gam[0][0],'rate':self.Gam[0][1]}
+        mean=data.mean()
+        variance=data.var(ddof=1)
+        if not variance:
+            return None
+        logData=numpy.log(data)
+        def minusLogLikelihood(parameters):
+            shape,rate=parameters
+            if shape<=0 or rate<=0:
+                return float('nan')
+            return -math.fsum(shape*math.log(rate)+(shape-1)*logData-rate*data-math.lgamma(shape))
+        fit=bfgs(minusLogLikelihood,[mean**2/variance,mean/variance],parscale=[1,mean/variance])
+        if fit is None:
+            return None
+        shape,rate=fit
+        myDict = {'distributionType':'Gamma','shape':float(shape),'rate':float(rate)}
         return myDict
-        
+
     def Weibull_distrfit(self,data):
-        data=robjects.FloatVector(data)
-        rFitDistr=robjects.r['fitdistr']
-        try:
-            self.Weib=rFitDistr(data,'weibull')   
-        except RRuntimeError:
+        data=numpy.asarray(data,dtype=float)
+        if len(data)<2 or (data<=0).any():
             return None
-        myDict = {'distributionType':'Weibull','shape':self.Weib[0][0],'scale':self.Weib[0][1]}
+        logData=numpy.log(data)
+        if not logData.var(ddof=1):
+            return None
+        shape=1.2/math.sqrt(logData.var(ddof=1))       #The log of a Weibull variable is Gumbel, so start from that as fitdistr
+        def minusLogLikelihood(parameters):
+            shape,scale=parameters
+            if shape<=0 or scale<=0:
+                return float('nan')
+            powers=(data/scale)**(shape-1)
+            return -math.fsum(-powers*(data/scale)+numpy.log(shape*powers/scale))
+        fit=bfgs(minusLogLikelihood,[shape,math.exp(logData.mean()+0.572/shape)])
+        if fit is None:
+            return None
+        shape,scale=fit
+        myDict = {'distributionType':'Weibull','shape':float(shape),'scale':float(scale)}
         return myDict
-        
+
     def Cauchy_distrfit(self,data):
-        data=robjects.FloatVector(data)
-        rFitDistr=robjects.r['fitdistr']
-        try:    
-            self.Cauchy=rFitDistr(data,'Cauchy') 
-        except RRuntimeError: 
+        data=numpy.asarray(data,dtype=float)
+        if len(data)<2:
             return None
-        myDict = {'distributionType':'Cauchy','location':self.Cauchy[0][0],'scale':self.Cauchy[0][1]}
+        def minusLogLikelihood(parameters):
+            location,scale=parameters
+            if scale<=0:
+                return float('nan')
+            y=(data-location)/scale
+            return math.fsum(numpy.log(math.pi*scale*(1+y*y)))
+        quartiles=numpy.percentile(data,[25,75])
+        fit=bfgs(minusLogLikelihood,[numpy.median(data),(quartiles[1]-quartiles[0])/2])
+        if fit is None:
+            return None
+        location,scale=fit
+        myDict = {'distributionType':'Cauchy','location':float(location),'scale':float(scale)}
         return myDict
-        
+
+# the cumulative distribution functions of the fitted distributions, by the name of their fitting method
+cdfDict={
+    'Normal_distrfit':lambda x,d: 0.5*(1+erf((x-d['mean'])/(d['stdev']*math.sqrt(2)))),
+    'Lognormal_distrfit':lambda x,d: 0.5*(1+erf((numpy.log(numpy.maximum(x,1e-300))-d['logmean'])/(d['logsd']*math.sqrt(2))))*(x>0),
+    'Exponential_distrfit':lambda x,d: numpy.where(x>0,1-numpy.exp(-d['mean']*numpy.maximum(x,0)),0),
+    'Poisson_distrfit':lambda x,d: discreteCdf(lambda k: k*numpy.log(d['lambda'])-d['lambda']-lgamma(k+1),x),
+    'Geometric_distrfit':lambda x,d: numpy.where(x>=0,1-(1-d['probability'])**(numpy.floor(numpy.maximum(x,0))+1),0),
+    'Logistic_distrfit':lambda x,d: 1/(1+numpy.exp(-(x-d['location'])/d['scale'])),
+    'Gamma_distrfit':lambda x,d: gammainc(d['shape'],x*d['rate']),
+    'Weibull_distrfit':lambda x,d: numpy.where(x>0,1-numpy.exp(-(numpy.maximum(x,0)/d['scale'])**d['shape']),0),
+    'Cauchy_distrfit':lambda x,d: 0.5+numpy.arctan((x-d['location'])/d['scale'])/math.pi,
+    'NegativeBinomial_distrfit':lambda x,d: discreteCdf(lambda k: lgamma(k+d['size'])-math.lgamma(d['size'])-lgamma(k+1)
+                            +d['size']*math.log(d['size']/(d['size']+d['mu']))+k*math.log(d['mu']/(d['size']+d['mu'])),x),
+}
+
+def kstest(data,methodName):            #Fits the distribution with the given method and conducts the Kolmogorov-Smirnov test
+    with numpy.errstate(all='ignore'):  #returns the fitted dictionary, the statistic D and the p-value of the test
+        data=numpy.sort(numpy.asarray(data,dtype=float))
+        fit=getattr(Distributions(),methodName)(data)
+        if fit is None:
+            return None
+        cdf=cdfDict[methodName](data,fit)
+        n=len(data)
+        D=max(numpy.max(numpy.arange(1,n+1)/float(n)-cdf),numpy.max(cdf-numpy.arange(n)/float(n)))
+        if numpy.isnan(D):
+            return None
+        return fit,float(D),kolmogorovPValue(D,n)
+
+def kstestByName(args):                 #kstest with the arguments in a tuple, to be mapped over a pool of processes
+    return kstest(*args)
+
 #The Distribution Fitting test object
 class DistFittest(object):
-    
-    def Norm_kstest(self,data):             
-        data=robjects.FloatVector(data)         #The given data sample changes into float vector in order to be handled by RPy2
-        rkstest= robjects.r['ks.test']          #Call ks.test function - R function
-        rFitDistr=robjects.r['fitdistr']        #Call FitDistr function - R function
-        try:                                        #try..except syntax to test if the data sample fits to Normal distribution    
-            self.Normal= rFitDistr(data,'Normal')       #It fits the normal distribution to the given data sample                                                
-        except RRuntimeError: 
-            return None                             #If it doesn't fit Return None
-        norm=self.Normal                        
-        self.Normtest= rkstest(data,"pnorm",norm[0][0],norm[0][1])      #It conducts the Kolmogorov-Smirnov test for Normal distribution to the given data sample
-        return self.Normtest                    #If there is no error returns the outcome of the Kolmogorov-Smirnov test (p-value,D) 
-        
-    def Lognorm_kstest(self,data):              #The given data sample changes into float vector in order to be handled by RPy2
-        data=robjects.FloatVector(data)         #Call ks.test function - R function
-        rkstest= robjects.r['ks.test']          #Call FitDistr function - R function
-        rFitDistr=robjects.r['fitdistr']        #It fits the Lognormal distribution to the given data sample
-        try:                                     #try..except syntax to test if the data sample fits to Lognormal distribution
-            self.Lognormal= rFitDistr(data,'Lognormal')
-        except RRuntimeError: 
-            return None                         #If it doesn't fit Return None
-        lognorm=self.Lognormal
-        self.Lognormtest= rkstest(data,"plnorm",lognorm[0][0],lognorm[0][1])        #It conducts the Kolmogorov-Smirnov test for Lognormal distribution to the given data sample
-        return self.Lognormtest                 #If there is no error returns the outcome of the Kolmogorov-Smirnov test (p-value,D) 
-    
+    #The available statistical distributions and their fitting methods, in the order they are tested
+    distributionList=[('Normal','Normal_distrfit'),('Lognormal','Lognormal_distrfit'),('Exp','Exponential_distrfit'),
+                      ('Poisson','Poisson_distrfit'),('Geometric','Geometric_distrfit'),('Logistic','Logistic_distrfit'),
+                      ('Gamma','Gamma_distrfit'),('Weibull','Weibull_distrfit'),('Cauchy','Cauchy_distrfit')]
+    #The results of ks_test by the hash of the data sample, shared by the objects and by the threads of the platform
+    cache=OrderedDict()
+    cacheSize=256
+    cacheLock=threading.Lock()
+
+    def __init__(self,processes=None):  #With processes, the distributions are fitted in parallel in a pool of that many processes
+        self.processes=processes
+
+    #Every *_kstest method returns the outcome of the Kolmogorov-Smirnov test (D,p-value) or None if the distribution doesn't fit
+    def Norm_kstest(self,data):
+        return self.outcome(kstest(data,'Normal_distrfit'))
+
+    def Lognorm_kstest(self,data):
+        return self.outcome(kstest(data,'Lognormal_distrfit'))
+
     def NegBinom_kstest(self,data):
-        data=robjects.FloatVector(data)
-        rkstest= robjects.r['ks.test']
-        rFitDistr=robjects.r['fitdistr']
-        try:    
-            self.NegBinom= rFitDistr(data,'Negative Binomial')
-        except RRuntimeError: 
-            return None
-        negbinom=self.NegBinom
-        self.NegBinomtest= rkstest(data,"pnbinom",negbinom[0][0],negbinom[1][1])
-        return self.NegBinomtest
-    
+        return self.outcome(kstest(data,'NegativeBinomial_distrfit'))
+
     def Exp_kstest(self,data):
-        data=robjects.FloatVector(data)
-        rkstest= robjects.r['ks.test']
-        rFitDistr=robjects.r['fitdistr']
-        try:
-            self.Exp= rFitDistr(data,'Exponential')
-        except RRuntimeError: 
-            return None
-        exp=self.Exp
-        self.Exptest= rkstest(data,"pexp",exp[0][0])
-        return self.Exptest
-        
+        return self.outcome(kstest(data,'Exponential_distrfit'))
+
     def Pois_kstest(self,data):
-        data=robjects.FloatVector(data)
-        rkstest= robjects.r['ks.test']
-        rFitDistr=robjects.r['fitdistr']
-        try:
-            self.Poisson= rFitDistr(data,'Poisson')
-        except RRuntimeError: 
-            return None
-        pois=self.Poisson
-        self.Poistest= rkstest(data,"ppois",pois[0])
-        return self.Poistest
-   
+        return self.outcome(kstest(data,'Poisson_distrfit'))
+
     def Geom_kstest(self,data):
-        data=robjects.FloatVector(data)
-        rkstest= robjects.r['ks.test']
-        rFitDistr=robjects.r['fitdistr']
-        try:
-            self.Geom= rFitDistr(data,'Geometric')
-        except RRuntimeError: 
-            return None
-        geom=self.Geom
-        self.Geomtest= rkstest(data,"pgeom",geom[0])
-        return self.Geomtest
-        
+        return self.outcome(kstest(data,'Geometric_distrfit'))
+
     def Logis_kstest(self,data):
-        data=robjects.FloatVector(data)
-        rkstest= robjects.r['ks.test']
-        rFitDistr=robjects.r['fitdistr']
-        try:    
-            self.Logist= rFitDistr(data,'logistic')
-        except RRuntimeError: 
-            return None
-        logis=self.Logist
-        self.Logistest= rkstest(data,"plogis",logis[0][0],logis[0][1])
-        return self.Logistest
-       
+        return self.outcome(kstest(data,'Logistic_distrfit'))
+
     def Gam_kstest(self,data):
-        data=robjects.FloatVector(data)
-        rkstest= robjects.r['ks.test']
-        rFitDistr=robjects.r['fitdistr']
-        try:
-            self.Gam=rFitDistr(data,'Gamma')
-        except RRuntimeError: 
-            return None
-        gam=self.Gam
-        self.Gamtest= rkstest(data,"pgamma",rate=gam[0][1],shape=gam[0][0])
-        return self.Gamtest
+        return self.outcome(kstest(data,'Gamma_distrfit'))
 
     def Weib_kstest(self,data):
-        data=robjects.FloatVector(data)
-        rkstest= robjects.r['ks.test']
-        rFitDistr=robjects.r['fitdistr']
-        try:    
-            self.Weib=rFitDistr(data,'weibull')
-        except RRuntimeError: 
-            return None
-        weib=self.Weib
-        self.Weibtest= rkstest(data,"pweibull",scale=weib[0][1],shape=weib[0][0])
-        return self.Weibtest
-        
+        return self.outcome(kstest(data,'Weibull_distrfit'))
+
     def Cauchy_kstest(self,data):
-        data=robjects.FloatVector(data)
-        rkstest= robjects.r['ks.test']
-        rFitDistr=robjects.r['fitdistr']
-        try:    
-            self.Cauchy=rFitDistr(data,'Cauchy') 
-        except RRuntimeError: 
+        return self.outcome(kstest(data,'Cauchy_distrfit'))
+
+    def outcome(self,test):
+        if test is None:
             return None
-        cauch=self.Cauchy
-        self.Cauchytest= rkstest(data,"pcauchy",cauch[0][0],cauch[0][1])
-        return self.Cauchytest
-        
+        fit,D,pValue=test
+        return D,pValue
+
     def ks_test(self,data):             #Method that conducts the Kolmogorov-Smirnov statistical test and returns the best fitting distribution among the list of the available statistical distributions
-        data=robjects.FloatVector(data)     #The given data sample changes into float vector in order to be handled by RPy2 
-        #Create a list with strings the available statistical distributions
-        list1=['Normal','Lognormal','Exp','Poisson', 'Geometric','Logistic','Gamma','Weibull', 'Cauchy']
-        list2=[]                  #Create a list 
-        #if...else syntaxes to test if the Kolmogorov-Smirnov statistical tests can be conducted to the available distributions 
-        
-        norm_test = self.Norm_kstest(data)
-        if norm_test is not None:
-            list2.insert(0,norm_test[0][0])
-        else:
-            list2.insert(0,'')
-           
-        lognorm_test = self.Lognorm_kstest(data)
-        if lognorm_test is not None:
-            list2.insert(1,lognorm_test[0][0])
-        else:
-            list2.insert(1,'')
-           
-        exp_test = self.Exp_kstest(data)
-        if exp_test is not None:
-            list2.insert(2,exp_test[0][0])
-        else:
-            list2.insert(2,'')
-           
-        pois_test = self.Pois_kstest(data)
-        if pois_test is not None:
-            list2.insert(3,pois_test[0][0])
-        else:
-            list2.insert(3,'')
-           
-        geom_test = self.Geom_kstest(data)
-        if geom_test is not None:
-            list2.insert(4,geom_test[0][0])
-        else:
-            list2.insert(4,'')
-           
-        logis_test = self.Logis_kstest(data)
-        if logis_test is not None:
-            list2.insert(5,logis_test[0][0])
-        else:
-            list2.insert(5,'')
-           
-        gam_test = self.Gam_kstest(data)
-        if gam_test is not None:
-            list2.insert(6,gam_test[0][0])
-        else:
-            list2.insert(6,'')
-           
-        weib_test = self.Weib_kstest(data)
-        if weib_test is not None:
-            list2.insert(7,weib_test[0][0])
-        else:
-            list2.insert(7,'')
-           
-        cauchy_test = self.Cauchy_kstest(data)
-        if cauchy_test is not None:
-            list2.insert(8,cauchy_test[0][0])
-        else:
-            list2.insert(8,'')
-                     
-        #Create a list with parameters the above D parameters calculated by the Kolmogorov-Smirnov tests in the available statistical distributions
-        a=min(list2)     #Create a variable that holds the minimum value from the above list  
-        b=list2.index(a) #Create a variable that holds the actual position  of the minimum value in the list
-        
-        self=Distributions()
-        #Set of if...elif syntax in order to get a Python dictionary with the best fitting statistical distribution and its parameters
-        if list1[b]=='Normal':          #Check if in list's b position is the Normal distribution
-            self.Normal_distrfit(data)
-            myDict = {'distributionType':list1[b],'mean':self.Normal[0][0],'stdev': self.Normal[0][1],'min':0, 'max':(self.Normal[0][0]+3*self.Normal[0][1])} #Create a dictionary with distribution's and distribution parameters' names and distribution parameters' values
-            return myDict     
-        elif list1[b]=='Lognormal':
-            self.Lognormal_distrfit(data)
-            myDict = {'distributionType':list1[b],'logmean':self.Lognormal[0][0],'logsd': self.Lognormal[0][1]}
-            return myDict
-        elif list1[b]=='Exp':
-            self.Exponential_distrfit(data)
-            myDict = {'distributionType':list1[b],'mean':self.Exp[0][0]}
-            return myDict
-        elif list1[b]=='Poisson':
-            self.Poisson_distrfit(data)
-            myDict = {'distributionType':list1[b],'lambda':self.Poisson[0][0]}
-            return myDict
-        elif list1[b]=='Geometric':
-            self.Geometric_distrfit(data)
-            myDict = {'distributionType':list1[b],'probability':self.Geom[0][0]}
-            return myDict
-        elif list1[b]=='Logistic':
-            self.Logistic_distrfit(data)
-            myDict = {'distributionType':list1[b],'location':self.Logist[0][0],'scale':self.Logist[0][1]}
-            return myDict
-        elif list1[b]=='Gamma':
-            self.Gamma_distrfit(data)
-            myDict = {'distributionType':list1[b],'shape':self.Gam[0][0],'rate':self.Gam[0][1]}
-            return myDict
-        elif list1[b]=='Weibull':
-            self.Weibull_distrfit(data)
-            myDict = {'distributionType':list1[b],'shape':self.Weib[0][0],'scale':self.Weib[0][1]}
-            return myDict
-        else:
-            self.Cauchy_distrfit(data)
-            myDict = {'distributionType':list1[b],'location':self.Cauchy[0][0],'scale':self.Cauchy[0][1]}
-            return myDict
-         
- 
-         
- 
- 
- 
-         
-         
+        data=numpy.asarray(data,dtype=float)
+        key=hashlib.sha1(data.tostring()).hexdigest()
+        with self.cacheLock:
+            myDict=self.cache.get(key)
+        if myDict is None:
+            argsList=[(data,methodName) for distributionType,methodName in self.distributionList]
+            if self.processes>1:
+                pool=Pool(self.processes)
+                try:
+                    testList=pool.map(kstestByName,argsList)
+                finally:
+                    pool.close()
+                    pool.join()
+            else:
+                testList=map(kstestByName,argsList)
+            #Every distribution is fitted once, the best fitting one is the first with the minimum D parameter
+            best=None
+            for (distributionType,methodName),test in zip(self.distributionList,testList):
+                if test is not None and (best is None or test[1]<best[1][1]):
+                    best=(distributionType,test)
+            if best is None:            #No distribution fits the data sample
+                return None
+            distributionType,(myDict,D,pValue)=best
+            myDict=dict(myDict,distributionType=distributionType)
+            with self.cacheLock:        #The data sample is fitted outside the lock, two threads may fit the same one
+                self.cache[key]=myDict
+                while len(self.cache)>self.cacheSize:
+                    self.cache.popitem(last=False)
+        return dict(myDict)             #A copy, as the callers change the dictionary
@@ -23,16 +23,16 @@ Created on 19 Feb 2014
 @author: Panos
 '''
 from xlwt import Workbook
-import rpy2.robjects as robjects
 from StatisticalMeasures import StatisticalMeasures
 from DistributionFitting import DistFittest
+from DistributionFitting import kstest
 
 #=========================================== The ExcelOutput object =============================================================#
 #The ExcelOutput object export in Excel document both the calculated statistical measures and the distribution fitting test of a dataset 
 class ExcelOutput(StatisticalMeasures,DistFittest):
     
     def PrintStatisticalMeasures(self,data,fileName="StatisticalMeasuresResults.xls"):
-        data=robjects.FloatVector(data)     #The given list changes into float vector in order to be handled by RPy2
+        measures=self.measures(data)        #All the statistical measures are calculated at once
         
         book = Workbook()                   
         sheet1 = book.add_sheet('StatisticalMeasures', cell_overwrite_ok=True)  #Add one sheet in the excel document with the name StatisticalMeasures
@@ -65,50 +65,43 @@ class ExcelOutput(StatisticalMeasures,DistFittest):
         sheet1.write(17,1,('Interquartile Range'))
         
         ###Length###
-        sheet1.write(3,2,(self.length(data)))
+        sheet1.write(3,2,(measures['length']))
         
         ###Summary###
-        sheet1.write(5,2,(self.summary(data)[0]))
-        sheet1.write(5,3,(self.summary(data)[1]))
-        sheet1.write(5,4,(self.summary(data)[2])) 
-        sheet1.write(5,5,(self.summary(data)[3]))
-        sheet1.write(5,6,(self.summary(data)[4]))
-        sheet1.write(5,7,(self.summary(data)[5]))
+        for i in range(6):
+            sheet1.write(5,i+2,(measures['summary'][i]))
                
         ###Dataset###
         i=0
-        while (i<self.length(data)):
-            sheet1.write(i+2,0,((data[i])))
+        while (i<measures['length']):
+            sheet1.write(i+2,0,(float(data[i])))
             i=i+1
                
-        ###Quantselfles###
-        sheet1.write(11,2,(self.quantile(data)[0]))
-        sheet1.write(11,3,(self.quantile(data)[1]))
-        sheet1.write(11,4,(self.quantile(data)[2]))
-        sheet1.write(11,5,(self.quantile(data)[3]))
-        sheet1.write(11,6,(self.quantile(data)[4]))
+        ###Quantiles###
+        for i in range(5):
+            sheet1.write(11,i+2,(measures['quantile'][i]))
         
         ###Mean###
-        sheet1.write(12,2,(self.mean(data)))
+        sheet1.write(12,2,(measures['mean']))
         
-        ###Varselfance####
-        sheet1.write(13,2,(self.var(data)))
+        ###Variance####
+        sheet1.write(13,2,(measures['var']))
         
-        ###Standard devselfatselfon###
-        sheet1.write(14,2,(self.sd(data)))
+        ###Standard deviation###
+        sheet1.write(14,2,(measures['sd']))
         
         ###Range###
-        sheet1.write(16,2,(self.range(data)[0]))
-        sheet1.write(16,3,(self.range(data)[1]))
+        sheet1.write(16,2,(measures['range'][0]))
+        sheet1.write(16,3,(measures['range'][1]))
         
-        ###selfnterquartselfle Range###
-        sheet1.write(17,2,(self.IQR(data)))
+        ###Interquartile Range###
+        sheet1.write(17,2,(measures['IQR']))
         book.save(fileName)  #Save the excel document 
         
     
     
     def PrintDistributionFit(self,data,fileName="DistributionFittingResults.xls"):
-        data=robjects.FloatVector(data)
+        data=[float(value) for value in data]
         
         book = Workbook()
         sheet2 = book.add_sheet('Distribution Fitting', cell_overwrite_ok=True)
@@ -177,60 +170,29 @@ class ExcelOutput(StatisticalMeasures,DistFittest):
         
         ###Dataset###
         i=0
-        while (i<robjects.r['length'](data)[0]):
+        while (i<len(data)):
             sheet2.write(i+2,0,((data[i])))
             i=i+1
 
-        ###Poisson###
-        sheet2.write(5,2,(robjects.r['fitdistr'](data,'Poisson')[0][0]))
-        sheet2.write(5,6,(self.Pois_kstest(data)[0][0]))
-        sheet2.write(5,8,(self.Pois_kstest(data)[1][0]))
-        
-        ###Geometric###
-        sheet2.write(8,2,(robjects.r['fitdistr'](data,'Geometric')[0][0]))
-        sheet2.write(8,6,(self.Geom_kstest(data)[0][0]))
-        sheet2.write(8,8,(self.Geom_kstest(data)[1][0]))
-        
-        ###Normal###
-        sheet2.write(12,2,(robjects.r['fitdistr'](data,'Normal')[0][0]))
-        sheet2.write(12,3,(robjects.r['fitdistr'](data,'Normal')[0][1]))
-        sheet2.write(12,6,(self.Norm_kstest(data)[0][0]))
-        sheet2.write(12,8,(self.Norm_kstest(data)[1][0]))
-        
-        ###Exponential###
-        sheet2.write(15,2,(robjects.r['fitdistr'](data,'Exponential')[0][0]))
-        sheet2.write(15,6,(self.Exp_kstest(data)[0][0]))
-        sheet2.write(15,8,(self.Exp_kstest(data)[1][0]))
-        
-        ###Gamma###
-        sheet2.write(18,2,(robjects.r['fitdistr'](data,'Gamma')[0][0]))
-        sheet2.write(18,3,(robjects.r['fitdistr'](data,'Gamma')[0][1]))
-        sheet2.write(18,6,(self.Gam_kstest(data)[0][0]))
-        sheet2.write(18,8,(self.Gam_kstest(data)[1][0]))
-        
-        ###Lognormal###
-        sheet2.write(21,2,(robjects.r['fitdistr'](data,'Lognormal')[0][0]))
-        sheet2.write(21,3,(robjects.r['fitdistr'](data,'Lognormal')[0][1]))
-        sheet2.write(21,6,(self.Lognorm_kstest(data)[0][0]))
-        sheet2.write(21,8,(self.Lognorm_kstest(data)[1][0]))
-        
-        ###Weibull###
-        sheet2.write(24,2,(robjects.r['fitdistr'](data,'Weibull')[0][0]))
-        sheet2.write(24,3,(robjects.r['fitdistr'](data,'Weibull')[0][1]))
-        sheet2.write(24,6,(self.Weib_kstest(data)[0][0]))
-        sheet2.write(24,8,(self.Weib_kstest(data)[1][0]))
-        
-        ###Logistic###
-        sheet2.write(27,2,(robjects.r['fitdistr'](data,'Logistic')[0][0]))
-        sheet2.write(27,3,(robjects.r['fitdistr'](data,'Logistic')[0][1]))
-        sheet2.write(27,6,(self.Logis_kstest(data)[0][0]))
-        sheet2.write(27,8,(self.Logis_kstest(data)[1][0]))
-        
-        ###Cauchy###
-        sheet2.write(30,2,(robjects.r['fitdistr'](data,'Cauchy')[0][0]))
-        sheet2.write(30,3,(robjects.r['fitdistr'](data,'Cauchy')[0][1]))
-        sheet2.write(30,6,(self.Cauchy_kstest(data)[0][0]))
-        sheet2.write(30,8,(self.Cauchy_kstest(data)[1][0]))
+        #The row of every distribution with the name of its fitting method and the names of its parameters
+        #(the fitted rate of the Exponential distribution is given as its mean)
+        for row,methodName,parameterList in [(5,'Poisson_distrfit',['lambda']),
+                                             (8,'Geometric_distrfit',['probability']),
+                                             (12,'Normal_distrfit',['mean','stdev']),
+                                             (15,'Exponential_distrfit',['mean']),
+                                             (18,'Gamma_distrfit',['shape','rate']),
+                                             (21,'Lognormal_distrfit',['logmean','logsd']),
+                                             (24,'Weibull_distrfit',['shape','scale']),
+                                             (27,'Logistic_distrfit',['location','scale']),
+                                             (30,'Cauchy_distrfit',['location','scale'])]:
+            test=kstest(data,methodName)    #The distribution is fitted once for both its parameters and the Kolmogorov-Smirnov test
+            if test is None:                #The distribution cannot be fitted to the data sample
+                continue
+            fit,D,pValue=test
+            for i,parameter in enumerate(parameterList):
+                sheet2.write(row,i+2,(fit[parameter]))
+            sheet2.write(row,6,(D))
+            sheet2.write(row,8,(pValue))
         
         ###BestDistributionFit###
         A=self.ks_test(data)
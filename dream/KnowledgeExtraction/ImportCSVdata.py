@@ -26,21 +26,22 @@ import csv
 class ImportCSVdata(object):
 #This object reads data from a CSV document
     def Input_data(self,fileName):         #This method takes as an argument the Name of the CSV file
-        #Opens the CSV for the reader to use
-        reader = csv.reader(open(fileName, "rb"), delimiter = ',')
-        headers=[]   #Create a new list to insert the labels of the data sets
-        csvInput=list(reader)
-        for element in csvInput[0]:
-            headers.append(element)       #Insert the labels in the list headers
-
+        #Opens the CSV for the reader to use, the rows are read one by one
+        with open(fileName, "rb") as csvFile:
+            reader = csv.reader(csvFile, delimiter = ',')
+            headers=next(reader)      #The labels of the data sets are in the first row
             dictData={}         #Create a dictionary to input the CSV data
             for header in headers:
                 dictData[header]=[]    #Insert as keys in the dictionary the labels of the data sets 
 
-        for row in csvInput:
-            if row==csvInput[0]:     #Input in the dictionary the data apart from the first row (headers)
-                continue
-            else:
-                for j in range(len(row)):
-                    dictData[headers[j]].append(row[j])
-        return dictData
\ No newline at end of file
+            for row in reader:
+                if row==headers:     #Input in the dictionary the data apart from the first row (headers)
+                    continue
+                else:
+                    for j in range(len(row)):
+                        dictData[headers[j]].append(row[j])
+        return dictData
+
+    def Input_chunks(self,fileName,chunkSize=None,columns=None):   #Reads the CSV file in chunks of NumPy column arrays, see ImportChunkedData
+        from ImportChunkedData import ImportChunkedData, CHUNK_SIZE
+        return ImportChunkedData().CSV_chunks(fileName,chunkSize or CHUNK_SIZE,columns)
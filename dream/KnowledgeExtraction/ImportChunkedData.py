@@ -0,0 +1,219 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 17 Oct 2026
+
+'''
+import csv
+import re
+import zipfile
+from collections import OrderedDict
+from xml.etree import cElementTree as ElementTree
+
+import numpy
+
+from StatisticalMeasures import RunningMeasures
+
+#The number of rows read at a time
+CHUNK_SIZE=65536
+
+SPREADSHEET_NAMESPACE='{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+RELATIONSHIP_NAMESPACE='{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+def toArray(values):                    #returns the values of a column as a float array with NaN for the missing values, or as an object array if they are not all numbers
+    if isinstance(values,numpy.ndarray) and values.dtype.kind in 'biuf':
+        return values.astype(float)
+    array=numpy.array(values,dtype=object)
+    try:
+        return array.astype(float)      #The columns without empty cells
+    except (ValueError,TypeError):
+        pass
+    missing=(array=='')|numpy.equal(array,None)
+    numeric=array.copy()
+    numeric[missing]=numpy.nan
+    try:
+        return numeric.astype(float)
+    except (ValueError,TypeError):
+        return array
+
+def toChunks(rows,chunkSize=CHUNK_SIZE,columns=None):     #groups the rows (the first one has the names of the columns) in chunks of column arrays
+    rows=iter(rows)
+    try:
+        header=next(rows)
+    except StopIteration:
+        return
+    #The columns without name are skipped as in ImportExceldata
+    indexDict=OrderedDict((name,index) for index,name in enumerate(header)
+                          if name!='' and (columns is None or name in columns))
+    width=len(header)
+    while True:
+        chunk=[]
+        for row in rows:
+            row=list(row)
+            if len(row)<width:
+                row.extend(['']*(width-len(row)))
+            chunk.append(row)
+            if len(chunk)==chunkSize:
+                break
+        if not chunk:
+            return
+        columnList=zip(*chunk)
+        yield OrderedDict((name,toArray(columnList[index])) for name,index in indexDict.iteritems())
+        if len(chunk)<chunkSize:
+            return
+
+def columnIndex(reference):             #returns the index of the column of a cell reference of a worksheet, e.g. 2 for C7
+    index=0
+    for letter in re.match('[A-Z]+',reference).group():
+        index=index*26+ord(letter)-ord('A')+1
+    return index-1
+
+def xlsxRows(fileName,sheetName=None):  #reads the rows of a worksheet of an xlsx document one by one, the cells have the values that xlrd gives
+    archive=zipfile.ZipFile(fileName)
+    try:
+        sharedStrings=[]
+        if 'xl/sharedStrings.xml' in archive.namelist():
+            for event,element in ElementTree.iterparse(archive.open('xl/sharedStrings.xml')):
+                if element.tag==SPREADSHEET_NAMESPACE+'si':
+                    sharedStrings.append(u''.join(text.text or u'' for text in element.iter(SPREADSHEET_NAMESPACE+'t')))
+                    element.clear()
+        #Find the file of the worksheet from the relationships of the workbook
+        workbook=ElementTree.fromstring(archive.read('xl/workbook.xml'))
+        relationships=ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+        for sheet in workbook.iter(SPREADSHEET_NAMESPACE+'sheet'):
+            if sheetName is None or sheet.get('name')==sheetName:
+                relationshipId=sheet.get(RELATIONSHIP_NAMESPACE+'id')
+                break
+        else:
+            raise ValueError('No worksheet named %r in %s' % (sheetName,fileName))
+        for relationship in relationships:
+            if relationship.get('Id')==relationshipId:
+                target=relationship.get('Target')
+                break
+        else:
+            raise ValueError('No file for the worksheet %r in the relationships of %s' % (sheet.get('name'),fileName))
+        path=target.lstrip('/') if target.startswith('/') else 'xl/'+target
+        rowNumber=0
+        emptyRows=0                     #The empty rows are given only if a row with values follows, as xlrd does
+        sheetData=None
+        for event,element in ElementTree.iterparse(archive.open(path),events=('start','end')):
+            if event=='start':
+                if element.tag==SPREADSHEET_NAMESPACE+'sheetData':
+                    sheetData=element
+                continue
+            if element.tag!=SPREADSHEET_NAMESPACE+'row':
+                continue
+            #The empty rows may not be in the document
+            number=int(element.get('r',rowNumber+1))
+            emptyRows+=number-rowNumber-1
+            rowNumber=number
+            row=[]
+            for cell in element.iter(SPREADSHEET_NAMESPACE+'c'):
+                if cell.get('r'):
+                    row.extend(['']*(columnIndex(cell.get('r'))-len(row)))
+                cellType=cell.get('t')
+                valueElement=cell.find(SPREADSHEET_NAMESPACE+'v')
+                text=valueElement.text if valueElement is not None else None
+                if cellType=='inlineStr':
+                    value=u''.join(text.text or u'' for text in cell.iter(SPREADSHEET_NAMESPACE+'t'))
+                elif text is None:
+                    value=''
+                elif cellType=='s':
+                    value=sharedStrings[int(text)]
+                elif cellType in ('str','e'):
+                    value=text
+                else:                   #Numbers, dates and booleans are floats as in xlrd
+                    value=float(text)
+                row.append(value)
+            sheetData.clear()           #Only the current row is kept in memory
+            if not any(value!='' for value in row):
+                emptyRows+=1
+                continue
+            for i in xrange(emptyRows):
+                yield []
+            emptyRows=0
+            yield row
+    finally:
+        archive.close()
+
+def replaceMissing(chunks,valueDict):   #replaces the missing values (NaN) of the numeric columns of the chunks with the value of the column in valueDict
+    for chunk in chunks:
+        for name,value in valueDict.iteritems():
+            values=chunk.get(name)
+            if values is not None and values.dtype==float:
+                values[numpy.isnan(values)]=value
+        yield chunk
+
+#The ImportChunkedData object
+class ImportChunkedData(object):
+#This object reads the columns of large data sets in chunks of rows, every chunk is an ordered dictionary with keys
+#the names of the columns and values NumPy arrays of their values (float with NaN for the missing values, or object
+#if a column is not numeric). Only the columns given in the columns list are kept, all of them if it is None
+    def CSV_chunks(self,fileName,chunkSize=CHUNK_SIZE,columns=None,delimiter=','):
+        with open(fileName,'rb') as csvFile:
+            for chunk in toChunks(csv.reader(csvFile,delimiter=delimiter),chunkSize,columns):
+                yield chunk
+
+    def XLSX_chunks(self,fileName,sheetName=None,chunkSize=CHUNK_SIZE,columns=None):
+        return toChunks(xlsxRows(fileName,sheetName),chunkSize,columns)
+
+    def XLS_chunks(self,inputbook,sheetName,chunkSize=CHUNK_SIZE,columns=None):    #inputbook is an xlrd workbook, open it with on_demand=True to load only the worksheet
+        worksheet=inputbook.sheet_by_name(sheetName)
+        return toChunks((worksheet.row_values(i) for i in xrange(worksheet.nrows)),chunkSize,columns)
+
+    def Database_chunks(self,cursor,query,parameters=(),chunkSize=CHUNK_SIZE,columns=None):   #cursor is a cursor of any DB-API connection (pyodbc, sqlite3...)
+        cursor.execute(query,parameters)
+        header=[description[0] for description in cursor.description]
+        def rows():
+            yield header
+            while True:
+                rowList=cursor.fetchmany(chunkSize)
+                if not rowList:
+                    return
+                for row in rowList:
+                    yield row
+        return toChunks(rows(),chunkSize,columns)
+
+    def Input_data(self,chunks):        #returns a dictionary with the whole columns of the chunks, as ImportExceldata but with NumPy arrays
+        columnDict=OrderedDict()
+        for chunk in chunks:
+            for name,values in chunk.iteritems():
+                columnDict.setdefault(name,[]).append(values)
+        for name,arrayList in columnDict.iteritems():
+            if any(values.dtype==object for values in arrayList):
+                #The chunks of a column that is not numeric give back their missing values as empty strings
+                arrayList=[values if values.dtype==object else
+                           numpy.array(['' if numpy.isnan(value) else value for value in values],dtype=object)
+                           for values in arrayList]
+            columnDict[name]=numpy.concatenate(arrayList)
+        return columnDict
+
+    def Running_measures(self,chunks):  #returns a dictionary with the RunningMeasures of the numeric columns of the chunks, read in one pass
+        measuresDict=OrderedDict()
+        for chunk in chunks:
+            for name,values in chunk.iteritems():
+                if values.dtype==float:
+                    measuresDict.setdefault(name,RunningMeasures()).update(values)
+        return measuresDict
+
+    def Replace_with_zero(self,chunks,columns):     #replaces the missing values of the given columns with zero, chunk by chunk
+        return replaceMissing(chunks,dict((name,0) for name in columns))
+
+    def Replace_with_mean(self,chunks,measuresDict):    #replaces the missing values of the columns of measuresDict (see Running_measures, read in a first pass over the data) with their mean, chunk by chunk
+        return replaceMissing(chunks,dict((name,measures.mean) for name,measures in measuresDict.iteritems()))
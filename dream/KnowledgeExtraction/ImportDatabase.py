@@ -56,6 +56,14 @@ class ConnectionData(object):
         for j in range(self.number_of_cursors):
             self.cursors.append(self.cnxn.cursor())
         return self.cursors
+
+    def getChunks(self, query, parameters=(), chunkSize=None, columns=None):
+        ''' runs the query on a new cursor and returns its result set in chunks of NumPy
+            column arrays, fetching chunkSize rows at a time (see ImportChunkedData)
+        '''
+        from ImportChunkedData import ImportChunkedData, CHUNK_SIZE
+        return ImportChunkedData().Database_chunks(self.cnxn.cursor(), query, parameters,
+                                                   chunkSize or CHUNK_SIZE, columns)
         
 
     def getConnectionDataPath(self):
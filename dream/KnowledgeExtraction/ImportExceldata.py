@@ -41,9 +41,11 @@ class ImportExceldata(object):
             j=1   
             worksheetDict = {}                  #Create a python dictionary 
             for i in range(num_cols):
-                tempList = []                   #Create a new list
-                for j in range(1,num_rows):    
-                    tempList.append(worksheet.cell_value(j,i))  #Put in this list the cells' values of each column in the worksheet
+                tempList = worksheet.col_values(i, 1, num_rows)    #Put in this list the cells' values of each column in the worksheet
                 if title[i] != '':                              
                     worksheetDict.update({title[i]: tempList})  #Update the dictionary only with excel columns with existed data, give as a key the name of the name of the attribute (e.g. Moulding) 
             return worksheetDict                                #Return the created dictionary
+
+    def Input_chunks(self,worksheetName,inputbook,chunkSize=None,columns=None):  #Reads the worksheet in chunks of NumPy column arrays, see ImportChunkedData
+        from ImportChunkedData import ImportChunkedData, CHUNK_SIZE
+        return ImportChunkedData().XLS_chunks(inputbook,worksheetName,chunkSize or CHUNK_SIZE,columns)
@@ -26,8 +26,7 @@ from dream.KnowledgeExtraction.ImportCSVdata import ImportCSVdata
 from dream.KnowledgeExtraction.DistributionFitting import Distributions
 from dream.KnowledgeExtraction.DistributionFitting import DistFittest
 from dream.KnowledgeExtraction.JSONOutput import JSONOutput
-from dream.KnowledgeExtraction.DetectOutliers import DetectOutliers
-from dream.KnowledgeExtraction.ReplaceMissingValues import ReplaceMissingValues
+from dream.KnowledgeExtraction.CleaningPipeline import CleaningPipeline
 import json
 import os
 ################### Import data using the ImportCSVdataobject ###################################
@@ -48,17 +47,9 @@ def main(test=0, CSVFileName1='InterArrivalData.csv',
     S1=sourceData.get('S1',[])
     
     ################### Processing of the data sets calling the following objects ###################################
-    #Replace missing values calling the corresponding object
-    missingValues=ReplaceMissingValues()
-    M1=missingValues.DeleteMissingValue(M1)
-    M2=missingValues.DeleteMissingValue(M2)
-    S1=missingValues.ReplaceWithMean(S1)
-    
-    #Detect outliers calling the DetectOutliers object
-    outliers=DetectOutliers()
-    M1=outliers.DeleteExtremeOutliers(M1)
-    M2=outliers.DeleteExtremeOutliers(M2)
-    S1=outliers.DeleteOutliers(S1)
+    #Handle the missing values and detect the outliers calling the CleaningPipeline object, the processing times of both stations in one call
+    M1,M2=CleaningPipeline().deleteMissingValues().deleteExtremeOutliers().run([M1,M2])
+    S1,=CleaningPipeline().replaceWithMean().deleteOutliers().run([S1])
     
     #Conduct distribution fitting calling the Distributions object and DistFittest object
     MLE=Distributions()
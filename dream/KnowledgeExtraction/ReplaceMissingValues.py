@@ -22,44 +22,34 @@ Created on 19 Feb 2014
 
 @author: Panos
 '''
+import numpy
+
 from StatisticalMeasures import StatisticalMeasures
+from CleaningPipeline import missingMask, selectPresent
 
 #The ReplaceMissingValues object
 class ReplaceMissingValues(StatisticalMeasures):
 #Three different approaches to handle missing values are included in this object 
+#(the missing values are the empty cells, '' or u'', and None or NaN; CleaningPipeline handles them in many data sets at once)
     def ReplaceWithZero(self,mylist):          #Replace in the given list the missing values with zero
-        i=0   
-        for value in mylist:                    
-            if value is '' :
-                mylist[i]=0.0                  #For the values in the list if there is a missing value replace it with zero
-            i+=1  
-        return mylist                          #Return the replaced list 
+        return self.ReplaceMissing(mylist,0.0) #Return the replaced list 
     
     def DeleteMissingValue(self,mylist):       #Delete the missing value in the given list 
-        i=0
-        listX=[]                               #Create a new list 
-        for value in mylist:
-            if value != '':
-                listX.append(value)            #Add in the new list the non missing values from the given list  
-            i+=1 
-        return listX                           #Return the new list, which has the non missing values from the initial given list 
+        return selectPresent(mylist,~missingMask(mylist))   #Return a new list, which has the non missing values from the initial given list 
     
     def ReplaceWithMean(self,mylist):          #Replace in the given list the missing values with the mean value  
         list1=self.DeleteMissingValue(mylist)  #Create a new list, which is the given list deleting the missing values (calling the DeleteMissingValue method)
-        mean=self.mean(list1)
-        i=0
-        for value in mylist:
-            if value is '' :
-                mylist[i]=mean                #For the values in the initial given list if there is a missing value replace it with the mean value of the new list
-            i+=1 
-        return mylist                         #Return the given list, in which the missing values are replaced with the mean value 
+        return self.ReplaceMissing(mylist,self.mean(list1))    #Return the given list, in which the missing values are replaced with the mean value of the new list
     
     def ReplaceWithMedian(self,mylist):       #Replace in the given list the missing values with the median value 
         list1=self.DeleteMissingValue(mylist) #Create a new list, which is the given list deleting the missing values (calling the DeleteMissingValue method)
-        median=self.median(list1)                #Calculate the median value of the new list
-        i=0
-        for value in mylist:
-            if value is '' :
-                mylist[i]=median                #For the values in the initial given list if there is a missing value replace it with the mean value of the new list
-            i+=1 
-        return mylist                         #Return the given list, in which the missing values are replaced with the mean value
+        return self.ReplaceMissing(mylist,self.median(list1))  #Return the given list, in which the missing values are replaced with the median value of the new list
+
+    def ReplaceMissing(self,mylist,value):    #Replace in place the missing values of the given list with the value
+        missing=missingMask(mylist)
+        if isinstance(mylist,numpy.ndarray):
+            mylist[missing]=value
+        else:
+            for i in numpy.flatnonzero(missing):
+                mylist[i]=value
+        return mylist
@@ -22,91 +22,222 @@ Created on 14 Nov 2013
 
 @author: Panos
 '''
-import rpy2.robjects as robjects
-from rpy2.robjects.packages import importr
+import math
+from collections import OrderedDict
 
-MASS= importr('MASS')
+import numpy
+
+#=============================================== numerical functions ==============================================#
+def betacf(a,b,x):                      #The continued fraction of the incomplete beta function, by the modified Lentz's method
+    tiny=1e-300
+    c=1.
+    d=1-(a+b)*x/(a+1)
+    d=1/(d if abs(d)>tiny else tiny)
+    h=d
+    for m in xrange(1,100000):
+        aa=m*(b-m)*x/((a+2*m-1)*(a+2*m))
+        d=1+aa*d
+        d=1/(d if abs(d)>tiny else tiny)
+        c=1+aa/c
+        c=c if abs(c)>tiny else tiny
+        h*=d*c
+        aa=-(a+m)*(a+b+m)*x/((a+2*m)*(a+2*m+1))
+        d=1+aa*d
+        d=1/(d if abs(d)>tiny else tiny)
+        c=1+aa/c
+        c=c if abs(c)>tiny else tiny
+        h*=d*c
+        if abs(d*c-1)<1e-15:
+            break
+    return h
+
+def stirlingCorrection(x):              #The remainder of the Stirling approximation of log(gamma(x)), for x>=100
+    return 1/(12*x)-1/(360*x**3)+1/(1260*x**5)
+
+def logBeta(a,b):                       #The log of the beta function, without the cancellation of the log gamma values of large parameters
+    small,large=sorted((a,b))
+    if large<100:
+        return math.lgamma(a)+math.lgamma(b)-math.lgamma(a+b)
+    return (math.lgamma(small)-small*math.log(a+b)+small-(large-0.5)*math.log1p(small/large)
+            +stirlingCorrection(large)-stirlingCorrection(a+b))
+
+def betainc(a,b,x,y):                   #The regularized incomplete beta function I_x(a,b), y=1-x is given for precision near 1
+    if x<=0:
+        return 0.
+    if y<=0:
+        return 1.
+    logX=math.log(x) if x<0.5 else math.log1p(-y)
+    logY=math.log(y) if y<0.5 else math.log1p(-x)
+    front=math.exp(a*logX+b*logY-logBeta(a,b))
+    if x<(a+1)/(a+b+2):
+        return front*betacf(a,b,x)/a
+    return 1-front*betacf(b,a,y)/b
+
+def tQuantile(p,df):                    #The p quantile of the Student t distribution with df degrees of freedom, as qt in R
+    if df<=0 or not 0<p<1:
+        return float('nan')
+    if p<0.5:
+        return -tQuantile(1-p,df)
+    if p==0.5:
+        return 0.
+    q=1.-p
+    logDensityConstant=-logBeta(df/2.,0.5)-0.5*math.log(df)
+    def upperTail(t):
+        if df>4e5:                      #The normal approximation that pt in R uses for many degrees of freedom
+            return 0.5*math.erfc(t*(1-1/(4.*df))/math.sqrt(1+t*t/(2.*df))/math.sqrt(2))
+        return 0.5*betainc(df/2.,0.5,df/(df+t*t),t*t/(df+t*t))
+    lower,upper=0.,1.
+    while upperTail(upper)>q:           #Bracket the quantile
+        lower,upper=upper,2*upper
+    t=(lower+upper)/2
+    for i in range(200):                #Newton's method safeguarded by bisection
+        tail=upperTail(t)
+        if tail>q:
+            lower=t
+        else:
+            upper=t
+        density=math.exp(logDensityConstant-(df+1)/2.*math.log1p(t*t/df))
+        nextT=t+(tail-q)/density
+        if not lower<nextT<upper:
+            nextT=(lower+upper)/2
+        if abs(nextT-t)<=4e-16*nextT:
+            return nextT
+        t=nextT
+    return t
 
 #The StatisticalMeasures object
 class StatisticalMeasures(object):
-# A variety of statistical measures are calculated in this object
+# A variety of statistical measures are calculated in this object with NumPy, with the same definitions as the R functions of the same names
     def length(self, data):                      #Calculate the length of data sample
-        data=robjects.FloatVector(data)          ##The given list changes into float vector in order to be handled by RPy2
-        rlength = robjects.r['length']           #Call length function-R function
-        return rlength(data)[0]
+        return len(data)
      
-    def summary(self, data):                    #Calculate the summary of data sample (output the results in a specific format used in R)
-        data=robjects.FloatVector(data)
-        rsummary = robjects.r['summary']        #Call summary - R function
-        return rsummary(data)
+    def summary(self, data):                    #Calculate the summary of data sample (Min, 1st Qu., Median, Mean, 3rd Qu., Max as in R)
+        return self.measures(data)['summary']
         
     def quantile(self,data):                   #Calculate the quantiles (0%,25%,50%,75%,100%) of the data sample
-        data=robjects.FloatVector(data)
-        rquantile = robjects.r['quantile']     #Call quantile - R function
-        return rquantile(data)
+        return numpy.percentile(numpy.asarray(data,dtype=float),[0,25,50,75,100])   #Linear interpolation, the default type 7 of R
     
     def min(self,data):                     #Calculate the minimum value of a data sample
-        data=robjects.FloatVector(data)
-        rmin= robjects.r['min']            #Call min - R function
-        return rmin(data)[0]
+        return float(numpy.min(numpy.asarray(data,dtype=float)))
     
     def max(self,data):                     #Calculate the maximum value of a data sample
-        data=robjects.FloatVector(data)
-        rmax= robjects.r['max']            #Call max - R function
-        return rmax(data)[0]
+        return float(numpy.max(numpy.asarray(data,dtype=float)))
          
     def frequency(self,data):                  #Calculate the frequency of a data point in the sample
-        data=robjects.FloatVector(data)
-        rtable= robjects.r['table']            #Call table - R function
-        return rtable(data)
+        values,counts=numpy.unique(numpy.asarray(data,dtype=float),return_counts=True)
+        return OrderedDict(zip(values.tolist(),counts.tolist()))
         
     def mean(self, data):                     #Calculate the mean value of a data sample 
-        data=robjects.FloatVector(data)
-        rmean = robjects.r['mean']             #Call mean - R function
-        return rmean(data)[0]
+        return self.measures(data)['mean']
     
     def median (self, data):                     #Calculate the median value of a data sample 
-        data=robjects.FloatVector(data)
-        rmedian = robjects.r['median']             #Call median - R function
-        return rmedian(data)[0]
+        return float(numpy.median(numpy.asarray(data,dtype=float)))
     
     def var (self, data):                      #Calculate the variance of a data sample
-        data=robjects.FloatVector(data)
-        rvar = robjects.r['var']               #Call variance function - R function
-        return rvar(data)[0]
+        return self.measures(data)['var']
     
     def sd (self, data):                       #Calculate the standard deviation of a data sample
-        data=robjects.FloatVector(data)
-        rsd = robjects.r['sd']                 #Call standard deviation function - R function
-        return rsd(data)[0]
+        return self.measures(data)['sd']
 
     def range (self, data):                    #Calculate the range of a data sample
-        data=robjects.FloatVector(data)
-        rrange = robjects.r['range']           #Call range function - R function
-        return list(rrange(data))
+        return [self.min(data),self.max(data)]
     
     def mad (self,data):                        #Calculate the median absolute deviation of a data sample
-        data=robjects.FloatVector(data)
-        rmad = robjects.r['mad']                  #Call mad function - R function
-        return rmad(data)[0]
+        data=numpy.asarray(data,dtype=float)
+        return float(1.4826*numpy.median(numpy.abs(data-numpy.median(data))))   #Scaled for consistency with the standard deviation, as in R
         
     def IQR (self, data):                      #Calculate the Interquartile range (IQR) of a data sample
-        data=robjects.FloatVector(data)
-        rIQR = robjects.r['IQR']               #Call IQR function - R function
-        return rIQR(data)[0]
+        Q1,Q3=numpy.percentile(numpy.asarray(data,dtype=float),[25,75])
+        return float(Q3-Q1)
+
+    def measures(self, data):                  #Calculate all the above measures of a data sample at once, in a dictionary by their names
+        return self.measuresList([data])[0]
+
+    def measuresList(self, dataList):          #Calculate all the measures of many data samples in one pass, returns a list of dictionaries
+        measuresList=[None]*len(dataList)
+        indexDict={}                            #The samples of the same length are stacked in one array
+        for index,data in enumerate(dataList):
+            indexDict.setdefault(len(data),[]).append(index)
+        for length,indexList in indexDict.iteritems():
+            if not length:
+                raise ValueError('the measures of an empty data sample are not defined')
+            array=numpy.array([dataList[index] for index in indexList],dtype=float)
+            quantiles=numpy.percentile(array,[0,25,50,75,100],axis=1)
+            #The mean and the variance are accumulated in extended precision as in R, so that they are the same to the last digit
+            extendedArray=array.astype(numpy.longdouble)
+            extendedMean=extendedArray.sum(axis=1)/length
+            extendedMean+=(extendedArray-extendedMean[:,None]).sum(axis=1)/length
+            mean=extendedMean.astype(float)
+            deviations=array-mean[:,None]
+            with numpy.errstate(all='ignore'):
+                var=((deviations*deviations).astype(numpy.longdouble).sum(axis=1)/(length-1)).astype(float)
+            mad=1.4826*numpy.median(numpy.abs(array-quantiles[2][:,None]),axis=1)
+            for i,index in enumerate(indexList):
+                quantile=quantiles[:,i].tolist()
+                measuresList[index]={'length':length,
+                                     'quantile':quantile,
+                                     'min':quantile[0],
+                                     'max':quantile[4],
+                                     'median':quantile[2],
+                                     'mean':float(mean[i]),
+                                     'var':float(var[i]),
+                                     'sd':math.sqrt(var[i]),
+                                     'range':[quantile[0],quantile[4]],
+                                     'mad':float(mad[i]),
+                                     'IQR':quantile[3]-quantile[1],
+                                     'summary':[quantile[0],quantile[1],quantile[2],float(mean[i]),quantile[3],quantile[4]]}
+        return measuresList
     
     def all(self, data):                       #Print the results of the above measures
-        data=robjects.FloatVector(data)
-        print 'The length of the data set is:', self.length(data)
-        print 'The summary is:', self.summary(data)
-        print 'The quartiles and percentiles of the data set are:', self.quantile(data)
+        measures=self.measures(data)
+        print 'The length of the data set is:', measures['length']
+        print 'The summary is:', measures['summary']
+        print 'The quartiles and percentiles of the data set are:', measures['quantile']
         print 'The frequency of the datapoints are:', self.frequency(data)
-        print 'The mean value is:', self.mean(data)
-        print 'The median value is:', self.median(data)
-        print 'The max value is:', self.max(data)
-        print 'The min value is:', self.min(data)
-        print 'The standard deviation is:', self.sd(data)
-        print 'The variance is:', self.var(data)
-        print 'The median absolute deviation is:', self.mad(data)
-        print 'The range is:', self.range(data)
-        print 'The Interquartile Range is:', self.IQR(data)
\ No newline at end of file
+        print 'The mean value is:', measures['mean']
+        print 'The median value is:', measures['median']
+        print 'The max value is:', measures['max']
+        print 'The min value is:', measures['min']
+        print 'The standard deviation is:', measures['sd']
+        print 'The variance is:', measures['var']
+        print 'The median absolute deviation is:', measures['mad']
+        print 'The range is:', measures['range']
+        print 'The Interquartile Range is:', measures['IQR']
+
+#The RunningMeasures object
+class RunningMeasures(object):
+#The length, mean, variance, minimum and maximum of a data sample given in chunks, updated chunk by chunk without keeping
+#the values (by the parallel algorithm of Chan et al.). The missing values (NaN) are counted apart
+    def __init__(self):
+        self.length=0
+        self.missing=0
+        self.mean=float('nan')
+        self.sumOfSquares=0.                    #The sum of the squares of the deviations from the mean
+        self.min=float('inf')
+        self.max=float('-inf')
+
+    def update(self, chunk):
+        chunk=numpy.asarray(chunk,dtype=float)
+        values=chunk[~numpy.isnan(chunk)]
+        self.missing+=len(chunk)-len(values)
+        if not len(values):
+            return self
+        mean=values.mean()
+        sumOfSquares=((values-mean)**2).sum()
+        if not self.length:
+            self.mean,self.sumOfSquares=mean,sumOfSquares
+        else:
+            length=self.length+len(values)
+            delta=mean-self.mean
+            self.mean+=delta*len(values)/length
+            self.sumOfSquares+=sumOfSquares+delta**2*self.length*len(values)/length
+        self.length+=len(values)
+        self.min=min(self.min,values.min())
+        self.max=max(self.max,values.max())
+        return self
+
+    def var(self):
+        return self.sumOfSquares/(self.length-1) if self.length>1 else float('nan')
+
+    def sd(self):
+        return math.sqrt(self.var())
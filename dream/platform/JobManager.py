@@ -0,0 +1,226 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+"""Asynchronous jobs of the platform.
+
+A job runs in its own process, which sends back the progress events reported
+during the run (replication, ACO generation, best score so far, ...) and at the
+end the result. The events that carry a partial result (the best solution found
+so far) let the clients show early solutions, and a job can be cancelled.
+Only a fixed number of jobs run at the same time, the next ones wait in the
+order they were submitted.
+"""
+
+import os
+import sys
+import time
+import uuid
+import signal
+import threading
+import traceback
+import multiprocessing
+from collections import deque
+
+PENDING = 'pending'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+TIMEOUT = 'timeout'
+FINISHED_STATE_LIST = (SUCCEEDED, FAILED, CANCELLED, TIMEOUT)
+
+def _runJob(connection, func, args, kw):
+  from dream.simulation.Globals import setProgressListener
+  pid = os.getpid()
+  def listener(event):
+    # the processes forked by the run (e.g. for the replications) do not report
+    if os.getpid() == pid:
+      connection.send(('progress', event))
+  setProgressListener(listener)
+  signal.signal(signal.SIGTERM, lambda sig, stack: sys.exit(0))
+  try:
+    result = func(*args, **kw)
+  except Exception:
+    result = dict(error=traceback.format_exc())
+  connection.send(('result', result))
+  connection.close()
+
+class Job(object):
+  """A job running a function in a process. on_finish is called with the job
+  when a job that was started finishes.
+  """
+  def __init__(self, timeout=None, on_finish=None):
+    self.id = uuid.uuid4().hex
+    self.state = PENDING
+    self.timeout = timeout
+    self.on_finish = on_finish
+    self.event_list = []
+    self.result = None
+    self.created = time.time()
+    self.started = None
+    self.finished = None
+    self.lock = threading.Lock()
+    self.process = None
+    self.cache_key = None     # the key of the result in the result cache, if it is to be cached
+
+  def start(self, func, args, kw):
+    """Runs func(*args, **kw) in the process of the job. Returns False if the
+    job was cancelled before it started.
+    """
+    with self.lock:
+      if self.state != PENDING:
+        return False
+      self.connection, child_connection = multiprocessing.Pipe(False)
+      self.process = multiprocessing.Process(target=_runJob,
+                                             args=(child_connection, func, args, kw))
+      self.state = RUNNING
+      self.started = time.time()
+      self.process.start()
+    child_connection.close()
+    thread = threading.Thread(target=self.watch)
+    thread.daemon = True
+    thread.start()
+    return True
+
+  def watch(self):
+    """Collects the events and the result sent by the process of the job.
+    """
+    while True:
+      timeout = None
+      if self.timeout:
+        # the time waiting for a slot does not count
+        timeout = max(self.started + self.timeout - time.time(), 0)
+      try:
+        if not self.connection.poll(timeout):
+          self.finish(TIMEOUT, dict(error="Timeout after %s seconds" % self.timeout))
+          break
+        kind, value = self.connection.recv()
+      except (EOFError, IOError):
+        self.finish(FAILED, dict(error="The job process exited"))
+        break
+      if kind == 'progress':
+        with self.lock:
+          value['time'] = time.time() - self.created
+          self.event_list.append(value)
+      else:
+        self.finish(value.get('success') and SUCCEEDED or FAILED, value)
+        break
+    self.process.join()
+    self.connection.close()
+
+  def finish(self, state, result):
+    with self.lock:
+      if self.state in FINISHED_STATE_LIST:
+        return
+      self.state = state
+      self.result = result
+      self.finished = time.time()
+      started = self.started is not None
+    if self.process is not None and state != SUCCEEDED and self.process.is_alive():
+      self.process.terminate()
+    if started and self.on_finish is not None:
+      self.on_finish(self)
+
+  def cancel(self):
+    self.finish(CANCELLED, dict(error="Cancelled"))
+
+  def getStatus(self, since=0):
+    """Returns the state of the job and the events after the since first ones,
+    the client passes next as since to get only the new events.
+    """
+    with self.lock:
+      event_list = self.event_list[since:]
+      status = dict(id=self.id,
+                    state=self.state,
+                    events=event_list,
+                    next=since + len(event_list),
+                    elapsed=(self.finished or time.time()) - self.created)
+      if self.event_list:
+        status['progress'] = self.event_list[-1]
+      return status
+
+class JobManager(object):
+  """Keeps the submitted jobs and runs at most max_running of them at the same
+  time. Only the max_finished most recent finished jobs are kept.
+  """
+  def __init__(self, max_finished=100, max_running=None):
+    self.max_finished = max_finished
+    self.max_running = max_running or multiprocessing.cpu_count()
+    self.lock = threading.Lock()
+    self.job_dict = {}
+    self.pending_list = deque()   # the (job, func, args, kw) waiting for a slot
+    self.running = 0
+
+  def submit(self, func, args=(), kw=None, timeout=None):
+    """Runs func(*args, **kw) asynchronously and returns its job. The job is
+    pending until a slot is free.
+    """
+    job = Job(timeout=timeout, on_finish=self.jobFinished)
+    with self.lock:
+      self.job_dict[job.id] = job
+      self.purge()
+      self.pending_list.append((job, func, args, kw or {}))
+    self.startPending()
+    return job
+
+  def startPending(self):
+    """Starts the pending jobs while there are free slots.
+    """
+    while True:
+      with self.lock:
+        if self.running >= self.max_running or not self.pending_list:
+          return
+        job, func, args, kw = self.pending_list.popleft()
+        self.running += 1
+      # a job cancelled while it was pending is not started
+      if not job.start(func, args, kw):
+        with self.lock:
+          self.running -= 1
+
+  def jobFinished(self, job):
+    with self.lock:
+      self.running -= 1
+    self.startPending()
+
+  def getStatistics(self):
+    with self.lock:
+      return dict(max_running=self.max_running,
+                  running=self.running,
+                  pending=len([job for job, func, args, kw in self.pending_list
+                               if job.state == PENDING]))
+
+  def submitFinished(self, result):
+    """Adds a job that is already finished, e.g. a result served from the cache.
+    """
+    job = Job()
+    job.finish(result.get('success') and SUCCEEDED or FAILED, result)
+    with self.lock:
+      self.job_dict[job.id] = job
+      self.purge()
+    return job
+
+  def getJob(self, job_id):
+    with self.lock:
+      return self.job_dict.get(job_id)
+
+  def purge(self):
+    finished_job_list = sorted((job.finished, job.id)
+      for job in self.job_dict.itervalues() if job.state in FINISHED_STATE_LIST)
+    for finished, job_id in finished_job_list[:-self.max_finished or None]:
+      del self.job_dict[job_id]
@@ -0,0 +1,188 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+"""Parallel knowledge extraction of the platform.
+
+The columns of the uploaded workbook (the processing times of the stations
+and their times to failure and to repair) are fitted over a pool of
+processes. The fits are given as each column finishes, so that the columns
+fitted before the timeout are kept, and they are cached by the hash of the
+values of the column and of the fitting code, so that a workbook uploaded
+again with a few columns edited only fits these columns again.
+"""
+
+import time
+import hashlib
+import threading
+import traceback
+import multiprocessing
+
+import numpy
+
+from dream.KnowledgeExtraction.DistributionFitting import DistFittest
+from dream.KnowledgeExtraction.ReplaceMissingValues import ReplaceMissingValues
+from dream.platform.ResultCache import getCodeVersion
+
+# the worksheets of the times to failure and to repair are found by the start
+# of their name, the processing times are in the first worksheet
+TTF_SHEET_PREFIX_LIST = ('ttf', 'mttf', 'time to failure', 'times to failure')
+TTR_SHEET_PREFIX_LIST = ('ttr', 'mttr', 'time to repair', 'times to repair')
+# the packages whose code gives the fits
+FIT_CODE_PACKAGE_LIST = ('KnowledgeExtraction', )
+
+def getKnowledgeExtractionColumns(workbook, station_list):
+  """Returns the columns of the workbook to fit, by (station, field) where field
+  is processingTime, TTF or TTR, without their empty cells.
+  """
+  from dream.KnowledgeExtraction.ImportExceldata import ImportExceldata
+  sheet_name_list = workbook.sheet_names()
+  sheet_list = [(sheet_name_list[0], 'processingTime')]
+  for sheet_name in sheet_name_list[1:]:
+    name = sheet_name.strip().lower()
+    if name.startswith(TTF_SHEET_PREFIX_LIST):
+      sheet_list.append((sheet_name, 'TTF'))
+    elif name.startswith(TTR_SHEET_PREFIX_LIST):
+      sheet_list.append((sheet_name, 'TTR'))
+  column_dict = {}
+  for sheet_name, field in sheet_list:
+    for station, values in ImportExceldata().Input_data(sheet_name, workbook).iteritems():
+      if station in station_list:
+        values = ReplaceMissingValues().DeleteMissingValue(values)
+        if values:
+          column_dict[(station, field)] = values
+  return column_dict
+
+def getColumnKey(values, code_version=None):
+  """Returns the hash of the values of a column and of the version of the
+  fitting code, the key of its fit in the cache, so that the fits of an older
+  version of the code are not used.
+  """
+  if code_version is None:
+    code_version = getCodeVersion(FIT_CODE_PACKAGE_LIST)
+  return hashlib.sha1(code_version +
+    numpy.asarray(values, dtype=float).tostring()).hexdigest()
+
+def fitColumn(args):
+  """Fits the distribution of the values of a column. Returns the key of the
+  column, the fit (None if no distribution fits) and the traceback of the error
+  if the fit failed.
+  """
+  key, values = args
+  try:
+    return key, DistFittest().ks_test(values), None
+  except Exception:
+    return key, None, traceback.format_exc()
+
+class KnowledgeExtractionExecutor(object):
+  """Fits the distributions of columns of data over a pool of processes.
+
+  fit_cache is an object with the get(key) and put(key, value) methods of
+  ResultCache, it keeps the fits of the columns by the hash of their values.
+  """
+  def __init__(self, processes=None, fit_cache=None):
+    self.processes = processes or multiprocessing.cpu_count()
+    self.fit_cache = fit_cache
+    self.lock = threading.Lock()
+    self.fitted = 0
+    self.cached = 0
+    self.timeouts = 0
+
+  def canRunInProcesses(self, column_count, deadline):
+    """The columns are fitted in processes if there are several to fit in
+    parallel, or if they have to be terminated at the deadline.
+    """
+    if not column_count:
+      return False
+    if deadline is None and (self.processes <= 1 or column_count <= 1):
+      return False
+    # daemonic processes (e.g. the workers of WorkerPool) are not allowed to
+    # have children, the pool terminates the job at its own timeout
+    return not multiprocessing.current_process().daemon
+
+  def run(self, column_dict, timeout=None):
+    """Fits the columns of column_dict and yields (column id, fit, error) as
+    they finish, the cached ones first. The columns that are not fitted in
+    timeout seconds are not given.
+    """
+    deadline = None
+    if timeout is not None:
+      deadline = time.time() + timeout
+    # the columns with the same values are fitted once
+    id_list_dict = {}
+    values_dict = {}
+    for column_id, values in column_dict.iteritems():
+      key = getColumnKey(values)
+      id_list_dict.setdefault(key, []).append(column_id)
+      values_dict[key] = values
+    pending_list = []
+    for key in sorted(id_list_dict):
+      cached = self.fit_cache is not None and self.fit_cache.get(key)
+      if cached:
+        with self.lock:
+          self.cached += 1
+        for column_id in id_list_dict[key]:
+          yield column_id, cached['fit'], None
+      else:
+        pending_list.append((key, values_dict[key]))
+    for key, fit, error in self.fit(pending_list, deadline):
+      if error is None:
+        with self.lock:
+          self.fitted += 1
+        if self.fit_cache is not None:
+          self.fit_cache.put(key, dict(fit=fit))
+      for column_id in id_list_dict[key]:
+        yield column_id, fit, error
+
+  def fit(self, pending_list, deadline):
+    """Yields the results of fitColumn for the (key, values) of pending_list
+    in the order they finish, until the deadline. The column being fitted at
+    the deadline is terminated, even if there is only one.
+    """
+    if not self.canRunInProcesses(len(pending_list), deadline):
+      for args in pending_list:
+        if deadline is not None and time.time() >= deadline:
+          with self.lock:
+            self.timeouts += 1
+          return
+        yield fitColumn(args)
+      return
+    pool = multiprocessing.Pool(processes=min(self.processes, len(pending_list)))
+    try:
+      iterator = pool.imap_unordered(fitColumn, pending_list)
+      for i in xrange(len(pending_list)):
+        remaining = None
+        if deadline is not None:
+          remaining = max(deadline - time.time(), 0)
+        try:
+          yield iterator.next(remaining)
+        except multiprocessing.TimeoutError:
+          with self.lock:
+            self.timeouts += 1
+          return
+    finally:
+      # the columns still being fitted are abandoned
+      pool.terminate()
+      pool.join()
+
+  def getStatistics(self):
+    with self.lock:
+      return dict(processes=self.processes,
+                  fitted=self.fitted,
+                  cached=self.cached,
+                  timeouts=self.timeouts)
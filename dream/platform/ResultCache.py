@@ -0,0 +1,173 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+"""Cache of the simulation results, kept on disk and addressed by a hash of
+the canonical model JSON and of the code that runs it.
+"""
+
+import os
+import json
+import errno
+import hashlib
+import tempfile
+import threading
+from copy import deepcopy
+
+# the fields of the input that have no effect on the result of the simulation
+VOLATILE_FIELD_LIST = ('result', )
+VOLATILE_GENERAL_FIELD_LIST = ('processTimeout', )
+# the packages whose code gives the result of the simulation
+CODE_PACKAGE_LIST = ('simulation', 'plugins')
+
+_code_version_dict = {}
+
+def isDeterministic(data):
+  """Returns True if the model is run with a fixed seed, so that running it
+  again gives the same result.
+  """
+  seed = data.get('general', {}).get('seed')
+  return seed not in (None, '', ' ')
+
+def getCodeVersion(package_list=CODE_PACKAGE_LIST):
+  """Returns the hash of the source files of the packages, by default the
+  simulation and the plugins, so that the results of an older version of the
+  code are not used.
+  """
+  package_list = tuple(package_list)
+  if package_list not in _code_version_dict:
+    code_hash = hashlib.sha1()
+    dream_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for package in package_list:
+      for path, directory_list, filename_list in os.walk(
+          os.path.join(dream_path, package)):
+        directory_list.sort()
+        for filename in sorted(filename_list):
+          if filename.endswith('.py'):
+            code_hash.update(os.path.relpath(os.path.join(path, filename), dream_path))
+            with open(os.path.join(path, filename), 'rb') as source_file:
+              code_hash.update(source_file.read())
+    _code_version_dict[package_list] = code_hash.hexdigest()
+  return _code_version_dict[package_list]
+
+def getCacheKey(data, code_version=None):
+  """Returns the hash of the canonical JSON of the model, leaving out the
+  volatile fields, and of the version of the code.
+  """
+  if code_version is None:
+    code_version = getCodeVersion()
+  data = deepcopy(data)
+  for field in VOLATILE_FIELD_LIST:
+    data.pop(field, None)
+  for field in VOLATILE_GENERAL_FIELD_LIST:
+    data.get('general', {}).pop(field, None)
+  canonical = json.dumps(data, sort_keys=True, separators=(',', ':'))
+  return hashlib.sha1(code_version + canonical).hexdigest()
+
+class ResultCache(object):
+  """Size bounded least recently used cache of results stored as json files
+  in a directory. The modification time of the files is the time they were
+  last used, the least recently used are evicted first.
+  """
+  def __init__(self, directory, max_size=100 * 1024 * 1024):
+    self.directory = directory
+    self.max_size = max_size
+    self.lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    try:
+      os.makedirs(directory)
+    except OSError, e:
+      if e.errno != errno.EEXIST:
+        raise
+
+  def getPath(self, key):
+    return os.path.join(self.directory, key + '.json')
+
+  def get(self, key):
+    """Returns the cached result for the key, or None.
+    """
+    path = self.getPath(key)
+    try:
+      with open(path) as result_file:
+        result = json.load(result_file)
+      os.utime(path, None)
+    except (IOError, OSError, ValueError):
+      with self.lock:
+        self.misses += 1
+      return None
+    with self.lock:
+      self.hits += 1
+    return result
+
+  def put(self, key, result):
+    """Stores the result for the key and evicts the least recently used
+    results if the cache grew over its size.
+    """
+    fd, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+    with os.fdopen(fd, 'w') as result_file:
+      json.dump(result, result_file)
+    os.rename(temporary_path, self.getPath(key))
+    self.evict()
+
+  def getEntryList(self):
+    """Returns (modification time, size, path) of the cached results, the least
+    recently used first.
+    """
+    entry_list = []
+    for filename in os.listdir(self.directory):
+      if not filename.endswith('.json'):
+        continue
+      path = os.path.join(self.directory, filename)
+      try:
+        stat = os.stat(path)
+      except OSError:
+        continue
+      entry_list.append((stat.st_mtime, stat.st_size, path))
+    entry_list.sort()
+    return entry_list
+
+  def evict(self):
+    with self.lock:
+      entry_list = self.getEntryList()
+      size = sum(entry_size for (mtime, entry_size, path) in entry_list)
+      # always keep the most recent result
+      for mtime, entry_size, path in entry_list[:-1]:
+        if size <= self.max_size:
+          break
+        try:
+          os.remove(path)
+        except OSError:
+          continue
+        size -= entry_size
+        self.evictions += 1
+
+  def getStatistics(self):
+    """Returns the hit / miss metrics and the current size of the cache.
+    """
+    entry_list = self.getEntryList()
+    with self.lock:
+      requests = self.hits + self.misses
+      return dict(hits=self.hits,
+                  misses=self.misses,
+                  hit_ratio=requests and float(self.hits) / requests,
+                  evictions=self.evictions,
+                  entries=len(entry_list),
+                  size=sum(entry_size for (mtime, entry_size, path) in entry_list),
+                  max_size=self.max_size)
@@ -0,0 +1,217 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+"""Pool of pre-forked worker processes running the jobs of the platform.
+
+The workers are forked once, after the platform imported the simulation and
+the plugins (see preloadPlugins), so that a job does not pay for starting a
+process and importing them. A worker is replaced when a job times out or after it ran a number of jobs.
+
+The workers are not daemonic, as the jobs start their own pools of processes
+(e.g. ACO, Enumeration or the fits of the knowledge extraction), so they are
+stopped explicitly when the pool is closed or the server exits.
+"""
+
+import sys
+import atexit
+import time
+import signal
+import threading
+import traceback
+import multiprocessing
+import Queue
+from collections import deque
+
+class TimeoutError(Exception):
+  pass
+
+class QueueFullError(Exception):
+  pass
+
+def _workerLoop(connection):
+  if hasattr(signal, 'SIGUSR1'):
+    signal.signal(signal.SIGUSR1, lambda sig, stack: traceback.print_stack(stack))
+  # exit when terminated, the job is abandoned
+  signal.signal(signal.SIGTERM, lambda sig, stack: sys.exit(0))
+  while True:
+    try:
+      job = connection.recv()
+    except EOFError:
+      break
+    if job is None:
+      break
+    func, args, kw = job
+    try:
+      result = func(*args, **kw)
+    except Exception:
+      result = dict(error=traceback.format_exc())
+    connection.send(result)
+
+class Worker(object):
+  """A worker process and the pipe to send it the jobs.
+  """
+  def __init__(self):
+    self.connection, child_connection = multiprocessing.Pipe()
+    self.process = multiprocessing.Process(target=_workerLoop,
+                                           args=(child_connection, ))
+    self.process.start()
+    child_connection.close()
+    self.job_count = 0
+
+  def run(self, func, timeout, args, kw):
+    self.job_count += 1
+    self.connection.send((func, args, kw))
+    if not self.connection.poll(timeout):
+      raise TimeoutError()
+    return self.connection.recv()
+
+  def stop(self):
+    try:
+      self.connection.send(None)
+    except (IOError, OSError):
+      pass
+    self.process.join(1)
+    self.terminate()
+
+  def terminate(self):
+    if self.process.is_alive():
+      self.process.terminate()
+    self.process.join()
+    self.connection.close()
+
+class WorkerPool(object):
+  """Runs the jobs in a fixed number of worker processes.
+
+  At most max_queue requests wait for a worker, the next ones are rejected
+  with QueueFullError. A worker is recycled after max_jobs jobs.
+  """
+  def __init__(self, size, max_jobs=100, max_queue=20, latency_window=1000):
+    self.size = size
+    self.max_jobs = max_jobs
+    self.max_queue = max_queue
+    self.lock = threading.Lock()
+    self.slots = threading.Semaphore(size + max_queue)
+    self.worker_set = set()
+    self.closed = False
+    self.idle_workers = Queue.Queue()
+    for i in range(size):
+      self.idle_workers.put(self.startWorker())
+    # the workers are not daemonic, they would be waited for at exit
+    atexit.register(self.close)
+    self.waiting = 0
+    self.busy = 0
+    self.completed = 0
+    self.timeouts = 0
+    self.recycled = 0
+    self.rejected = 0
+    self.latency_list = deque(maxlen=latency_window)
+    self.wait_time_list = deque(maxlen=latency_window)
+
+  def run(self, func, timeout, *args, **kw):
+    """Runs func(*args, **kw) in a worker and returns its result.
+
+    Raises TimeoutError if it did not finish in timeout seconds and
+    QueueFullError if too many requests are already waiting.
+    """
+    if not self.slots.acquire(False):
+      with self.lock:
+        self.rejected += 1
+      raise QueueFullError()
+    try:
+      start = time.time()
+      with self.lock:
+        self.waiting += 1
+      worker = self.idle_workers.get()
+      started = time.time()
+      with self.lock:
+        self.waiting -= 1
+        self.busy += 1
+        self.wait_time_list.append(started - start)
+      try:
+        result = worker.run(func, timeout, args, kw)
+      except TimeoutError:
+        with self.lock:
+          self.timeouts += 1
+        worker = self.replaceWorker(worker, worker.terminate)
+        raise
+      except (IOError, OSError, EOFError):
+        # the worker died, replace it
+        worker = self.replaceWorker(worker, worker.terminate)
+        raise
+      finally:
+        if worker.job_count >= self.max_jobs:
+          with self.lock:
+            self.recycled += 1
+          worker = self.replaceWorker(worker, worker.stop)
+        with self.lock:
+          self.busy -= 1
+          self.latency_list.append(time.time() - start)
+        self.idle_workers.put(worker)
+      with self.lock:
+        self.completed += 1
+      return result
+    finally:
+      self.slots.release()
+
+  def startWorker(self):
+    worker = Worker()
+    with self.lock:
+      self.worker_set.add(worker)
+    return worker
+
+  def replaceWorker(self, worker, stop):
+    with self.lock:
+      self.worker_set.discard(worker)
+    stop()
+    return self.startWorker()
+
+  def close(self):
+    """Stops the workers, the jobs they still run are abandoned.
+    """
+    with self.lock:
+      if self.closed:
+        return
+      self.closed = True
+      worker_list = list(self.worker_set)
+      self.worker_set.clear()
+    for worker in worker_list:
+      worker.stop()
+
+  def getStatistics(self):
+    """Returns the queue depth, the counters and the latency of the jobs.
+    """
+    with self.lock:
+      latency_list = sorted(self.latency_list)
+      wait_time_list = list(self.wait_time_list)
+      statistics = dict(size=self.size,
+                        max_queue=self.max_queue,
+                        queue_depth=self.waiting,
+                        busy=self.busy,
+                        completed=self.completed,
+                        timeouts=self.timeouts,
+                        recycled=self.recycled,
+                        rejected=self.rejected)
+    if latency_list:
+      statistics.update(
+        latency_mean=sum(latency_list) / len(latency_list),
+        latency_p50=latency_list[len(latency_list) // 2],
+        latency_p95=latency_list[int(len(latency_list) * .95)],
+        latency_max=latency_list[-1],
+        wait_time_mean=sum(wait_time_list) / len(wait_time_list))
+    return statistics
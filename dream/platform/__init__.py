@@ -26,9 +26,15 @@ import xlrd
 import traceback
 import multiprocessing
 import Queue
-from dream.KnowledgeExtraction.DistributionFitting import DistFittest
-from dream.KnowledgeExtraction.ImportExceldata import ImportExceldata
+import tempfile
+import time
+import threading
 from dream.plugins.plugin import PluginRegistry
+from dream.platform.ResultCache import ResultCache, getCacheKey, isDeterministic
+from dream.platform.WorkerPool import WorkerPool, TimeoutError, QueueFullError
+from dream.platform.JobManager import JobManager, SUCCEEDED, FINISHED_STATE_LIST
+from dream.platform.KnowledgeExtractionExecutor import KnowledgeExtractionExecutor, \
+    getKnowledgeExtractionColumns
 
 import os.path
 import logging
@@ -50,6 +56,17 @@ class InfinityJSONEncoder(JSONEncoder):
       yield j
 app.json_encoder = InfinityJSONEncoder
 
+# the cache of the simulation results, set in main
+result_cache = None
+# the pool of processes running the jobs, set in main
+worker_pool = None
+# the asynchronous jobs
+job_manager = JobManager()
+# fits the distributions of the knowledge extraction, set in main
+knowledge_extraction_executor = KnowledgeExtractionExecutor()
+# the knowledge extractions that can run in the requests at the same time, set in main
+knowledge_extraction_slots = threading.BoundedSemaphore(2)
+
 @app.route("/")
 def front_page():
   return redirect(url_for('static', filename='dream/index.html'))
@@ -91,10 +108,22 @@ def positionGraph():
 
   return jsonify(preference_dict)
 
-class TimeoutError(Exception):
-  pass
+def preloadPlugins():
+  """Imports the modules of the plugins, which the jobs otherwise import by
+  their dotted names. The plugins whose dependencies are missing are skipped.
+  """
+  import pkgutil
+  import dream.plugins
+  for importer, name, is_package in pkgutil.walk_packages(
+      dream.plugins.__path__, 'dream.plugins.', onerror=lambda name: None):
+    try:
+      __import__(name)
+    except Exception:
+      app.logger.debug("Plugin %s is not preloaded:\n%s" % (name, traceback.format_exc()))
 
 def runWithTimeout(func, timeout, *args, **kw):
+  if worker_pool is not None:
+    return worker_pool.run(func, timeout, *args, **kw)
   queue = multiprocessing.Queue()
   process = multiprocessing.Process(
     target=_runWithTimeout,
@@ -142,11 +171,96 @@ def runSimulation():
   except (KeyError, ValueError, TypeError):
     timeout = 60
 
+  # runs with a fixed seed give the same result, serve them from the cache
+  cache_key = None
+  if result_cache is not None and isDeterministic(parameter_dict):
+    cache_key = getCacheKey(parameter_dict)
+    result = result_cache.get(cache_key)
+    if result is not None:
+      return jsonify(result)
+
   try:
     result = runWithTimeout(_runSimulation, timeout, parameter_dict)
+    if cache_key is not None and result.get('success'):
+      result_cache.put(cache_key, result)
     return jsonify(result)
   except TimeoutError:
     return jsonify(dict(error="Timeout after %s seconds" % timeout))
+  except QueueFullError:
+    return busyResponse()
+
+@app.route("/submitSimulation", methods=["POST", "OPTIONS"])
+def submitSimulation():
+  """Starts running the simulation and returns the id of its job, to follow it
+  with /jobStatus and get its result with /jobResult. There is no time limit
+  unless general/processTimeout is given.
+  """
+  parameter_dict = request.json
+  try:
+    timeout = int(parameter_dict['general']['processTimeout'])
+  except (KeyError, ValueError, TypeError):
+    timeout = None
+
+  if result_cache is not None and isDeterministic(parameter_dict):
+    result = result_cache.get(getCacheKey(parameter_dict))
+    if result is not None:
+      return jsonify(dict(job_id=job_manager.submitFinished(result).id))
+
+  job = job_manager.submit(_runSimulation, (parameter_dict, ), timeout=timeout)
+  if result_cache is not None and isDeterministic(parameter_dict):
+    job.cache_key = getCacheKey(parameter_dict)
+  return jsonify(dict(job_id=job.id))
+
+@app.route("/jobStatus/<job_id>", methods=["GET"])
+def jobStatus(job_id):
+  """Returns the state and the progress events of the job. Only the events
+  after the first "since" ones are returned, the events with a result hold the
+  best solution found so far.
+  """
+  job = job_manager.getJob(job_id)
+  if job is None:
+    return jsonify(dict(error="No job %s" % job_id))
+  return jsonify(job.getStatus(since=request.args.get('since', 0, type=int)))
+
+@app.route("/jobResult/<job_id>", methods=["GET"])
+def jobResult(job_id):
+  """Returns the result of the job once it is finished"""
+  job = job_manager.getJob(job_id)
+  if job is None:
+    return jsonify(dict(error="No job %s" % job_id))
+  if job.state not in FINISHED_STATE_LIST:
+    return jsonify(dict(state=job.state))
+  if job.state == SUCCEEDED and job.cache_key is not None:
+    result_cache.put(job.cache_key, job.result)
+    job.cache_key = None
+  return jsonify(job.result)
+
+@app.route("/cancelJob/<job_id>", methods=["POST", "OPTIONS"])
+def cancelJob(job_id):
+  job = job_manager.getJob(job_id)
+  if job is None:
+    return jsonify(dict(error="No job %s" % job_id))
+  job.cancel()
+  return jsonify(dict(state=job.state))
+
+def busyResponse():
+  response = jsonify(dict(error="Server busy, too many requests are waiting"))
+  response.status_code = 503
+  return response
+
+@app.route("/workerPoolStatistics", methods=["GET"])
+def workerPoolStatistics():
+  """Returns the queue depth and latency metrics of the worker pool"""
+  if worker_pool is None:
+    return jsonify(dict(enabled=False))
+  return jsonify(dict(enabled=True, **worker_pool.getStatistics()))
+
+@app.route("/resultCacheStatistics", methods=["GET"])
+def resultCacheStatistics():
+  """Returns the hit / miss metrics of the result cache"""
+  if result_cache is None:
+    return jsonify(dict(enabled=False))
+  return jsonify(dict(enabled=True, **result_cache.getStatistics()))
 
 def _runSimulation(parameter_dict):
   try:
@@ -165,43 +279,88 @@ def _runSimulation(parameter_dict):
 
 @app.route("/runKnowledgeExtraction", methods=["POST", "OPTIONS"])
 def runKnowledgeExtraction():
+  """Fits the distributions of the data of the workbook at general/ke_url.
+  The columns are fitted in parallel by knowledge_extraction_executor, which
+  starts its own processes, so the extraction runs in the request. At the
+  timeout, the result has the columns fitted so far and is marked as partial.
+  Only --keruns extractions run at the same time, the next requests are told
+  that the server is busy.
+  """
   parameter_dict = request.json
   try:
     timeout = int(parameter_dict['general']['processTimeout'])
   except (KeyError, ValueError, TypeError):
     timeout = 60
+  if not knowledge_extraction_slots.acquire(False):
+    return busyResponse()
+  try:
+    return jsonify(_runKnowledgeExtraction(parameter_dict, timeout=timeout))
+  finally:
+    knowledge_extraction_slots.release()
 
+@app.route("/submitKnowledgeExtraction", methods=["POST", "OPTIONS"])
+def submitKnowledgeExtraction():
+  """Starts the knowledge extraction and returns the id of its job, a progress
+  event is reported as each column is fitted.
+  """
+  parameter_dict = request.json
   try:
-    result = runWithTimeout(_runKnowledgeExtraction, timeout, parameter_dict)
-    return jsonify(result)
-  except TimeoutError:
-    return jsonify(dict(error="Timeout after %s seconds" % timeout))
+    timeout = int(parameter_dict['general']['processTimeout'])
+  except (KeyError, ValueError, TypeError):
+    timeout = None
+  job = job_manager.submit(_runKnowledgeExtraction, (parameter_dict, ),
+                           dict(timeout=timeout))
+  return jsonify(dict(job_id=job.id))
+
+@app.route("/knowledgeExtractionStatistics", methods=["GET"])
+def knowledgeExtractionStatistics():
+  """Returns the counters of the fits of the knowledge extraction run by
+  /runKnowledgeExtraction. The extractions of /submitKnowledgeExtraction run
+  in the processes of the jobs and are not counted.
+  """
+  return jsonify(knowledge_extraction_executor.getStatistics())
 
-def _runKnowledgeExtraction(parameter_dict):
+def _runKnowledgeExtraction(parameter_dict, timeout=None):
+  from dream.simulation.Globals import reportProgress
   try:
+    start = time.time()
     workbook = xlrd.open_workbook(
         file_contents=urllib.urlopen(parameter_dict['general']['ke_url']).read())
-    worksheets = workbook.sheet_names()
-    worksheet_ProcessingTimes = worksheets[0]   #It defines the worksheet_ProcessingTimes as the first sheet of the Excel file
-
-    A=ImportExceldata()            #Call the Import_Excel object 
-    B=DistFittest()             #Call the Distribution Fitting object
-    ProcessingTimes= A.Input_data(worksheet_ProcessingTimes, workbook)  #Create a dictionary with the imported data from the Excel file
-
-    data = parameter_dict                            #It loads the file
-#     nodes = data['nodes'] 
-    nodes = data['graph']['node']
-
-    for station, values in ProcessingTimes.items():             #This loop searches the elements of the Excel imported data and if these elements exist in json file append the distribution fitting results in a dictionary   
-      if station in nodes: 
-        temp= B.ks_test(values)
-        dist=temp['distributionType']
-        del temp['distributionType']
-        temp={dist:temp, "distribution": dist}
-        from pprint import pprint
-        pprint(temp)
-        parameter_dict['graph']['node'][station]['processingTime'] = temp
-    return dict(success=True, data=parameter_dict)
+    nodes = parameter_dict['graph']['node']
+    # the processing times, and the times to failure and to repair if the
+    # workbook has their worksheets, of the stations of the graph
+    column_dict = getKnowledgeExtractionColumns(workbook, nodes)
+    if timeout is not None:
+      timeout = max(timeout - (time.time() - start), 0)
+
+    fitted_list = []
+    error_list = []
+    for (station, field), fit, error in knowledge_extraction_executor.run(column_dict, timeout):
+      fitted_list.append((station, field))
+      if error is not None:
+        app.logger.error(error)
+        error_list.append(error)
+        continue
+      if fit is None:
+        continue
+      fit = dict(fit)
+      dist = fit.pop('distributionType')
+      fit = {dist: fit, "distribution": dist}
+      if field == 'processingTime':
+        nodes[station]['processingTime'] = fit
+      else:
+        nodes[station].setdefault('interruptions', {}).setdefault('failure', {})[field] = fit
+      reportProgress(station=station, field=field, distribution=dist,
+                     fitted=len(fitted_list), total=len(column_dict))
+    if error_list:
+      return dict(error=error_list[0])
+    result = dict(success=True, data=parameter_dict)
+    if len(fitted_list) < len(column_dict):
+      # the columns that were not fitted before the timeout keep their distributions
+      result['partial'] = True
+      result['unfitted'] = sorted('%s/%s' % column_id
+        for column_id in set(column_dict).difference(fitted_list))
+    return result
   except Exception, e:
     tb = traceback.format_exc()
     app.logger.error(tb)
@@ -214,18 +373,66 @@ def main(*args):
   parser.add_argument('--host', default="127.0.0.1", help='Host address')
   parser.add_argument('--logfile', help='Log to file')
   parser.add_argument('--debug', help='Debug mode', action='store_true')
+  parser.add_argument('--cachedir',
+                      default=os.path.join(tempfile.gettempdir(), 'dream-result-cache'),
+                      help='Directory of the simulation result cache')
+  parser.add_argument('--cachesize', default=100, type=int,
+                      help='Size of the simulation result cache in MB, 0 disables it')
+  parser.add_argument('--workers', default=multiprocessing.cpu_count(), type=int,
+                      help='Number of worker processes, 0 starts a process per request')
+  parser.add_argument('--workermaxjobs', default=100, type=int,
+                      help='Number of jobs after which a worker process is replaced')
+  parser.add_argument('--maxqueue', default=20, type=int,
+                      help='Number of requests that can wait for a worker')
+  parser.add_argument('--maxjobs', default=multiprocessing.cpu_count(), type=int,
+                      help='Number of asynchronous jobs that run at the same time, the next ones wait')
+  parser.add_argument('--keprocesses', default=multiprocessing.cpu_count(), type=int,
+                      help='Number of processes fitting the distributions of a knowledge extraction')
+  parser.add_argument('--keruns', default=2, type=int,
+                      help='Number of knowledge extractions that can run at the same time')
   arguments = parser.parse_args()
   if arguments.logfile:
     file_handler = logging.FileHandler(arguments.logfile)
     file_handler.setLevel(logging.DEBUG)
     app.logger.addHandler(file_handler)
 
+  if arguments.cachesize:
+    global result_cache
+    result_cache = ResultCache(arguments.cachedir,
+                               max_size=arguments.cachesize * 1024 * 1024)
+
+  global knowledge_extraction_executor
+  fit_cache = None
+  if arguments.cachesize:
+    # the fits of the knowledge extraction are kept in their own directory
+    fit_cache = ResultCache(os.path.join(arguments.cachedir, 'fits'),
+                            max_size=arguments.cachesize * 1024 * 1024)
+  knowledge_extraction_executor = KnowledgeExtractionExecutor(
+    processes=arguments.keprocesses, fit_cache=fit_cache)
+  global knowledge_extraction_slots
+  knowledge_extraction_slots = threading.BoundedSemaphore(max(arguments.keruns, 1))
+
+  global job_manager
+  job_manager = JobManager(max_running=arguments.maxjobs)
+
+  if arguments.workers:
+    # the workers are forked with the plugins already imported
+    preloadPlugins()
+    global worker_pool
+    worker_pool = WorkerPool(arguments.workers,
+                             max_jobs=arguments.workermaxjobs,
+                             max_queue=arguments.maxqueue)
+
   if arguments.debug:
     # Serve static file with no cache
     app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
 
   # start the server
-  app.run(debug=arguments.debug, host=arguments.host, port=arguments.port, threaded=True)
+  try:
+    app.run(debug=arguments.debug, host=arguments.host, port=arguments.port, threaded=True)
+  finally:
+    if worker_pool is not None:
+      worker_pool.close()
 
 if __name__ == "__main__":
   main()
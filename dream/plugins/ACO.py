@@ -7,16 +7,73 @@ import random
 import operator
 import xmlrpclib
 import signal
+import hashlib
+from collections import OrderedDict
 from multiprocessing import Pool
 
 from dream.simulation.Queue import Queue
 from dream.simulation.Operator import Operator
-from dream.simulation.Globals import getClassFromName
+from dream.simulation.Globals import getClassFromName, reportProgress
 
 # run an ant in a subrocess. Can be parrallelized.
+# Only the result is sent back, encoded in binary form
 def runAntInSubProcess(ant):
-  ant['result'] = plugin.ExecutionPlugin.runOneScenario(ant['input'])['result']
-  return ant
+  return plugin.ExecutionPlugin.encodeResult(
+    plugin.ExecutionPlugin.runOneScenario(ant['input'])['result'])
+
+# returns the result of the ant in canonical json, without its execution
+# time, so that ants that output the same schedules can be detected
+def getAntResultKey(ant):
+  ant_result, = ant['result']['result_list']
+  ant_result['general'].pop('totalExecutionTime', None)
+  return json.dumps(ant_result, sort_keys=True)
+
+class AntMemo(object):
+  """Keeps the results of the simulated ants, by the hash of the model and
+  the genotype of the ant (the options it picked), so that an ant picked again
+  in a later request on the same model is not simulated again.
+  The least recently used results are dropped above max_size ants.
+  """
+  def __init__(self, max_size=0):
+    self.max_size = max_size
+    self.result_dict = OrderedDict()
+    self.hits = 0
+    self.misses = 0
+
+  @staticmethod
+  def getModelHash(data):
+    """returns a hash of the model, without its results.
+    """
+    data = dict(data, result=None)
+    return hashlib.sha1(json.dumps(data, sort_keys=True)).hexdigest()
+
+  @staticmethod
+  def getGenotype(ant):
+    """returns the options picked by the ant in a normalized form.
+    """
+    return repr(sorted(ant.items()))
+
+  def get(self, model_hash, genotype):
+    """returns the result of the ant or None if it is not known.
+    """
+    encoded_result = self.result_dict.pop((model_hash, genotype), None)
+    if encoded_result is None:
+      self.misses += 1
+      return None
+    self.hits += 1
+    self.result_dict[model_hash, genotype] = encoded_result
+    return plugin.ExecutionPlugin.decodeResult(encoded_result)
+
+  def put(self, model_hash, genotype, result):
+    if not self.max_size:
+      return
+    self.result_dict.pop((model_hash, genotype), None)
+    self.result_dict[model_hash, genotype] = plugin.ExecutionPlugin.encodeResult(result)
+    while len(self.result_dict) > self.max_size:
+      self.result_dict.popitem(last=False)
+
+# the results kept across the requests run by this process
+ant_memo = AntMemo()
 
 class ACO(plugin.ExecutionPlugin):
   def _calculateAntScore(self, ant):
@@ -48,7 +105,17 @@ class ACO(plugin.ExecutionPlugin):
 
     multiprocessorCount = data['general'].get('multiprocessorCount')
 
-    tested_ants = set()
+    # the results of the ants are kept across requests only if the model
+    # always gives the same result, i.e. it is run with a fixed seed
+    model_hash = None
+    ant_memo.max_size = int(data['general'].get('antMemoSize') or 0)
+    if ant_memo.max_size and data['general'].get('seed') not in (None, '', ' '):
+        model_hash = AntMemo.getModelHash(data)
+    pickedAnts = 0      # number of ants picked by the generations
+    knownAnts = 0       # number of picked ants whose result was reused from an ant of this run
+    memoizedAnts = 0    # number of ants whose result was reused from a previous request
+
+    tested_ants = dict()    # the first tested ant of every genotype
     start = time.time()         # start counting execution time
 
     collated=self.createCollatedScenarios(data)    
@@ -61,6 +128,7 @@ class ACO(plugin.ExecutionPlugin):
                 and numberOfAntsForNextGeneration<=int(data["general"]["numberOfAntsPerGenerations"])
 
     ants = [] #list of ants for keeping track of their performance
+    best_ant = None
 
     # Number of times new ants are to be created, i.e. number of generations (a
     # generation can have more than 1 ant)
@@ -68,6 +136,7 @@ class ACO(plugin.ExecutionPlugin):
     for i in range(int(data["general"]["numberOfGenerations"])):
         antsInCurrentGeneration=[]
         scenario_list = [] # for the distributor
+        known_ant_list = [] # the ants of the generation already tested, with the ant tested first
         # number of ants created per generation
         for j in range(int(data["general"]["numberOfAntsPerGenerations"])):
             # an ant dictionary to contain rule to queue assignment information
@@ -83,15 +152,31 @@ class ACO(plugin.ExecutionPlugin):
                 seedPlus +=1
             # TODO: function to calculate ant id. Store ant id in ant dict
             ant_key = repr(ant)
+            genotype = AntMemo.getGenotype(ant)
+            pickedAnts += 1
+            ant['key'] = ant_key
+            ant['genotype'] = genotype
             # if the ant was not already tested, only then test it
-            if ant_key not in tested_ants:
-                tested_ants.add(ant_key)
+            if genotype not in tested_ants:
+                tested_ants[genotype] = ant
                 ant_data=deepcopy(self.createAntData(data, ant))
-                ant['key'] = ant_key
                 ant['input'] = ant_data
-                scenario_list.append(ant)
-                       
-        if distributor is None:
+                if model_hash is not None:
+                    result = ant_memo.get(model_hash, genotype)
+                    if result is not None:
+                        ant['result'] = result
+                        memoizedAnts += 1
+            else:
+                # the ant is part of the generation with the result of the ant tested first
+                known_ant_list.append((ant, tested_ants[genotype]))
+                knownAnts += 1
+            scenario_list.append(ant)
+
+        # the ants whose result is not known
+        ants_to_run = [ant for ant in scenario_list if 'input' in ant and 'result' not in ant]
+        if not ants_to_run:
+            self.logger.info("the results of all the ants of generation %s are known" % i)
+        elif distributor is None:
             if multiprocessorCount:
                 self.logger.info("running multiprocessing ACO with %s processes" % multiprocessorCount)
                 # We unset our signal handler to print traceback at the end
@@ -100,21 +185,23 @@ class ACO(plugin.ExecutionPlugin):
                 pool = Pool(processes=multiprocessorCount)
                 try:
                     signal.signal(signal.SIGTERM, signal.SIG_DFL)
-                    scenario_list = pool.map(runAntInSubProcess, scenario_list)
+                    result_list = pool.map(runAntInSubProcess, ants_to_run)
+                    for ant, result in zip(ants_to_run, result_list):
+                        ant['result'] = self.decodeResult(result)
                     pool.close()
                     pool.join()
                 finally:
                     signal.signal(signal.SIGTERM, sigterm_handler)
             else:
                 # synchronous
-                for ant in scenario_list:
+                for ant in ants_to_run:
                     ant['result'] = self.runOneScenario(ant['input'])['result']
         
         else: # asynchronous
-            self.logger.info("Registering a job for %s scenarios" % len(scenario_list))
+            self.logger.info("Registering a job for %s scenarios" % len(ants_to_run))
             start_register = time.time()
             job_id = distributor.requestSimulationRun(
-                [json.dumps(x).encode('zlib').encode('base64') for x in scenario_list])
+                [json.dumps(x).encode('zlib').encode('base64') for x in ants_to_run])
             self.logger.info("Job registered as %s (took %0.2fs)" % (job_id, time.time() - start_register ))
 
             while True:
@@ -126,7 +213,7 @@ class ACO(plugin.ExecutionPlugin):
                     self.logger.info("Job %s terminated" % job_id)
                     break
 
-            for ant, result in zip(scenario_list, result_list):
+            for ant, result in zip(ants_to_run, result_list):
                 result = json.loads(result)
                 if 'result' in result: # XXX is this still needed ???
                   result = result['result']
@@ -135,20 +222,38 @@ class ACO(plugin.ExecutionPlugin):
                   result = {'result_list': [result]}
                 ant['result'] = result
 
+        if model_hash is not None:
+            for ant in ants_to_run:
+                ant_memo.put(model_hash, ant['genotype'], ant['result'])
+        for ant, tested_ant in known_ant_list:
+            ant['result'] = tested_ant['result']
+
         for ant in scenario_list:
             ant['score'] = self._calculateAntScore(ant)
+            ant['result_key'] = getAntResultKey(ant)
 
         ants.extend(scenario_list)
         antsInCurrentGeneration.extend(scenario_list)
 
+        # report the progress, along with the best solution if it improved
+        progress = dict(generation=i,
+                        numberOfGenerations=int(data["general"]["numberOfGenerations"]))
+        if scenario_list:
+            generation_best_ant = min(scenario_list, key=operator.itemgetter('score'))
+            if best_ant is None or generation_best_ant['score'] < best_ant['score']:
+                best_ant = generation_best_ant
+                result = dict(best_ant['result']['result_list'][0],
+                              score=best_ant['score'], key=best_ant['key'])
+                progress['result'] = result
+        if best_ant is not None:
+            progress['best_score'] = best_ant['score']
+        reportProgress(**progress)
+
         # in this generation remove ants that outputs the same schedules
         # XXX we in fact remove ants that produce the same output json
         uniqueAntsInThisGeneration = dict()
         for ant in antsInCurrentGeneration:
-            ant_result, = copy(ant['result']['result_list'])
-            ant_result['general'].pop('totalExecutionTime', None)
-            ant_result = json.dumps(ant_result, sort_keys=True)
-            uniqueAntsInThisGeneration[ant_result] = ant
+            uniqueAntsInThisGeneration[ant['result_key']] = ant
          
         # The ants in this generation are ranked based on their scores and the
         # best (numberOfAntsForNextGeneration) are selected to carry their pheromones to next generation
@@ -169,10 +274,7 @@ class ACO(plugin.ExecutionPlugin):
     # XXX we in fact remove ants that produce the same output json
     uniqueAnts = dict()
     for ant in ants:
-        ant_result, = copy(ant['result']['result_list'])
-        ant_result['general'].pop('totalExecutionTime', None)
-        ant_result = json.dumps(ant_result, sort_keys=True)
-        uniqueAnts[ant_result] = ant
+        uniqueAnts[ant['result_key']] = ant
 
     # The ants in this generation are ranked based on their scores and the
     # best (max_results) are selected
@@ -186,5 +288,10 @@ class ACO(plugin.ExecutionPlugin):
       result['key'] = ant['key']
       result_list.append(result)
 
+    if pickedAnts:
+        self.logger.info("ACO picked %s ants, %s results were reused from the ants of this run and "
+                         "%s from previous runs (hit rate %0.1f%%)"
+                         % (pickedAnts, knownAnts, memoizedAnts,
+                            100. * (knownAnts + memoizedAnts) / pickedAnts))
     self.logger.info("ACO finished, execution time %0.2fs" % (time.time() - start))
     return data
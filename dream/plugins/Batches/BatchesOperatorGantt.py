@@ -9,6 +9,7 @@ from copy import copy
 
 class BatchesOperatorGantt(plugin.OutputPreparationPlugin, TimeSupportMixin):
 
+  mutated_key_list = ('general', 'result')
   def postprocess(self, data):
     """Post process the data for Gantt gadget
     """
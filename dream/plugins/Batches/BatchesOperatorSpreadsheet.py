@@ -5,6 +5,7 @@ import StringIO
 class BatchesOperatorSpreadsheet(plugin.OutputPreparationPlugin):
   """ Output the schedule of operators in an Excel file to be downloaded
   """
+  mutated_key_list = ('result',)
 
   def postprocess(self, data):
     rowIndex=0
@@ -4,6 +4,7 @@ from copy import copy
 class BatchesOperatorUtilization(plugin.OutputPreparationPlugin):
   """ Output the station utilization metrics in a format compatible with 
   """
+  mutated_key_list = ('result',)
 
   def postprocess(self, data):
     result = data['result']['result_list'][-1]
@@ -35,9 +35,8 @@ class BatchesStochasticACO(BatchesACO):
                 }
     return data
 
-  def calculateStochasticAntScore(self, ant):
-    """Calculate the score of this ant.
-    """
+  # returns the units throughput of every replication of the ant
+  def getUnitsThroughputList(self, ant):
     result, = ant['result']['result_list']  #read the result as JSON
     #loop through the elements 
     for element in result['elementList']:
@@ -55,16 +54,90 @@ class BatchesStochasticACO(BatchesACO):
                         finalWIPList=record['results'].get('final_WIP',[0])
                         for i in range(len(finalWIPList)):
                             unitsThroughput[i]+=finalWIPList[i]     
-            self.outputSheet.write(self.rowIndex,2,'Units Throughput Per Replication')
-            col=3
-            for element in unitsThroughput:
-                self.outputSheet.write(self.rowIndex,col,element)          
-                col+=1
-            self.rowIndex+=1
-            averageUnitsThroughput=sum(unitsThroughput)/float(len(unitsThroughput))
+    return unitsThroughput
+
+  def calculateStochasticAntScore(self, ant):
+    """Calculate the score of this ant.
+    """
+    unitsThroughput=self.getUnitsThroughputList(ant)
+    self.outputSheet.write(self.rowIndex,2,'Units Throughput Per Replication')
+    col=3
+    for element in unitsThroughput:
+        self.outputSheet.write(self.rowIndex,col,element)          
+        col+=1
+    self.rowIndex+=1
+    averageUnitsThroughput=sum(unitsThroughput)/float(len(unitsThroughput))
     # return the negative value since they are ranked this way. XXX discuss this
     return -averageUnitsThroughput
 
+  # runs the given number of replications of the stochastic ant, following the ones
+  # it already ran, and adds their units throughput to its unitsThroughputList
+  def runMoreReplications(self, ant, numberOfReplications):
+    antData=copy(ant['input'])
+    antData['general']=dict(antData['general'], numberOfReplications=numberOfReplications,
+                            firstReplication=len(ant['unitsThroughputList']))
+    ant['result'] = self.runOneScenario(antData)['result']
+    ant['unitsThroughputList'].extend(self.getUnitsThroughputList(ant))
+    ant['numberOfRuns']+=1
+
+  def raceAnts(self, antList, numberOfReplications, confidenceLevel, replicationBudget):
+    """Evaluate the ants stochastically by racing. Every ant runs a first couple
+    of replications, then the ants that are still racing run one more replication
+    at a time, up to numberOfReplications. After every round the ants whose
+    confidence interval of units throughput is below the one of the best ant
+    are dropped. The race ends when one ant is left, all ran numberOfReplications
+    or replicationBudget replications were run.
+    """
+    initialReplications=min(2, numberOfReplications)
+    replicationBudget=max(replicationBudget, initialReplications*len(antList))
+    usedReplications=0
+    for ant in antList:
+        ant['unitsThroughputList']=[]
+        ant['numberOfRuns']=0
+        ant['evaluationType']='stochastic'
+    # the first round
+    for ant in antList:
+        self.runMoreReplications(ant, initialReplications)
+        usedReplications+=initialReplications
+    # a confidence interval needs at least two replications
+    racingAnts=list(antList)
+    if initialReplications<2:
+        racingAnts=[]
+    while len(racingAnts)>1:
+        # drop the ants that are dominated by the best one
+        intervalList=self.getConfidenceIntervalList([ant['unitsThroughputList'] for ant in racingAnts],
+                                                    confidenceLevel)
+        intervalDict=dict(zip([ant['key'] for ant in racingAnts], intervalList))
+        bestLowerBound=max(interval['lb'] for interval in intervalDict.values())
+        for ant in racingAnts:
+            if intervalDict[ant['key']]['ub']<bestLowerBound:
+                self.outputSheet.write(self.rowIndex,1,'dropped from racing after '+str(len(ant['unitsThroughputList']))+' replications')
+                self.outputSheet.write(self.rowIndex,2,ant['key'])
+                self.rowIndex+=1
+        racingAnts=[ant for ant in racingAnts if intervalDict[ant['key']]['ub']>=bestLowerBound]
+        # the ants still racing run one more replication
+        antsToRun=[ant for ant in racingAnts 
+                   if len(ant['unitsThroughputList'])<numberOfReplications]
+        if len(racingAnts)<2 or not antsToRun \
+                or usedReplications+len(antsToRun)>replicationBudget:
+            break
+        for ant in antsToRun:
+            self.runMoreReplications(ant, 1)
+        usedReplications+=len(antsToRun)
+
+    for ant in antList:
+        unitsThroughputList=ant['unitsThroughputList']
+        ant['score']=-sum(unitsThroughputList)/float(len(unitsThroughputList))
+        self.outputSheet.write(self.rowIndex,1,'raced for '+str(len(unitsThroughputList))+' replications')
+        self.outputSheet.write(self.rowIndex,2,ant['key'])
+        self.rowIndex+=1
+        self.outputSheet.write(self.rowIndex,2,'Average Units Throughput')
+        self.outputSheet.write(self.rowIndex,3,-ant['score'])
+        self.rowIndex+=1
+    self.logger.info("raced %s ants with %s replications instead of %s"
+                     % (len(antList), usedReplications, len(antList)*numberOfReplications))
+    return usedReplications
+
   def run(self, data):
     """Preprocess the data.
     """
@@ -101,6 +174,12 @@ class BatchesStochasticACO(BatchesACO):
     numberOfAntsForStochasticEvaluationInTheEnd=int(data['general'].get('numberOfAntsForStochasticEvaluationInTheEnd',2))
     # number of replications for stochastic ants in the end
     numberOfReplicationsInTheEnd=data['general'].get('numberOfReplicationsInTheEnd',6)
+    # with racing the ants evaluated stochastically run more replications only 
+    # as long as they are not dominated by others
+    racing=data['general'].get('stochasticEvaluation','fixed')=='racing'
+    # the maximum number of replications of a race, by default the one of the fixed evaluation
+    replicationBudget=int(data['general'].get('stochasticReplicationBudget') or 0)
+    confidenceLevel=float(data['general'].get('confidenceLevel',0.95))
     
     self.outputSheet.write(self.rowIndex,0,'ACO attributes')    
     self.rowIndex+=1
@@ -214,18 +293,25 @@ class BatchesStochasticACO(BatchesACO):
               key=operator.itemgetter('score'))[:numberOfAntsForStochasticEvaluationInGeneration]
 
              
-        for ant in antsForStochasticEvaluationInGeneration:
-            ant['input']=self.createStochasticData(ant['input'])
-            ant['input']['general']['numberOfReplications']=numberOfReplicationsInGeneration
-            self.outputSheet.write(self.rowIndex,1,'running stochastic for '+str(numberOfReplicationsInGeneration)+' replications')
-            self.outputSheet.write(self.rowIndex,2,ant['key'])
-            self.rowIndex+=1
-            ant['result'] = self.runOneScenario(ant['input'])['result']
-            ant['evaluationType']='stochastic'
-            ant['score'] = self.calculateStochasticAntScore(ant)
-            self.outputSheet.write(self.rowIndex,2,'Average Units Throughput')
-            self.outputSheet.write(self.rowIndex,3,-ant['score'])
-            self.rowIndex+=1
+        if racing:
+            for ant in antsForStochasticEvaluationInGeneration:
+                ant['input']=self.createStochasticData(ant['input'])
+            self.raceAnts(antsForStochasticEvaluationInGeneration, int(numberOfReplicationsInGeneration),
+                confidenceLevel, replicationBudget or
+                    len(antsForStochasticEvaluationInGeneration)*int(numberOfReplicationsInGeneration))
+        else:
+            for ant in antsForStochasticEvaluationInGeneration:
+                ant['input']=self.createStochasticData(ant['input'])
+                ant['input']['general']['numberOfReplications']=numberOfReplicationsInGeneration
+                self.outputSheet.write(self.rowIndex,1,'running stochastic for '+str(numberOfReplicationsInGeneration)+' replications')
+                self.outputSheet.write(self.rowIndex,2,ant['key'])
+                self.rowIndex+=1
+                ant['result'] = self.runOneScenario(ant['input'])['result']
+                ant['evaluationType']='stochastic'
+                ant['score'] = self.calculateStochasticAntScore(ant)
+                self.outputSheet.write(self.rowIndex,2,'Average Units Throughput')
+                self.outputSheet.write(self.rowIndex,3,-ant['score'])
+                self.rowIndex+=1
         
         # if we had stochastic evaluation of ants at the end of the generation
         if numberOfAntsForStochasticEvaluationInGeneration:
@@ -272,7 +358,21 @@ class BatchesStochasticACO(BatchesACO):
         
     # The ants are ranked based on their scores and the
     # best (max_results) are selected to be returned
-    if numberOfAntsForStochasticEvaluationInTheEnd > 0:
+    if numberOfAntsForStochasticEvaluationInTheEnd > 0 and racing:
+        ants = sorted(uniqueAnts.values(),
+          key=operator.itemgetter('score'))[:numberOfAntsForStochasticEvaluationInTheEnd]
+        for ant in ants:
+            ant['input']=self.createStochasticData(ant['input'])
+        self.raceAnts(ants, int(numberOfReplicationsInTheEnd), confidenceLevel,
+                      replicationBudget or len(ants)*int(numberOfReplicationsInTheEnd))
+        # the ants to be returned are run again for all their replications, 
+        # so that their result is the one of all the replications they were scored with
+        ants = sorted(ants, key=operator.itemgetter('score'))[:max_results]
+        for ant in ants:
+            if ant['numberOfRuns']>1:
+                ant['input']['general']['numberOfReplications']=len(ant['unitsThroughputList'])
+                ant['result'] = self.runOneScenario(ant['input'])['result']
+    elif numberOfAntsForStochasticEvaluationInTheEnd > 0:
         ants = sorted(uniqueAnts.values(),
           key=operator.itemgetter('score'))[:numberOfAntsForStochasticEvaluationInTheEnd]
         for ant in ants:
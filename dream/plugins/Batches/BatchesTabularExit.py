@@ -12,6 +12,7 @@ from dream.plugins import plugin
 class BatchesTabularExit(plugin.OutputPreparationPlugin):
     """ Output the exit stats in a tab
     """
+    mutated_key_list = ('result',)
 
     def postprocess(self, data):
         numberOfReplications=int(data['general']['numberOfReplications'])
@@ -66,7 +67,18 @@ class BatchesTabularExit(plugin.OutputPreparationPlugin):
                 # when found, add a row with the results of the specific exit
                 if family=='Exit':
                     batchesThroughputList=record['results']['throughput']
-                    batchesThroughputCI=self.getConfidenceInterval(batchesThroughputList,confidenceLevel)
+                    unitsThroughputList=record['results'].get('unitsThroughput',None)
+                    if not unitsThroughputList:
+                        unitsThroughputList=batchesThroughputList
+                    unitsThroughputList=record['results']['unitsThroughput']
+                    lineThroughputList=[x/float(maxSimTime) for x in batchesThroughputList]
+                    unitDepartureRateList=[x/float(maxSimTime) for x in unitsThroughputList]
+                    avgCycleTimeList=record['results']['lifespan']
+                    # calculate the confidence intervals of all the KPIs at once
+                    batchesThroughputCI, unitsThroughputCI, lineThroughputCI, unitDepartureRateCI, avgCycleTimeCI=\
+                        self.getConfidenceIntervalList([batchesThroughputList, unitsThroughputList,
+                                                        lineThroughputList, unitDepartureRateList,
+                                                        avgCycleTimeList], confidenceLevel)
                     data['result']['result_list'][0]['exit_output'].append(['Number of batches produced','Batches',
                                                                             "%.2f" % self.getAverage(batchesThroughputList),
                                                                             "%.2f" % self.getStDev(batchesThroughputList),
@@ -75,11 +87,6 @@ class BatchesTabularExit(plugin.OutputPreparationPlugin):
                                                                             "%.2f" % batchesThroughputCI['lb'],
                                                                             "%.2f" % batchesThroughputCI['ub']]
                                                                            )    
-                    unitsThroughputList=record['results'].get('unitsThroughput',None)
-                    if not unitsThroughputList:
-                        unitsThroughputList=batchesThroughputList
-                    unitsThroughputList=record['results']['unitsThroughput']
-                    unitsThroughputCI=self.getConfidenceInterval(unitsThroughputList,confidenceLevel)
                     data['result']['result_list'][0]['exit_output'].append(['Number of units produced','Units',
                                                                             "%.2f" % self.getAverage(unitsThroughputList),
                                                                             "%.2f" % self.getStDev(unitsThroughputList),
@@ -88,8 +95,6 @@ class BatchesTabularExit(plugin.OutputPreparationPlugin):
                                                                             "%.2f" % unitsThroughputCI['lb'],
                                                                             "%.2f" % unitsThroughputCI['ub']]
                                                                            )    
-                    lineThroughputList=[x/float(maxSimTime) for x in batchesThroughputList]
-                    lineThroughputCI=self.getConfidenceInterval(lineThroughputList,confidenceLevel)
                     data['result']['result_list'][0]['exit_output'].append(['Line throughput','Batches/'+timeUnit,
                                                                             "%.2f" % self.getAverage(lineThroughputList),
                                                                             "%.2f" % self.getStDev(lineThroughputList),
@@ -98,8 +103,6 @@ class BatchesTabularExit(plugin.OutputPreparationPlugin):
                                                                             "%.2f" % lineThroughputCI['lb'],
                                                                             "%.2f" % lineThroughputCI['ub']]
                                                                            ) 
-                    unitDepartureRateList=[x/float(maxSimTime) for x in unitsThroughputList]
-                    unitDepartureRateCI=self.getConfidenceInterval(unitDepartureRateList,confidenceLevel)
                     data['result']['result_list'][0]['exit_output'].append(['Unit Departure Rate',
                                                                             'Units/'+timeUnit,
                                                                             "%.2f" % self.getAverage(unitDepartureRateList),
@@ -110,8 +113,6 @@ class BatchesTabularExit(plugin.OutputPreparationPlugin):
                                                                             "%.2f" % unitDepartureRateCI['ub']]
                                                                            )      
                     avgCycleTime=record['results']['lifespan']         
-                    avgCycleTimeList=record['results']['lifespan']
-                    avgCycleTimeCI=self.getConfidenceInterval(avgCycleTimeList,confidenceLevel)
                     data['result']['result_list'][0]['exit_output'].append(['Cycle Time',timeUnit,
                                                                             "%.2f" % self.getAverage(avgCycleTimeList),
                                                                             "%.2f" % self.getStDev(avgCycleTimeList),
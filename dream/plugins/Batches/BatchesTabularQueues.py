@@ -12,6 +12,7 @@ from dream.plugins import plugin
 class BatchesTabularQueues(plugin.OutputPreparationPlugin):
     """ Output the exit stats in a tab
     """
+    mutated_key_list = ('result',)
 
     def postprocess(self, data):
         numberOfReplications=int(data['general']['numberOfReplications'])
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 class StationAllocations(plugin.OutputPreparationPlugin, TimeSupportMixin):
   """ Output the periodic operational capacity utilisation per project in a bar chart
   """
+  mutated_key_list = ('result',)
 
   def postprocess(self, data):
 
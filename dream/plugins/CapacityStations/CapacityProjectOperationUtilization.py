@@ -6,6 +6,7 @@ from copy import deepcopy
 class PeriodUtilizations(plugin.OutputPreparationPlugin, TimeSupportMixin):
   """ Output a line plot of operational capacity utilisations.
   """
+  mutated_key_list = ('result',)
 
   def postprocess(self, data):
 
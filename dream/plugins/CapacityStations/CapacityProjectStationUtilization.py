@@ -4,6 +4,7 @@ from copy import copy
 class CapacityProjectStationUtilization(plugin.OutputPreparationPlugin):
   """ Output the station utilization metrics in a format compatible with 
   """
+  mutated_key_list = ('result',)
 
   def postprocess(self, data):
     for result in data['result']['result_list']:
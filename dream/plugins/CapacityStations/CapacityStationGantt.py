@@ -7,6 +7,7 @@ from dream.plugins.TimeSupport import TimeSupportMixin
 
 class CapacityStationGantt(plugin.OutputPreparationPlugin, TimeSupportMixin):
 
+  mutated_key_list = ('general', 'result')
   def postprocess(self, data):
     """Post process the data for Gantt gadget
     """
@@ -11,6 +11,7 @@ from dream.plugins import plugin
 class DefaultTabularExit(plugin.OutputPreparationPlugin):
     """ Output the exit stats in a tab
     """
+    mutated_key_list = ('result',)
 
     def postprocess(self, data):
         numberOfReplications=int(data['general']['numberOfReplications'])
@@ -37,9 +38,10 @@ class DefaultTabularExit(plugin.OutputPreparationPlugin):
                 # when found, add a row with the results of the specific exit
                 if family=='Exit':
                     exitId=record['id']
-                    throughput=self.getConfidenceInterval(record['results'].get('throughput','undefined'),confidenceLevel)
-                    taktTime=self.getConfidenceInterval(record['results'].get('takt_time','undefined'),confidenceLevel)
-                    lifespan=self.getConfidenceInterval(record['results'].get('lifespan','undefined'),confidenceLevel)                 
+                    throughput, taktTime, lifespan=self.getConfidenceIntervalList(
+                                        [record['results'].get('throughput','undefined'),
+                                         record['results'].get('takt_time','undefined'),
+                                         record['results'].get('lifespan','undefined')],confidenceLevel)
                     data['result']['result_list'][0]['exit_output'].append([exitId,
                                                                             round(float(throughput['lb']),2),
                                                                             round(float(throughput['avg']),2),
@@ -4,6 +4,7 @@ class PostProcessDemandPlanning(plugin.OutputPreparationPlugin):
   """ Output the result of demand planning in a format compatible with
   Output_viewDownloadFile
   """
+  mutated_key_list = ('result',)
 
   def postprocess(self, data):
     # XXX the event generator should store its result in data and not in global
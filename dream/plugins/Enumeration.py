@@ -7,12 +7,23 @@ import random
 import operator
 import xmlrpclib
 import signal
+import hashlib
+from itertools import izip
 from multiprocessing import Pool
 
-# # run an ant in a subrocess. Can be parrallelized.
-# def runAntInSubProcess(ant):
-#   ant['result'] = plugin.ExecutionPlugin.runOneScenario(ant['input'])['result']
-#   return ant
+from dream.simulation.Globals import reportProgress
+
+# run a scenario in a subrocess. Can be parrallelized.
+# Only the result is sent back, encoded in binary form
+def runScenarioInSubProcess(scenario):
+  return plugin.ExecutionPlugin.encodeResult(
+    plugin.ExecutionPlugin.runOneScenario(scenario['input'])['result'])
+
+# returns a hash of the result of the scenario, so that scenarios that
+# output the same schedules can be detected without comparing whole results
+def getScenarioResultHash(scenario):
+  elementList = scenario['result']['result_list'][0]['elementList']
+  return hashlib.sha1(json.dumps(elementList, sort_keys=True)).hexdigest()
 
 # Execution plugin that implements enumeration of different solutions
 # this is an abstract class only its run() is to be used. Sub-classes should implement other methods 
@@ -35,41 +46,101 @@ class Enumeration(plugin.ExecutionPlugin):
     def checkIfShouldTerminate(self,data,scenarioList): 
         return False
 
+    # runs the scenarios and yields them, in the order of the list, as their result
+    # is available. Scenarios run in parallel if a distributor or a multiprocessorCount
+    # is given. Closing the generator stops the scenarios that are still running
+    def runScenarioList(self, data, scenarioList):
+      distributor_url = data['general'].get('distributorURL')
+      multiprocessorCount = int(data['general'].get('multiprocessorCount') or 1)
+
+      if distributor_url: # asynchronous
+          for scenario in scenarioList:
+              scenario['input']=self.createScenarioData(data, scenario)
+          distributor = xmlrpclib.Server(distributor_url)
+          self.logger.info("Registering a job for %s scenarios" % len(scenarioList))
+          job_id = distributor.requestSimulationRun(
+              [json.dumps(x).encode('zlib').encode('base64') for x in scenarioList])
+          self.logger.info("Job registered as %s" % job_id)
+          while True:
+              time.sleep(1.)
+              result_list = distributor.getJobResult(job_id)
+              # The distributor returns None when calculation is still ongoing,
+              # or the list of result in the same order.
+              if result_list is not None:
+                  self.logger.info("Job %s terminated" % job_id)
+                  break
+          for scenario, result in zip(scenarioList, result_list):
+              result = json.loads(result)
+              if 'result' in result:
+                  result = result['result']
+              else:
+                  result = {'result_list': [result]}
+              scenario['result'] = result
+              yield scenario
+
+      elif multiprocessorCount > 1 and len(scenarioList) > 1:
+          self.logger.info("running multiprocessing Enumeration with %s processes" % multiprocessorCount)
+          for scenario in scenarioList:
+              scenario['input']=self.createScenarioData(data, scenario)
+          # We unset our signal handler to print traceback at the end
+          # otherwise logs are confusing.
+          sigterm_handler = signal.getsignal(signal.SIGTERM)
+          pool = Pool(processes=min(multiprocessorCount, len(scenarioList)))
+          try:
+              signal.signal(signal.SIGTERM, signal.SIG_DFL)
+              # results come in the order of the scenarios while the next ones are running
+              for scenario, result in izip(scenarioList,
+                          pool.imap(runScenarioInSubProcess, scenarioList)):
+                  scenario['result'] = self.decodeResult(result)
+                  yield scenario
+          finally:
+              # the scenarios that are not needed any more are stopped
+              pool.terminate()
+              pool.join()
+              signal.signal(signal.SIGTERM, sigterm_handler)
+
+      else: # synchronous
+          for scenario in scenarioList:
+              scenario['input']=self.createScenarioData(data, scenario)
+              scenario['result'] = self.runOneScenario(scenario['input'])['result']
+              yield scenario
+
     def run(self, data):
-    #     distributor_url = data['general'].get('distributorURL',None)
-    #     distributor = None
-    #     if distributor_url:
-    #         distributor = xmlrpclib.Server(distributor_url)
-    #     multiprocessorCount = data['general'].get('multiprocessorCount',None)
-    
       start = time.time()         # start counting execution time
     
       numberOfSolutions = int(data['general'].get('numberOfSolutions',15))
       assert numberOfSolutions >= 1
       scenarioList=self.createScenarioList(data)
       
-      # run the scenario. Only synchronous for now
+      # score the scenarios as their results come in
       i=0
-      for scenario in scenarioList: 
-          scenario['input']=self.createScenarioData(data, scenario)
-          scenario['result'] = self.runOneScenario(scenario['input'])['result']
+      bestScenario=None
+      scenarioIterator=self.runScenarioList(data, scenarioList)
+      for scenario in scenarioIterator:
           scenario['score'] = self.calculateScenarioScore(scenario)
+          # report the progress, along with the best solution if it improved
+          progress=dict(scenario=i, numberOfScenarios=len(scenarioList))
+          if bestScenario is None or scenario['score'] < bestScenario['score']:
+              bestScenario=scenario
+              progress['result']=dict(scenario['result']['result_list'][0],
+                                      score=scenario['score'], key=scenario['key'])
+          progress['best_score']=bestScenario['score']
+          reportProgress(**progress)
           # it we should terminate remove the scenarios that are not scored yet
           if self.checkIfShouldTerminate(data, scenarioList):
               scenarioList = scenarioList[:i+1]
               break
           i+=1
-   
+      scenarioIterator.close()
         
       # remove ants that outputs the same schedules
       # XXX we in fact remove ants that produce the same output json      
       scenarioListWithoutDuplicates = []
-      resultList=[]
+      resultHashSet=set()
       for scenario in scenarioList:
-        scenarioResult = copy(scenario['result']['result_list'][0]['elementList'])
-        #scenarioResult['general'].pop('totalExecutionTime', None)
-        if scenarioResult not in resultList:
-            resultList.append(scenarioResult)
+        resultHash = getScenarioResultHash(scenario)
+        if resultHash not in resultHashSet:
+            resultHashSet.add(resultHash)
             scenarioListWithoutDuplicates.append(scenario)
      
       # rank the scenarios based on their score and take only the numberOfSolutions best
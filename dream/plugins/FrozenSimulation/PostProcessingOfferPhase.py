@@ -10,6 +10,7 @@ class PostProcessingOfferPhase(plugin.OutputPreparationPlugin):
   """ Output the result of offer phase in a format compatible with
   Output_viewDownloadFile
   """
+  mutated_key_list = ('result',)
 
   def postprocess(self, data):
     # XXX the event generator should store its result in data and not in global
@@ -8,6 +8,7 @@ from dream.plugins import plugin
 class projTabular(plugin.OutputPreparationPlugin):
     """ Output the projection completion date in a tab
     """
+    mutated_key_list = ('result',)
 
     def postprocess(self, data):
         data['result']['result_list'][0]['exit_output'] = [['Project', 'Earliest Completion Date', 'Conservative estimate Completion Date']]
@@ -5,6 +5,7 @@ from operator import itemgetter
 class schedTabularEarliest(plugin.OutputPreparationPlugin):
     """ Output the schedule in a tab
     """
+    mutated_key_list = ('result',)
 
     def postprocess(self, data):
       data['result']['result_list'][0]['schedule_output'] = [['Project', 'Part', 'Task ID', 'Station', 'Operator', 'Start Time', 'End Time']]
@@ -23,6 +24,7 @@ class schedTabularEarliest(plugin.OutputPreparationPlugin):
 class schedTabularLatest(plugin.OutputPreparationPlugin):
     """ Output the schedule in a tab
     """
+    mutated_key_list = ('result',)
 
     def postprocess(self, data):
       data['result']['result_list'][0]['schedule_output_latest'] = [['Project', 'Part', 'Task ID', 'Station', 'Operator', 'Start Time', 'End Time']]
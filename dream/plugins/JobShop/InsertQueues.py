@@ -14,6 +14,7 @@ class InsertQueues(plugin.InputPreparationPlugin):
   """ Input preparation
       reads the data from external data base and inserts buffers before the corresponding stations
   """
+  mutated_key_list = ('graph', 'input')
   
   def getNotMachineNodePredecessorList(self, stationIDs_list):
     """
@@ -7,6 +7,7 @@ class InsertWIP(plugin.InputPreparationPlugin):
   """ Input preparation
       reads the BOM - wip and inserts the work in progress to the corresponding stations
   """
+  mutated_key_list = ('graph', 'input')
 
   def preprocess(self, data):
     """ updates the Work in Process of each station according to the BOM
@@ -8,6 +8,7 @@ import datetime
 
 class JSComponentGantt(plugin.OutputPreparationPlugin, TimeSupportMixin):
   '''class that gets the results and prepares the data for the component gantt graph'''
+  mutated_key_list = ('general', 'result')
 
   # XXX hard-coded classes of different components to be displayed in the gantt
   COMPONENT_CLASS_SET = set(["Dream.OrderComponent", "Dream.OrderDesign", "Dream.Mould"])
@@ -9,6 +9,7 @@ from copy import copy
 
 class JSComponentTabSchedule(plugin.OutputPreparationPlugin, TimeSupportMixin):
   '''outputs the Job Schedules in tabular format'''
+  mutated_key_list = ('general', 'result')
   def findParentOrderById(self, ID):
     '''returns the parent order of the component with id == ID'''
     orders = self.data["input"]["BOM"].get("productionOrders", [])
@@ -14,6 +14,7 @@ class JSExitCancelCond(plugin.InputPreparationPlugin):
   """ Input preparation 
       Read the exits end update them to cancelCondition-empty exits
   """
+  mutated_key_list = ('graph',)
 
   def preprocess(self, data):
     """ Read the exits end update them to cancelCondition-empty exits. The simulation run should stop by the time all components have been cleared from the model 
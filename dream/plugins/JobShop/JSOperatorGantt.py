@@ -7,6 +7,7 @@ from dream.plugins.TimeSupport import TimeSupportMixin
 import datetime
 
 class JSOperatorGantt(plugin.OutputPreparationPlugin, TimeSupportMixin):
+  mutated_key_list = ('general', 'result')
   # XXX hard-coded value of the operator class available
   OPERATOR_CLASS_SET = set(["Dream.Operator"])
   def postprocess(self, data):
@@ -4,6 +4,7 @@ from copy import copy
 class JSOperatorUtilization(plugin.OutputPreparationPlugin):
   """ Output the station utilization metrics in a format compatible with 
   """
+  mutated_key_list = ('result',)
   # XXX hardcoded values
   JS_OPERATOR_CLASS_SET = set(["Dream.Operator"])
   def postprocess(self, data):
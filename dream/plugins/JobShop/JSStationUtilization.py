@@ -4,6 +4,7 @@ from copy import copy
 class JSStationUtilization(plugin.OutputPreparationPlugin):
   """ Output the station utilization metrics in a format compatible with 
   """
+  mutated_key_list = ('result',)
   # XXX hardcoded values
   JS_STATION_CLASS_SET = set(["Dream.MouldAssembly", "Dream.MachineJobShop"])
   def postprocess(self, data):
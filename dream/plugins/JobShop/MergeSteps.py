@@ -12,6 +12,7 @@ class MergeSteps(plugin.InputPreparationPlugin):
   """ Input preparation
       reads the data from external data base and merges the route steps that constitute on technology step
   """
+  mutated_key_list = ('input',)
 
   def preprocess(self, data):
     """ merge the steps that constitute one single technology step
@@ -12,6 +12,7 @@ class ReadJSCompleted(plugin.InputPreparationPlugin):
   """ Input preparation
       reads the work-plan from the corresponding spreadsheet
   """
+  mutated_key_list = ('input',)
     
 
   def preprocess(self, data):
@@ -14,6 +14,7 @@ class ReadJSMachineShifts(plugin.InputPreparationPlugin, TimeSupportMixin):
   """ Input preparation
       reads the shifts from a spreadsheet
   """
+  mutated_key_list = ('general', 'graph', 'input')
   
   def correctTimePair(self, start, end):
     '''takes a pair of times and returns the corrected pair according to the current time'''
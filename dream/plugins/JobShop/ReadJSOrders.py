@@ -13,6 +13,7 @@ class ReadJSOrders(plugin.InputPreparationPlugin, TimeSupportMixin):
   """ Input preparation
       reads the production orders from the corresponding spreadsheet
   """
+  mutated_key_list = ('general', 'input')
 
   def preprocess(self, data):
     """ inserts the retrieved production orders to the BOM echelon
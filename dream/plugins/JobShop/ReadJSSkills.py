@@ -30,6 +30,7 @@ class ReadJSSkills(plugin.InputPreparationPlugin):
   """ Input preparation 
       reads the operators and their skills from the spreadsheet and adds them to the model
   """
+  mutated_key_list = ('graph', 'input')
 
   def preprocess(self, data):
     """ Read the operator and the tasks they can perform and adds them to them to the graph. 
@@ -14,6 +14,7 @@ class ReadJSSkillsToStations(UpdateStationList.UpdateStationList):
   """ Input preparation 
       reads the operators and turns the technology-skills to the corresponding station-skills
   """
+  mutated_key_list = ('graph', 'input')
 
   def preprocess(self, data):
     """ turns the technology-skills to the corresponding station-skills
@@ -14,6 +14,7 @@ class ReadJSWIP(ReadJSWorkPlan.ReadJSWorkPlan, TimeSupportMixin):
   """ Input preparation
       reads the wip from the spreadsheet and inserts it to the BOM
   """
+  mutated_key_list = ('general', 'input')
 
   def preprocess(self, data):
     """ inserts the wip as introduced in the GUI to the BOM
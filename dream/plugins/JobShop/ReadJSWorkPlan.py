@@ -12,6 +12,7 @@ class ReadJSWorkPlan(plugin.InputPreparationPlugin):
   """ Input preparation
       reads the work-plan from the corresponding spreadsheet
   """
+  mutated_key_list = ('input',)
     
   def findEntityByID(self, ID):
     """search within the BOM and find the entity (order or component)"""
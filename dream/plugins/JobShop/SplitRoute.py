@@ -12,6 +12,7 @@ class SplitRoute(plugin.InputPreparationPlugin):
   """ Input preparation
       reads the data from external data base and splits the routes if the parts described are design and mould
   """
+  mutated_key_list = ('input',)
   
   ROUTE_STEPS_SET=set(["ENG", "CAD","CAM","MILL", "MILL-SET","TURN", "DRILL", "QUAL","EDM", "EDM-SET","ASSM", "MAN","INJM", "INJM-MAN", "INJM-SET"])
   DESIGN_ROUTE_STEPS_SET=set(["ENG", "CAD"])
@@ -12,6 +12,7 @@ class UpdateStationList(plugin.InputPreparationPlugin):
   """ Input preparation
       reads the data from external data base and substitutes the technology information with stationIDs lists
   """
+  mutated_key_list = ('graph', 'input')
   # XXX hard-coded allowed station classes
   STATION_CLASS_SET = set(["Dream.MouldAssembly","Dream.MachineJobShop"])
   # XXX hardcoded values for CAD1 and CAD2 stations
@@ -9,6 +9,7 @@ class UpdateWIP(SplitRoute.SplitRoute):
   """ Input preparation
       reads the data from external data base and updates the WIP
   """
+  mutated_key_list = ('graph', 'input')
   
   def getWIPIds(self):
     """returns the ids of the parts that are in the WIP dictionary"""
@@ -1,15 +1,33 @@
 from dream.plugins import plugin
+from dream.simulation.TraceSink import readTrace, readTraceCells
+from dream.simulation.ExcelHandler import createTraceWorkbook
+import StringIO
 
 class ParseTraceFile(plugin.OutputPreparationPlugin):
   """ Output the result of demand planning in a format compatible with
   Output_viewDownloadFile
   """
+  mutated_key_list = ('result',)
+
+  def getEncodedTrace(self, results):
+    """ returns the trace encoded as an excel file. A streamed trace is given
+    as its encoded file and converted only here, when it is requested.
+    """
+    if results.get('trace') or not results.get('trace_data'):
+      return results.get('trace')
+    encodedTrace = results['trace_data']
+    traceFormat = results['trace_format']
+    traceFile = createTraceWorkbook(readTrace(format=traceFormat, encodedTrace=encodedTrace),
+                                    readTraceCells(format=traceFormat, encodedTrace=encodedTrace))
+    traceStringIO = StringIO.StringIO()
+    traceFile.save(traceStringIO)
+    return traceStringIO.getvalue().encode('base64')
 
   def postprocess(self, data):  
     outPutFile=None
     for record in data['result']['result_list'][-1]['elementList']:
         if record.get('id',None)=='TraceFile':
-            outPutFile=record['results']['trace']
+            outPutFile=self.getEncodedTrace(record['results'])
     data['result']['result_list'][-1][self.configuration_dict['output_id']] = {
           'name': 'Trace.xls',
           'mime_type': 'application/vnd.ms-excel',
@@ -5,6 +5,7 @@ from dream.plugins.TimeSupport import TimeSupportMixin
 class PostProcessOrderLateness(plugin.OutputPreparationPlugin, TimeSupportMixin):
   """ Postprocess order lateness for Input_viewResultOrderLateness
   """
+  mutated_key_list = ('result',)
 
   def postprocess(self, data):
     self.initializeTimeSupport(data)
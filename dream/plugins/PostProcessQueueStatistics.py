@@ -1,9 +1,15 @@
 from dream.plugins import plugin
 from dream.plugins.TimeSupport import TimeSupportMixin
+from dream.simulation.WipStatRecorder import bucketSeries, downsampleSeries
 
 class PostProcessQueueStatistics(plugin.OutputPreparationPlugin, TimeSupportMixin):
   """ Output the queue statistics in a format compatible with Output_viewGraph
+
+  The series can be bounded by configuring a "bucket_size" (in simulation
+  time units), to plot the time-weighted mean WIP per bucket, and/or a
+  "max_points" to downsample it.
   """
+  mutated_key_list = ('result',)
 
   def postprocess(self, data):
       
@@ -24,11 +30,18 @@ class PostProcessQueueStatistics(plugin.OutputPreparationPlugin, TimeSupportMixi
       "options": options
     }
 
+    bucket_size = self.configuration_dict.get('bucket_size')
+    max_points = self.configuration_dict.get('max_points')
     for obj in result['elementList']:
       if obj.get('family') == self.configuration_dict.get('family', 'Buffer'):
+        wip_stat_list = obj['results']['wip_stat_list'][0]
+        if bucket_size:
+          wip_stat_list = bucketSeries(wip_stat_list, bucket_size)
+        if max_points:
+          wip_stat_list = downsampleSeries(wip_stat_list, max_points)
         series.append({
          "label": obj.get('name', obj['id']),
-         "data": [(self.convertToTimeStamp(time) * 1000, value) for (time, value) in obj['results']['wip_stat_list'][0] 
+         "data": [(self.convertToTimeStamp(time) * 1000, value) for (time, value) in wip_stat_list 
                   if not time==float("inf")]
         })
     return data
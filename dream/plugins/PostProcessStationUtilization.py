@@ -3,6 +3,7 @@ from dream.plugins import plugin
 class PostProcessStationUtilization(plugin.OutputPreparationPlugin):
   """ Output the station utilization metrics in a format compatible with Output_viewGraph
   """
+  mutated_key_list = ('result',)
 
   def postprocess(self, data):
     result = data['result']['result_list'][-1]
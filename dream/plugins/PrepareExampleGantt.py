@@ -7,6 +7,7 @@ from dream.plugins.TimeSupport import TimeSupportMixin
 
 class PrepareExampleGantt(plugin.OutputPreparationPlugin, TimeSupportMixin):
 
+  mutated_key_list = ('result',)
   def _generateRandomTaskList(self):
     """Generate some random tasks for the example.
 
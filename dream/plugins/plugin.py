@@ -1,15 +1,25 @@
-from copy import deepcopy
+from copy import copy, deepcopy
 import json
+import time
+import cPickle
+import resource
 import numpy
 import xlrd
 
 from zope.dottedname.resolve import resolve
 
 from dream.simulation.LineGenerationJSON import main as simulate_line_json
+from dream.simulation.LineGenerationJSON import runModel
 
 class Plugin(object):
   """Base class for pre-post processing Plugin.
   """
+  # the top level keys of the data that the plugin modifies. Only those are
+  # copied before the data is given to the plugin, the rest is shared with the
+  # previous plugin. None means that the plugin may modify anything, so all
+  # the data is copied.
+  mutated_key_list = None
+
   def __init__(self, logger, configuration_dict):
     self.logger = logger
     self.configuration_dict = configuration_dict
@@ -48,14 +58,20 @@ class Plugin(object):
 
   # calculate the confidence interval for a list and a confidence level
   def getConfidenceInterval(self, value_list, confidenceLevel):
+    return self.getConfidenceIntervalList([value_list], confidenceLevel)[0]
+
+  # calculate the confidence intervals of many lists at once, for the same
+  # confidence level
+  def getConfidenceIntervalList(self, value_list_list, confidenceLevel):
     from dream.KnowledgeExtraction.ConfidenceIntervals import ConfidenceIntervals
     from dream.KnowledgeExtraction.StatisticalMeasures import StatisticalMeasures
-    BSM=StatisticalMeasures()
-    lb, ub = ConfidenceIntervals().ConfidIntervals(value_list, confidenceLevel)
-    return {'lb': lb,
-            'ub': ub,
-            'avg': BSM.mean(value_list) 
-        }
+    measures_list = StatisticalMeasures().measuresList(value_list_list)
+    interval_list = ConfidenceIntervals().ConfidIntervalsList(value_list_list,
+                                  confidenceLevel, measuresList=measures_list)
+    return [{'lb': lb,
+             'ub': ub,
+             'avg': measures['mean']
+            } for (lb, ub), measures in zip(interval_list, measures_list)]
     
   # return the average of a list    
   def getAverage(self, value_list):
@@ -82,14 +98,10 @@ class Plugin(object):
   def convertExcelToList(self, ExcelData, sheetName):
     mime_type, attachement_data = ExcelData[len('data:'):].split(';base64,', 1)
     attachement_data = attachement_data.decode('base64')
-    wbin = xlrd.open_workbook(file_contents=attachement_data)
+    # only the requested sheet is loaded
+    wbin = xlrd.open_workbook(file_contents=attachement_data, on_demand=True)
     sheet = wbin.sheet_by_name(sheetName)
-    listData=[]
-    for i in range(sheet.nrows):
-        listData.append([])
-        for j in range(sheet.ncols):
-            listData[i].append(sheet.cell(i, j).value)
-    return listData
+    return [sheet.row_values(i) for i in xrange(sheet.nrows)]
 
 
 class ExecutionPlugin(Plugin):
@@ -97,10 +109,29 @@ class ExecutionPlugin(Plugin):
   """
   @staticmethod
   def runOneScenario(data):
-    """default method for running one scenario
+    """default method for running one scenario. The simulation is run in
+    this process on the data as it is, without a json round trip.
+    """
+    return runModel(data)
+
+  @staticmethod
+  def runOneScenarioJSON(data):
+    """runs one scenario through the json interface of the simulation
     """
     return json.loads(simulate_line_json(input_data=json.dumps(data)))
 
+  @staticmethod
+  def encodeResult(result):
+    """returns the result in a compact binary form, to be sent to another process
+    """
+    return cPickle.dumps(result, cPickle.HIGHEST_PROTOCOL)
+
+  @staticmethod
+  def decodeResult(encoded_result):
+    """returns the result given in the form of encodeResult
+    """
+    return cPickle.loads(encoded_result)
+
   def run(self, data):
     """General execution plugin.
     """
@@ -176,6 +207,7 @@ class PluginRegistry(object):
   """
   def __init__(self, logger, data):
 
+    self.logger = logger
     self.input_preparation_list = []
     for plugin_data in data['application_configuration']['pre_processing']['plugin_list']:
       self.input_preparation_list.append(resolve(plugin_data['_class'])(logger, plugin_data))
@@ -187,15 +219,51 @@ class PluginRegistry(object):
     plugin_data = data['application_configuration']['processing_plugin']
     self.execution_plugin = resolve(plugin_data['_class'])(logger, plugin_data)
 
+    # the time and memory used by every plugin in the last run
+    self.statistics_list = []
+
   def run(self, data):
     """Preprocess, execute & postprocess.
     """
+    self.statistics_list = []
     for input_preparation in self.input_preparation_list:
-        data = input_preparation.preprocess(deepcopy(data))   
+        data = self.runPlugin(input_preparation.preprocess,
+          copyMutatedData(data, input_preparation.mutated_key_list))
     
-    data = self.execution_plugin.run(data)
+    data = self.runPlugin(self.execution_plugin.run, data)
 
     for output_preparation in self.output_preparation_list:
-        data = output_preparation.postprocess(deepcopy(data))
+        data = self.runPlugin(output_preparation.postprocess,
+          copyMutatedData(data, output_preparation.mutated_key_list))
 
+    slowest = max(self.statistics_list, key=lambda statistics: statistics['time'])
+    self.logger.info("slowest plugin %(plugin)s.%(method)s took %(time)0.3fs" % slowest)
     return data
+
+  def runPlugin(self, method, data):
+    """Calls the method of the plugin and records the time it took and the
+    growth of the peak memory (in KB) of the process during the call.
+    """
+    start = time.time()
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    data = method(data)
+    statistics = dict(plugin=method.im_self.__class__.__name__,
+                      method=method.__name__,
+                      time=time.time() - start,
+                      memory=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - max_rss)
+    self.logger.debug("%(plugin)s.%(method)s took %(time)0.3fs, "
+                      "peak memory grew by %(memory)sKB" % statistics)
+    self.statistics_list.append(statistics)
+    return data
+
+def copyMutatedData(data, mutated_key_list):
+  """Returns the data to give to a plugin modifying the given top level keys.
+  Only those are deep copied, the other keys share the values of the data.
+  """
+  if mutated_key_list is None:
+    return deepcopy(data)
+  data = copy(data)
+  for key in mutated_key_list:
+    if key in data:
+      data[key] = deepcopy(data[key])
+  return data
@@ -355,6 +355,7 @@ class Assembly(CoreObject):
         assert activeEntity.type==type, 'the type of the entity to get must be of type '+type+' while it is '+activeEntity.type
         #remove the entity from the previews object
         giverObject.removeEntity(activeEntity)     
+        self.markQueueChanged()
         self.printTrace(activeEntity.name, enter=self.id)
         self.outputTrace(activeEntity.name, "got into "+ self.objName)
         # if the type is Frame 
@@ -215,6 +215,7 @@ class BatchDecomposition(CoreObject):
         activeObject = self.getActiveObject()
         activeObjectQueue=activeObject.getActiveObjectQueue()    #get the internal queue of the active core object
         activeEntity = activeObjectQueue.pop()
+        activeObject.markQueueChanged()
         
         batchNumberOfUnits = activeEntity.numberOfUnits
         alreadyAllocatedUnits=0
@@ -241,6 +242,7 @@ class BatchDecomposition(CoreObject):
             #===================================================================
             G.EntityList.append(subBatch)
             activeObjectQueue.append(subBatch)                          #append the sub-batch to the active object Queue
+            activeObject.markQueueChanged()
             #activeEntity.subBatchList.append(subBatch)
             subBatch.currentStation=self
             # if the activeEntity is in the pendingEntities list then place the subBatches there
@@ -250,6 +250,8 @@ class BatchReassembly(CoreObject):
         batchToBeReassembled.numberOfUnits=numberOfUnits
         activeObjectQueue.append(batchToBeReassembled)
         batchToBeReassembled.currentStation=self
+        activeObject.recountWipUnits()
+        activeObject.markQueueChanged()
         self.timeLastEntityEnded=self.env.now
         self.outputTrace(batchToBeReassembled.name, 'was reassembled')
         
@@ -0,0 +1,166 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 17 Oct 2026
+
+'''
+'''
+benchmark of the scheduling rules of the Queue for large numbers of waiting entities. 
+Every pull takes the first job out of the queue, moves it to the next step of its route,
+puts it back at the end of the queue and sorts the queue again. The pulls are timed with the
+keys of the jobs read once per step of their routes (cached) and read from the routes 
+on every sort with one sort per criterion (recomputed), as the scheduling rules used to do.
+WINQ reads the queues of the stations of the routes, found by id instead of scanning G.ObjList.
+usage: python -m dream.simulation.Benchmarks.QueueDisciplines [numberOfJobs ...]
+'''
+
+import sys
+import time
+from random import Random
+
+import simpy
+
+from dream.simulation.Job import Job
+from dream.simulation.Queue import Queue
+from dream.simulation.Globals import G
+
+DEFAULT_SIZES=[1000, 10000, 100000]
+SCHEDULING_RULES=['Priority', 'EDD', 'EOD', 'NumStages', 'SPT', 'LPT', 'RPC', 'MS', 'WINQ',
+                  'MC-Priority-EDD', 'MC-Priority-MS-SPT']
+ROUTE_LENGTH=10
+NUMBER_OF_STATIONS=10
+
+# ===========================================================================
+# returns the given number of jobs with random routes, priorities, due dates and order dates
+# ===========================================================================
+def createJobs(numberOfJobs, seed=1):
+    random=Random(seed)
+    jobs=[]
+    for i in range(numberOfJobs):
+        route=[{'stationIdsList':['M%d' % random.randrange(NUMBER_OF_STATIONS)],
+                'processingTime':{'Fixed':{'mean':random.randint(1, 20)}}} for step in range(ROUTE_LENGTH)]
+        jobs.append(Job('J%d' % i, route=route, priority=random.randint(0, 3), dueDate=random.randint(0, 1000),
+                        orderDate=random.randint(0, 1000)))
+    del G.JobList[:]
+    return jobs
+
+# ===========================================================================
+# creates the stations of the routes with random numbers of waiting entities,
+# the lengths of their queues are read by WINQ
+# ===========================================================================
+def createStations(seed=1):
+    random=Random(seed)
+    env=simpy.Environment()
+    G.ObjList=[]
+    for i in range(NUMBER_OF_STATIONS):
+        station=Queue('M%d' % i, 'Queue')
+        station.Res=simpy.Resource(env)
+        station.Res.users.extend([None]*random.randint(0, 50))
+    del G.QueueList[:]
+
+# ===========================================================================
+# returns the processing time of a step as the scheduling rules used to read it
+# ===========================================================================
+def readProcessingTime(step):
+    processingTime=step.get('processingTime',None)
+    if processingTime:
+        return float(processingTime.get('Fixed',{}).get('mean',0))
+    return 0
+
+# ===========================================================================
+# sorts the queue reading the keys of the jobs again for every criterion
+# ===========================================================================
+def sortRecomputed(queue):
+    criteria=queue.multipleCriterionList if queue.schedulingRule=='MC' else [queue.schedulingRule]
+    activeObjectQ=queue.Res.users
+    for criterion in reversed(criteria):
+        if criterion=='Priority':
+            activeObjectQ.sort(key=lambda x: x.priority)
+        elif criterion=='EDD':
+            activeObjectQ.sort(key=lambda x: x.dueDate)
+        elif criterion=='EOD':
+            activeObjectQ.sort(key=lambda x: x.orderDate)
+        elif criterion=='NumStages':
+            activeObjectQ.sort(key=lambda x: len(x.remainingRoute), reverse=True)
+        elif criterion=='WINQ':
+            # the next station is the last one of G.ObjList with one of the ids of the next step
+            for job in activeObjectQ:
+                job.nextQueueLength=0
+                if len(job.remainingRoute)>1:
+                    nextObjIds=job.remainingRoute[1].get('stationIdsList',[])
+                    for obj in G.ObjList:
+                        if obj.id in nextObjIds:
+                            job.nextQueueLength=len(obj.Res.users)
+            activeObjectQ.sort(key=lambda x: x.nextQueueLength)
+        elif criterion in ('SPT', 'LPT'):
+            for job in activeObjectQ:
+                job.processingTimeInNextStation=readProcessingTime(job.remainingRoute[0])
+            activeObjectQ.sort(key=lambda x: x.processingTimeInNextStation, reverse=criterion=='LPT')
+        elif criterion in ('RPC', 'MS'):
+            for job in activeObjectQ:
+                RPT=0
+                for step in job.remainingRoute:
+                    RPT+=readProcessingTime(step)
+                job.totalRemainingProcessingTime=RPT
+            if criterion=='RPC':
+                activeObjectQ.sort(key=lambda x: x.totalRemainingProcessingTime, reverse=True)
+            else:
+                activeObjectQ.sort(key=lambda x: x.dueDate-x.totalRemainingProcessingTime)
+        else:
+            assert False, 'Unknown scheduling criterion %r' % (criterion, )
+
+# ===========================================================================
+# returns the mean time of a pull from the queue of the jobs with the given rule
+# ===========================================================================
+def timePulls(jobs, schedulingRule, sort, pulls):
+    queue=Queue('Q1', 'Queue', schedulingRule=schedulingRule)
+    del G.QueueList[:]
+    # the queue is not one of the stations of the routes
+    G.ObjList.remove(queue)
+    queue.Res=simpy.Resource(simpy.Environment())
+    queue.Res.users.extend(jobs)
+    for job in jobs:
+        job.remainingRoute=list(job.route)
+    sort(queue)
+    start=time.time()
+    for i in range(pulls):
+        job=queue.Res.users.pop(0)
+        # the job is sent back to the queue with the rest of its route
+        job.remainingRoute.pop(0)
+        if not job.remainingRoute:
+            job.remainingRoute=list(job.route)
+        queue.Res.users.append(job)
+        sort(queue)
+    return (time.time()-start)/pulls
+
+def main(argv=None):
+    argv=argv or sys.argv[1:]
+    sizes=[int(size) for size in argv] or DEFAULT_SIZES
+    createStations()
+    for numberOfJobs in sizes:
+        jobs=createJobs(numberOfJobs)
+        pulls=max(5, 100000//numberOfJobs)
+        for schedulingRule in SCHEDULING_RULES:
+            cached=timePulls(jobs, schedulingRule, Queue.sortEntities, pulls)
+            recomputed=timePulls(jobs, schedulingRule, sortRecomputed, pulls)
+            print '%d jobs, %s: cached %.3f ms, recomputed %.3f ms per pull (%.1fx)' \
+                    % (numberOfJobs, schedulingRule, cached*1e3, recomputed*1e3, recomputed/cached)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 17 Oct 2026
+
+'''
+'''
+benchmark of running one scenario through the json interface of the simulation 
+(dumps and loads of the input and of the result) and in process on the dicts, 
+as the execution plugins (ACO, Enumeration...) do for every scenario.
+usage: python -m dream.simulation.Benchmarks.ScenarioExecution [model.json ...]
+the models are GUI models, they are preprocessed by their plugins before the runs
+'''
+
+import os
+import sys
+import json
+import time
+import logging
+from copy import deepcopy
+
+from dream.plugins.plugin import PluginRegistry, ExecutionPlugin
+
+TEST_MODELS=os.path.join(os.path.dirname(__file__), '..', '..', 'plugins', 'testModels')
+DEFAULT_MODELS=['CapacityProjectEnumeration7orders.json', 'GUIBOMOpsComplex2ordersACOcomparisonWIPfullShifts.json']
+
+# ===========================================================================
+# returns the input of the execution plugin for the given GUI model
+# ===========================================================================
+def getScenarioData(path):
+    data=json.loads(open(path).read())
+    registry=PluginRegistry(logging.getLogger('dream.benchmark'), data)
+    for input_preparation in registry.input_preparation_list:
+        data=input_preparation.preprocess(deepcopy(data))
+    return data
+
+# ===========================================================================
+# returns the mean time of running the scenario with the given method
+# ===========================================================================
+def timeScenario(runOneScenario, data, repeat=5):
+    runOneScenario(data)        # warm up
+    start=time.time()
+    for i in range(repeat):
+        runOneScenario(data)
+    return (time.time()-start)/repeat
+
+def main(argv=None):
+    argv=argv or sys.argv[1:]
+    models=argv or [os.path.join(TEST_MODELS, model) for model in DEFAULT_MODELS]
+    for model in models:
+        data=getScenarioData(model)
+        jsonTime=timeScenario(ExecutionPlugin.runOneScenarioJSON, data)
+        inProcessTime=timeScenario(ExecutionPlugin.runOneScenario, data)
+        print '%s (%d KB of input): json %.4f s, in process %.4f s per scenario, %.4f s saved' \
+                % (os.path.basename(model), len(json.dumps(data))/1024, 
+                   jsonTime, inProcessTime, jsonTime-inProcessTime)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 17 Oct 2026
+
+'''
+'''
+benchmark of the signalling between the objects in layouts of high fan-out and fan-in:
+a queue feeds a number of parallel machines that dispose to a second queue in front of a 
+fast machine. Prints the mean time per run and the share of it spent in finding and selecting 
+the receivers and the givers.
+usage: python -m dream.simulation.Benchmarks.SignalHandshake [numberOfParallelMachines ...]
+'''
+
+import sys
+import json
+import time
+import cProfile
+import pstats
+
+from dream.simulation.LineGenerationJSON import main as simulate_line_json
+
+DEFAULT_WIDTHS=[10, 40, 100]
+HANDSHAKE_METHODS=['signalReceiver', 'signalGiver', 'findReceiversFor', 'findGiversFor', 
+                   'selectReceiver', 'selectGiver', 'canAccept', 'haveToDispose']
+
+# ===========================================================================
+# returns the json input of the layout with the given number of parallel machines
+# ===========================================================================
+def createModel(width, maxSimTime=100):
+    fixed=lambda mean: {'Fixed': {'mean': mean}}
+    nodes={'S1': {'_class': 'Dream.Source', 'name': 'Source', 'entity': 'Dream.Part',
+                  'interArrivalTime': fixed(1.1/width)},
+           'Q1': {'_class': 'Dream.Queue', 'name': 'Queue1', 'capacity': 2*width},
+           'Q2': {'_class': 'Dream.Queue', 'name': 'Queue2', 'capacity': 2*width},
+           'M0': {'_class': 'Dream.Machine', 'name': 'Machine0', 'processingTime': fixed(0.9/width)},
+           'E1': {'_class': 'Dream.Exit', 'name': 'Exit'}}
+    edges=[('S1', 'Q1'), ('Q2', 'M0'), ('M0', 'E1')]
+    for i in range(1, width+1):
+        machineId='M%d' % i
+        nodes[machineId]={'_class': 'Dream.Machine', 'name': 'Machine%d' % i, 'processingTime': fixed(1.05)}
+        edges+=[('Q1', machineId), (machineId, 'Q2')]
+    edgeDict={}
+    for i, (source, destination) in enumerate(edges):
+        edgeDict[str(i)]={'_class': 'Dream.Edge', 'source': source, 'destination': destination, 'data': {}}
+    return json.dumps({'_class': 'Dream.Simulation',
+                       'general': {'_class': 'Dream.Configuration', 'maxSimTime': str(maxSimTime),
+                                   'numberOfReplications': '1', 'trace': 'No'},
+                       'graph': {'node': nodes, 'edge': edgeDict}})
+
+# ===========================================================================
+# returns the mean time of running the model
+# ===========================================================================
+def timeModel(inputData, repeat=3):
+    simulate_line_json(input_data=inputData)     # warm up
+    start=time.time()
+    for i in range(repeat):
+        simulate_line_json(input_data=inputData)
+    return (time.time()-start)/repeat
+
+# ===========================================================================
+# returns the share of the run spent in the handshake methods (cumulative time,
+# the methods call each other so the shares overlap)
+# ===========================================================================
+def profileModel(inputData):
+    profile=cProfile.Profile()
+    profile.runcall(simulate_line_json, input_data=inputData)
+    stats=pstats.Stats(profile)
+    shares={}
+    for (filename, line, name), (cc, nc, tt, ct, callers) in stats.stats.iteritems():
+        if name in HANDSHAKE_METHODS:
+            shares[name]=shares.get(name, 0)+ct/stats.total_tt
+    return shares
+
+def main(argv=None):
+    argv=argv or sys.argv[1:]
+    widths=[int(width) for width in argv] or DEFAULT_WIDTHS
+    for width in widths:
+        inputData=createModel(width)
+        print '%d parallel machines: %.3f s per run' % (width, timeModel(inputData))
+        shares=profileModel(inputData)
+        print '    '+', '.join('%s %.0f%%' % (name, shares[name]*100) for name in HANDSHAKE_METHODS if name in shares)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 17 Oct 2026
+
+'''
+'''
+benchmark of the cost of the console trace in the event loop. 
+Runs the given models (by default a line with an operator router) with console output 
+disabled and enabled and prints the mean time per run, 
+along with the cost of a single printTrace call in each case.
+usage: python -m dream.simulation.Benchmarks.TraceOverhead [model.json ...]
+'''
+
+import os
+import sys
+import json
+import time
+import timeit
+
+from dream.simulation.LineGenerationJSON import main as simulate_line_json
+from dream.simulation.ManPyObject import ManPyObject, setConsoleTrace
+from dream.simulation.Globals import G
+
+JSON_INPUTS=os.path.join(os.path.dirname(__file__), '..', 'JSONInputs')
+DEFAULT_MODELS=['SkilledOperator02.json', 'Topology06.json']
+
+# ===========================================================================
+# a file like object that discards what is written to it
+# ===========================================================================
+class NullOutput(object):
+    def write(self, data):
+        pass
+
+# ===========================================================================
+# returns the mean time of running the model with the given console flag
+# ===========================================================================
+def timeModel(inputData, console, repeat=5):
+    data=json.loads(inputData)
+    data['general']['console']=console
+    inputData=json.dumps(data)
+    stdout=sys.stdout
+    sys.stdout=NullOutput()
+    try:
+        simulate_line_json(input_data=inputData)     # warm up
+        start=time.time()
+        for i in range(repeat):
+            simulate_line_json(input_data=inputData)
+        return (time.time()-start)/repeat
+    finally:
+        sys.stdout=stdout
+
+# ===========================================================================
+# returns the time of a single printTrace call with the given console flag
+# ===========================================================================
+def timePrintTrace(console, number=100000):
+    G.console=console
+    setConsoleTrace(console=='Yes')
+    stdout=sys.stdout
+    sys.stdout=NullOutput()
+    try:
+        return timeit.timeit(lambda: ManPyObject.printTrace('E1', received=''), number=number)/number
+    finally:
+        sys.stdout=stdout
+        G.console='No'
+        setConsoleTrace(False)
+
+def main(argv=None):
+    argv=argv or sys.argv[1:]
+    models=argv or [os.path.join(JSON_INPUTS, model) for model in DEFAULT_MODELS]
+    print 'printTrace call: console off %.3f us, console on %.3f us' \
+                % (timePrintTrace('No')*1e6, timePrintTrace('Yes')*1e6)
+    for model in models:
+        inputData=open(model).read()
+        off=timeModel(inputData, 'No')
+        on=timeModel(inputData, 'Yes')
+        print '%s: console off %.4f s, console on %.4f s per run (%.1fx)' \
+                % (os.path.basename(model), off, on, on/off)
+
+if __name__ == '__main__':
+    main()
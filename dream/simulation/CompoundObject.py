@@ -342,6 +342,8 @@ class CompoundObject(CoreObject,Queue):
                 # remove the entity from the internal queue and from the innerGiver queue
                 self.innerGiver.getActiveObjectQueue().pop(0)
                 activeObjectQueue.pop(activeIndex)
+                self.innerGiver.markQueueChanged()
+                self.markQueueChanged()
                 # update the time the last entity left
                 self.timeLastEntityLeft = now()
             else:
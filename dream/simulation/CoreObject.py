@@ -27,6 +27,7 @@ Class that acts as an abstract. It should have no instances. All the core-object
 
 # from SimPy.Simulation import Process, Resource, now, SimEvent, waitevent
 import simpy
+import heapq
 from ManPyObject import ManPyObject
 
 # ===========================================================================
@@ -126,6 +127,7 @@ class CoreObject(ManPyObject):
         self.downTimeInTryingToReleaseCurrentEntity=0   #holds the time that the object was down while trying 
                                                         #to release the current entity . This might be due to failure, off-shift, etc                                                         
         self.timeLastEntityLeft=0                       #holds the last time that an entity left the object
+        self.queueChanged=False                         #shows if the queue changed since the router last sorted it
         
         self.processingTimeOfCurrentEntity=0            #holds the total processing time that the current entity required                                               
         # ============================== waiting flag ==============================================                                      
@@ -186,10 +188,11 @@ class CoreObject(ManPyObject):
         
         self.lastGiver=None         # variable that holds the last giver of the object, used by object in case of preemption    
         # initialize the wipStatList - 
-        # TODO, think what to do in multiple runs
         # TODO, this should be also updated in Globals.setWIP (in case we have initial wip)
-        import numpy as np
-        self.wipStatList=np.array([[0,0]])
+        from WipStatRecorder import WipStatRecorder
+        self.wipStatList=WipStatRecorder()
+        self.wipStatList.record(0,0)
+        self.wipUnits=None          # running count of the units held, counted from the queue at the first record
 
         self.isRequested=self.env.event()
         self.canDispose=self.env.event()
@@ -290,6 +293,7 @@ class CoreObject(ManPyObject):
         
         activeObjectQueue=self.Res.users
         activeObjectQueue.remove(entity)       #remove the Entity from the queue
+        self.markQueueChanged()
         if self.receiver:
             self.receiver.appendEntity(entity)
         
@@ -307,11 +311,7 @@ class CoreObject(ManPyObject):
         
         # update wipStatList
         if self.gatherWipStat:
-            import numpy
-            wip=0
-            for holdEntity in activeObjectQueue:
-                wip+=holdEntity.numberOfUnits
-            self.wipStatList=numpy.concatenate((self.wipStatList,[[self.env.now, wip]]))
+            self.recordWipStat(-entity.numberOfUnits)
         if self.expectedSignals['entityRemoved']:
             self.printTrace(self.id, signal='(removedEntity)')
             self.sendSignal(receiver=self, signal=self.entityRemoved)
@@ -325,6 +325,28 @@ class CoreObject(ManPyObject):
         activeObjectQueue=self.Res.users
         activeObjectQueue.append(entity)
     
+    #===========================================================================
+    # appends the current WIP of the object to the wipStatList. The units held are kept
+    # in a running count updated by units, so that the queue is not counted on every move
+    #===========================================================================
+    def recordWipStat(self, units=0):
+        if self.wipUnits is None:
+            # count once the entities already in the queue (e.g. initial WIP)
+            self.wipUnits=0
+            for holdEntity in self.Res.users:
+                self.wipUnits+=holdEntity.numberOfUnits
+        else:
+            self.wipUnits+=units
+        self.wipStatList.record(self.env.now, self.wipUnits)
+    
+    #===========================================================================
+    # to be called when the queue or the numberOfUnits of the entities it holds are 
+    # changed outside getEntity and removeEntity (e.g. Batch reassembly, setWIP).
+    # The units are counted again from the queue at the next record
+    #===========================================================================
+    def recountWipUnits(self):
+        self.wipUnits=None
+    
     # =======================================================================
     #             called be getEntity it identifies the Entity 
     #                        to be obtained so that 
@@ -369,6 +391,7 @@ class CoreObject(ManPyObject):
         giverObject.receiver=self
         # remove entity from the giver
         activeEntity = giverObject.removeEntity(entity=self.identifyEntityToGet())
+        self.markQueueChanged()
         # variable that holds the last giver; used in case of preemption
         self.lastGiver=self.giver
 #         #get the entity from the previous object and put it in front of the activeQ 
@@ -407,11 +430,7 @@ class CoreObject(ManPyObject):
         
         # update wipStatList
         if self.gatherWipStat:
-            import numpy
-            wip=0
-            for holdEntity in activeObjectQueue:
-                wip+=holdEntity.numberOfUnits
-            self.wipStatList=numpy.concatenate((self.wipStatList,[[self.env.now, wip]]))
+            self.recordWipStat(activeEntity.numberOfUnits)
         return activeEntity
     
     #===========================================================================
@@ -466,27 +485,25 @@ class CoreObject(ManPyObject):
                         receiver.timeLastEntityEnded=self.env.now     #required to count blockage correctly in the preemptied station
                         # sort so that the critical entity is placed in front
                         activeObjectQueue.sort(key=lambda x: x==activeEntity, reverse=True)
+                        self.markQueueChanged()
                 # if there is a critical entity and the possible receivers are operated then signal the Router
                 elif receiverOperated:
                     self.signalRouter(receiver)
                     activeObjectQueue.sort(key=lambda x: x==activeEntity, reverse=True)
-        # update wipStatList
+                    self.markQueueChanged()
         # update wipStatList
         if self.gatherWipStat:
-            import numpy
-            wip=0
-            for holdEntity in activeObjectQueue:
-                wip+=holdEntity.numberOfUnits
-            self.wipStatList=numpy.concatenate((self.wipStatList,[[self.env.now, wip]]))
+            self.recordWipStat()
 
     
     #===========================================================================
-    # find possible receivers
+    # find possible receivers. The receivers that wait for the isRequested 
+    # signal are checked first, so that canAccept is only called for them
     #===========================================================================
     @staticmethod
     def findReceiversFor(activeObject):
         receivers=[]
-        for object in [x for x in activeObject.next if x.canAccept(activeObject) and not x.isRequested.triggered and x.expectedSignals['isRequested']]:
+        for object in [x for x in activeObject.next if x.expectedSignals['isRequested'] and not x.isRequested.triggered and x.canAccept(activeObject)]:
             receivers.append(object)
         return receivers
         
@@ -496,21 +513,18 @@ class CoreObject(ManPyObject):
     def signalReceiver(self):
         possibleReceivers=self.findReceiversFor(self)
         if possibleReceivers:
-            receiver=self.selectReceiver(possibleReceivers)
-            receiversGiver=self
             # perform the checks that canAcceptAndIsRequested used to perform and update activeCallersList or assignExit and operatorPool
-            while not receiver.canAcceptAndIsRequested(receiversGiver):
-                possibleReceivers.remove(receiver)
-                if not possibleReceivers:
-                    receiversGiver=None
-                    receiver=None
-                    # if no receiver can accept then try to preempt a receive if the stations holds a critical order
-                    self.preemptReceiver()
-                    return False
-                receiver=self.selectReceiver(possibleReceivers)
-                receiversGiver=self
+            # on the receivers in the order they are selected, until one of them accepts
+            for receiver in self.iterateReceivers(possibleReceivers):
+                if receiver.canAcceptAndIsRequested(self):
+                    break
+            else:
+                # if no receiver can accept then try to preempt a receive if the stations holds a critical order
+                self.preemptReceiver()
+                return False
             # sorting the entities of the object for the receiver
             self.sortEntitiesForReceiver(receiver)
+            self.markQueueChanged()
             # signalling the Router if the receiver is operated and not assigned an operator
             if self.signalRouter(receiver):
                 return False
@@ -546,6 +560,27 @@ class CoreObject(ManPyObject):
                 receiver=object                                 # set the receiver as the longest waiting possible receiver
         return receiver
     
+    # =======================================================================
+    # returns the possible receivers in the order selectReceiver selects them 
+    # when the ones before are removed. They are taken out of a heap keyed on 
+    # the time they are waiting, the ones that are not waiting from the last one on
+    # =======================================================================
+    def iterateReceivers(self, possibleReceivers):
+        # an object that selects its receivers otherwise is asked every time
+        if not type(self).selectReceiver is CoreObject.selectReceiver:
+            possibleReceivers=list(possibleReceivers)
+            while possibleReceivers:
+                receiver=self.selectReceiver(possibleReceivers)
+                yield receiver
+                possibleReceivers.remove(receiver)
+            return
+        heap=[]
+        for index, object in enumerate(possibleReceivers):
+            timeWaiting=self.env.now-object.timeLastEntityLeft
+            heap.append((-timeWaiting, index if timeWaiting else -index, object))
+        heapq.heapify(heap)
+        while heap:
+            yield heapq.heappop(heap)[2]
            
     #===========================================================================
     # sort the entities of the queue for the receiver
@@ -573,15 +608,13 @@ class CoreObject(ManPyObject):
     def signalGiver(self):
         possibleGivers=self.findGiversFor(self)
         if possibleGivers:
-            giver=self.selectGiver(possibleGivers)
-            giversReceiver=self
             # perform the checks that canAcceptAndIsRequested used to perform and update activeCallersList or assignExit and operatorPool
-            while not self.canAcceptAndIsRequested(giver):
-                possibleGivers.remove(giver)
-                if not possibleGivers:
-                    return False
-                giver=self.selectGiver(possibleGivers)
-                giversReceiver=self
+            # on the givers in the order they are selected, until one of them is accepted
+            for giver in self.iterateGivers(possibleGivers):
+                if self.canAcceptAndIsRequested(giver):
+                    break
+            else:
+                return False
             self.giver=giver
             self.giver.receiver=self
             if self.giver.expectedSignals['canDispose'] or (self.giver.canDeliverOnInterruption 
@@ -611,6 +644,27 @@ class CoreObject(ManPyObject):
                 maxTimeWaiting=timeWaiting  
         return giver
     
+    # =======================================================================
+    # returns the possible givers in the order selectGiver selects them 
+    # when the ones before are removed. They are taken out of a heap keyed on 
+    # the time they are blocked, the last one first among equally blocked ones
+    # =======================================================================
+    def iterateGivers(self, possibleGivers):
+        # an object that selects its givers otherwise is asked every time
+        if not type(self).selectGiver is CoreObject.selectGiver:
+            possibleGivers=list(possibleGivers)
+            while possibleGivers:
+                giver=self.selectGiver(possibleGivers)
+                yield giver
+                possibleGivers.remove(giver)
+            return
+        heap=[]
+        for index, object in enumerate(possibleGivers):
+            heap.append((object.timeLastEntityEnded-self.env.now, -index, object))
+        heapq.heapify(heap)
+        while heap:
+            yield heapq.heappop(heap)[2]
+    
     # =======================================================================
     # actions to be taken after the simulation ends
     # =======================================================================
@@ -624,11 +678,7 @@ class CoreObject(ManPyObject):
         
         # update wipStatList
         if self.gatherWipStat:
-            import numpy
-            wip=0
-            for holdEntity in activeObjectQueue:
-                wip+=holdEntity.numberOfUnits
-            self.wipStatList=numpy.concatenate((self.wipStatList,[[self.env.now, wip]]))
+            self.recordWipStat()
                            
         #calculate the offShift time for current entity
         offShiftTimeInCurrentEntity=0
@@ -746,6 +796,24 @@ class CoreObject(ManPyObject):
     # =======================================================================
     def sortEntities(self):
         pass
+    
+    # =======================================================================
+    # checks if the order given by sortEntities depends only on the entities
+    # in the queue, so that a queue that did not change need not be sorted again
+    # =======================================================================
+    def hasStaticSorting(self):
+        return type(self).sortEntities.im_func is CoreObject.sortEntities.im_func
+
+    # =======================================================================
+    # adds the object to the queues the router has to sort again. 
+    # Called when entities get into or are removed from the object and
+    # when its queue is reordered outside the router
+    # =======================================================================
+    def markQueueChanged(self):
+        if not self.queueChanged:
+            self.queueChanged=True
+            from Globals import G
+            G.changedQueues.append(self)
 
     # =======================================================================
     # get the active object. This always returns self 
@@ -277,6 +277,7 @@ class Dismantle(CoreObject):
         #move the frame to the end of the internal queue since we want the frame to be disposed first
         activeObjectQueue.append(activeEntity)
         activeObjectQueue.pop(0)        
+        self.markQueueChanged()
         return activeEntity
     
     #===========================================================================
@@ -309,6 +310,10 @@ class Dismantle(CoreObject):
     def outputTrace(self, name, message):
         from Globals import G
         if(G.trace=="Yes"):         #output only if the user has selected to
+            # if the trace is streamed write the row to the sink
+            if G.traceSink:
+                G.traceSink.write(str(self.env.now), name, message)
+                return
             #handle the 3 columns
             G.traceSheet.write(G.traceIndex,0,str(self.env.now))
             G.traceSheet.write(G.traceIndex,1,name)  
@@ -34,6 +34,7 @@ from ManPyObject import ManPyObject
 # ===========================================================================
 class Entity(ManPyObject):
     type="Entity"
+    pendingEntities=None        # the PendingEntities the entity is in, if it is pending
 
     def __init__(self, id=None, name=None, priority=0, dueDate=0, orderDate=0, 
                  isCritical=False, remainingProcessingTime=0,remainingSetupTime=0,currentStation=None,
@@ -79,6 +80,19 @@ class Entity(ManPyObject):
         self.remainingProcessingTime=remainingProcessingTime
         self.remainingSetupTime=remainingSetupTime
         self.status=status
+    
+    # =======================================================================
+    # the station holding the entity, the pending entities are grouped by it
+    # =======================================================================
+    @property
+    def currentStation(self):
+        return self._currentStation
+    
+    @currentStation.setter
+    def currentStation(self, station):
+        if self.pendingEntities is not None:
+            self.pendingEntities.moveEntity(self, station)
+        self._currentStation=station
         
     #===========================================================================
     # return the responsible operator for the current step, not implemented for entities
@@ -65,4 +65,31 @@ def resetTrace():
     G.traceIndex=0                    #index that shows in what row we are
     G.sheetIndex=1                    #index that shows in what sheet we are
     G.traceFile = xlwt.Workbook()     #create excel file
-    G.traceSheet = G.traceFile.add_sheet('sheet '+str(G.sheetIndex), cell_overwrite_ok=True)  #create excel sheet  
\ No newline at end of file
+    G.traceSheet = G.traceFile.add_sheet('sheet '+str(G.sheetIndex), cell_overwrite_ok=True)  #create excel sheet  
+
+#creates an excel workbook holding the given trace rows
+#the format is (time | entity name | message) as in the trace of the simulation run
+def createTraceWorkbook(rows, cells=()):
+    sheetIndex=1  #index that shows in which sheet we are
+    traceIndex=0  #index that shows in what row we are
+    traceFile = xlwt.Workbook()     #create excel file
+    traceSheet = traceFile.add_sheet('sheet '+str(sheetIndex), cell_overwrite_ok=True)  #create excel sheet
+    for row in rows:
+        for column, value in enumerate(row):
+            traceSheet.write(traceIndex,column,value)
+        traceIndex+=1       #increment the row
+        #if we reach row 65536 we need to create a new sheet (excel limitation)  
+        if(traceIndex==65536):
+            traceIndex=0
+            sheetIndex+=1
+            traceSheet=traceFile.add_sheet('sheet '+str(sheetIndex), cell_overwrite_ok=True)
+    # the cells of the route of the jobs, if any, are written to one more sheet (see PrintRoute)
+    routeSheet=None
+    for (firstRow, lastRow, firstColumn, lastColumn, value) in cells:
+        if routeSheet is None:
+            routeSheet=traceFile.add_sheet('sheet '+str(sheetIndex+1)+' route', cell_overwrite_ok=True)
+        if firstRow==lastRow and firstColumn==lastColumn:
+            routeSheet.write(firstRow, firstColumn, value)
+        else:
+            routeSheet.write_merge(firstRow, lastRow, firstColumn, lastColumn, value)
+    return traceFile
@@ -29,10 +29,12 @@ carries some global variables
 from Machine import Machine
 from Queue import Queue
 from Repairman import Repairman
+from PendingEntities import PendingEntities
 import xlwt
 import xlrd
 from random import Random, expovariate, gammavariate, normalvariate
 import simpy
+import collections
 
 # ===========================================================================
 # globals
@@ -50,6 +52,12 @@ class G:
     RouterList=[]
     
     numberOfReplications=1          #the number of replications default=1git 
+    firstReplication=0              #the index of the first replication, so that more replications of a model can be run later
+    replicationProcessCount=1       #the number of processes the replications are spread over default=1
+    replicationIndex=None           #the index of the running replication, None while the model is built
+    rngBlockSize=0                  #the number of numbers each random number generator draws at once from its own stream 
+                                    #default=0, the numbers are drawn one at a time from G.Rnd
+    rngStreamCounts={}              #the number of random number generators created for every object (and replication)
     confidenceLevel=0.9             #the confidence level default=90%
     Base=1                          #the Base time unit. Default =1 minute
     maxSimTime=0                    #the total simulation time
@@ -63,6 +71,9 @@ class G:
     sheetIndex=1                    #index that shows in what sheet we are
     traceFile = xlwt.Workbook()     #create excel file
     traceSheet = traceFile.add_sheet('sheet '+str(sheetIndex), cell_overwrite_ok=True)  #create excel sheet    
+    traceFormat='xls'               #the format of the trace, 'xls' keeps it in the workbook above, the others stream it to a file
+    traceDirectory=None             #the directory the streamed trace files are written to / default the temporary directory
+    traceSink=None                  #the sink the trace is streamed to in the running replication
     
     
     # variables for excel output
@@ -119,7 +130,9 @@ class G:
     SubBatchList=[]
     # entities that just finished processing in a station 
     # and have to enter the next machine 
-    pendingEntities=[]
+    pendingEntities=PendingEntities()
+    # objects whose queues changed since the router last sorted them
+    changedQueues=[]
     env=simpy.Environment()
 
     totalPulpTime=0     # temporary to track how much time PuLP needs to run 
@@ -143,10 +156,21 @@ def moveExcess(consumption=1,safetyStock=70, giverId=None, receiverId=None):
     else:
         print "Giver and/or Receiver not defined"
 
+# the classes and the methods already found by their dotted names, 
+# the machines look their methods up every time they are signalled
+resolvedClasses={}
+resolvedMethods={}
+
 # =======================================================================
 # Import a class from a dotted name used in json.
 # =======================================================================
 def getClassFromName(dotted_name):
+    cls=resolvedClasses.get(dotted_name)
+    if cls is None:
+        cls=resolvedClasses[dotted_name]=resolveClassName(dotted_name)
+    return cls
+
+def resolveClassName(dotted_name):
     from zope.dottedname.resolve import resolve
     import logging
     logger = logging.getLogger("dream.platform")
@@ -163,6 +187,12 @@ def getClassFromName(dotted_name):
 # returns a method by its name. name should be given as Dream.ClassName.MethodName
 # =======================================================================
 def getMethodFromName(dotted_name):
+    method=resolvedMethods.get(dotted_name)
+    if method is None:
+        method=resolvedMethods[dotted_name]=resolveMethodName(dotted_name)
+    return method
+
+def resolveMethodName(dotted_name):
     name=dotted_name.split('.')
     methodName=name[-1]
     # if the method is in this script
@@ -185,14 +215,92 @@ def getMethodFromName(dotted_name):
         raise Exception("Method %s not implemented" % method_name)
     return method
       
+# =======================================================================
+# the listener called with the progress events of the run (replication, 
+# generation, best score...), set by the platform when the run is watched
+# =======================================================================
+progressListener=None
+
+def setProgressListener(listener):
+    global progressListener
+    progressListener=listener
+
+# =======================================================================
+# reports an event on the progress of the run to the listener if any
+# e.g. reportProgress(replication=2, numberOfReplications=10)
+# =======================================================================
+def reportProgress(**event):
+    if progressListener is not None:
+        progressListener(event)
+
 # =======================================================================
 # method finding objects by ID
 # =======================================================================
 def findObjectById(id):
-    for obj in G.ObjList + G.ObjectResourceList + G.EntityList + G.ObjectInterruptionList + G.OrderList:
-        if obj.id==id:
-            return obj
-    return None
+    return objectRegistry.findObjectById(id)
+
+# =======================================================================
+# id-keyed index of the objects held in the lists of G. The lists must only
+# be appended to during a run and are replaced by new ones when the model is
+# built again, so the index follows them by indexing the new items or 
+# by indexing the whole list again if it was replaced. A list that had objects 
+# removed is indexed again if it got shorter or if its last indexed object moved
+# =======================================================================
+class ObjectRegistry(object):
+    # the lists of G that are indexed, in the order they are searched by findObjectById
+    listNames=('ObjList', 'ObjectResourceList', 'EntityList', 'ObjectInterruptionList', 'OrderList')
+    
+    def __init__(self):
+        self.lists={}           # the list of G that each index was built for
+        self.lengths={}         # the number of objects of each list already indexed
+        self.lastObjects={}     # the last object of each list already indexed
+        self.indexes={}         # for every list, a dict holding for every id the position of its first object and the object
+    
+    # =======================================================================
+    # returns the index of the list of G with the given name, updated with the 
+    # objects appended since the last call
+    # =======================================================================
+    def getIndex(self, listName):
+        objectList=getattr(G, listName)
+        length=self.lengths.get(listName, 0)
+        if self.lists.get(listName) is not objectList or length>len(objectList)\
+                or (length and objectList[length-1] is not self.lastObjects[listName]):
+            self.lists[listName]=objectList
+            self.indexes[listName]={}
+            length=0
+        index=self.indexes[listName]
+        for position in xrange(length, len(objectList)):
+            obj=objectList[position]
+            if not obj.id in index:
+                index[obj.id]=(position, obj)
+        self.lengths[listName]=len(objectList)
+        if objectList:
+            self.lastObjects[listName]=objectList[-1]
+        return index
+    
+    # =======================================================================
+    # returns the first object with the given id, searching the lists 
+    # in the order of listNames, or None if there is no such object
+    # =======================================================================
+    def findObjectById(self, id):
+        # callers may pass values that cannot be an id (e.g. dicts of responsible operators)
+        if not isinstance(id, collections.Hashable):
+            return None
+        for listName in self.listNames:
+            found=self.getIndex(listName).get(id)
+            if found:
+                return found[1]
+        return None
+    
+    # =======================================================================
+    # returns the objects of the list of G with the given name
+    # that have one of the given ids, in the order of the list 
+    # =======================================================================
+    def findObjectsByIds(self, ids, listName='ObjList'):
+        found=self.getIndex(listName)
+        return [obj for (position, obj) in sorted(set(found[id] for id in ids if isinstance(id, collections.Hashable) and id in found))]
+
+objectRegistry=ObjectRegistry()
 
 # =======================================================================
 # Error in the setting up of the WIP
@@ -217,6 +325,8 @@ def setWIP(entityList):
             if entity.currentStation:   
                 object=entity.currentStation                        #identify the object
                 object.getActiveObjectQueue().append(entity)        #append the entity to its Queue
+                object.recountWipUnits()
+                object.markQueueChanged()
                 entity.schedule.append({"station": object,
                                         "entranceTime": G.env.now}) #append the time to schedule so that it can be read in the result
             
@@ -239,6 +349,8 @@ def setWIP(entityList):
             # get the starting station of the entity and load it with it
             object = findObjectById(objectId)
             object.getActiveObjectQueue().append(entity)        # append the entity to its Queue
+            object.recountWipUnits()
+            object.markQueueChanged()
             # if the entity is to be appended to a mouldAssemblyBuffer then it is readyForAsselbly
             if object.__class__.__name__=='MouldAssemblyBuffer':
                 entity.readyForAssembly=1
@@ -400,6 +512,8 @@ def runSimulation(objectList=[], maxSimTime=100, numberOfReplications=1, trace='
     from ObjectInterruption import ObjectInterruption
     from ObjectResource import ObjectResource
     from Entity import Entity
+    from ManPyObject import setConsoleTrace
+    setConsoleTrace(G.console=='Yes')
     for object in objectList:
         if issubclass(object.__class__, CoreObject):
             G.ObjList.append(object)
@@ -410,6 +524,7 @@ def runSimulation(objectList=[], maxSimTime=100, numberOfReplications=1, trace='
 
     #run the replications
     for i in range(G.numberOfReplications):    
+        G.replicationIndex=i
         if G.seed:
             G.Rnd=Random('%s%s' % (G.seed, i))
             G.numpyRnd.random.seed(G.seed)
@@ -29,12 +29,23 @@ in the system and also in the processing times at each station
 from Globals import G
 from Entity import Entity
 
+# =======================================================================
+# returns the processing time of a step of the route used by the scheduling rules
+# =======================================================================
+def getStepProcessingTime(step):
+    processingTime=step.get('processingTime',None)
+    if processingTime:
+        return float(processingTime.get('Fixed',{}).get('mean',0))
+    return 0
+
 # =======================================================================
 # The job object 
 # =======================================================================
 class Job(Entity):                                  # inherits from the Entity class   
     type='Job'
     family='Job'
+    routeProcessingTimes=None                       # the processing times read from the steps of the remaining route
+    checkedRoute=None                               # the remaining route as it was when the times were last looked up
     
     def __init__(self, id=None, name=None, route=[], priority=0, dueDate=0, orderDate=0, 
                  extraPropertyDict=None,remainingProcessingTime={}, remainingSetupTime={},currentStation=None, isCritical=False,**kw):
@@ -221,6 +232,46 @@ class Job(Entity):                                  # inherits from the Entity c
         # if the local flag mayProceed is true then return true
         return mayProceed
     
+    # =======================================================================
+    # returns the processing times of the steps of the remaining route and the
+    # index of its first step in them. The times are read once; as the steps are
+    # removed from the head of the remaining route they are found further in the 
+    # times, which are read again only if the remaining route is changed otherwise
+    # =======================================================================
+    def getRouteProcessingTimes(self):
+        remainingRoute=self.remainingRoute
+        if self.routeProcessingTimes:
+            steps, stepTimes, remainingTimes=self.routeProcessingTimes
+            offset=len(steps)-len(remainingRoute)
+            # the steps are compared only if the remaining route changed since the last look up
+            if self.checkedRoute==(remainingRoute, offset, remainingRoute and remainingRoute[0]):
+                return stepTimes, remainingTimes, offset
+            if offset>=0 and steps[offset:]==remainingRoute:
+                self.checkedRoute=(remainingRoute, offset, remainingRoute and remainingRoute[0])
+                return stepTimes, remainingTimes, offset
+        steps=list(remainingRoute)
+        # the total remaining processing times are computed when first needed for each step
+        self.routeProcessingTimes=(steps, [getStepProcessingTime(step) for step in steps], {})
+        self.checkedRoute=(remainingRoute, 0, remainingRoute and remainingRoute[0])
+        return self.routeProcessingTimes[1], self.routeProcessingTimes[2], 0
+    
+    # =======================================================================
+    # returns the processing time of the next step of the route
+    # =======================================================================
+    def getProcessingTimeInNextStep(self):
+        stepTimes, remainingTimes, offset=self.getRouteProcessingTimes()
+        return stepTimes[offset]
+    
+    # =======================================================================
+    # returns the total processing time of the remaining route 
+    # =======================================================================
+    def getRemainingProcessingTime(self):
+        stepTimes, remainingTimes, offset=self.getRouteProcessingTimes()
+        remainingTime=remainingTimes.get(offset)
+        if remainingTime is None:
+            remainingTime=remainingTimes[offset]=sum(stepTimes[offset:])
+        return remainingTime
+    
     #===========================================================================
     # method that returns the requiredParts 
     # of a blocked entity at its current step sequence 
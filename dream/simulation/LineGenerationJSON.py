@@ -42,10 +42,16 @@ from dream.simulation.Globals import G
 from dream.simulation.Order import Order
 from dream.simulation.OrderDesign import OrderDesign
 from dream.simulation.Mould import Mould
+from dream.simulation.PendingEntities import PendingEntities
 import dream.simulation.PrintRoute as PrintRoute
 import dream.simulation.ExcelHandler as ExcelHandler
+import dream.simulation.ReplicationExecutor as ReplicationExecutor
+import dream.simulation.TraceSink as TraceSink
+import dream.simulation.ManPyObject as ManPyObject
 import time
 import json
+import marshal
+from copy import deepcopy
 from random import Random
 import sys
 import os.path
@@ -59,11 +65,18 @@ import cProfile
 def readGeneralInput():
     general=G.JSONData['general']                                           # read the dict with key 'general'
     G.numberOfReplications=int(general.get('numberOfReplications', '1'))    # read the number of replications / default 1
+    G.firstReplication=int(general.get('firstReplication') or 0)            # the index of the first replication (the seeds follow it) / default 0
     G.maxSimTime=float(general.get('maxSimTime', '100'))                    # get the maxSimTime / default 100
     G.trace=general.get('trace', 'No')                                      # get trace in order to check if trace is requested
+    G.traceFormat=general.get('traceFormat') or 'xls'                       # the format of the trace / default the excel workbook
+    G.traceDirectory=general.get('traceDirectory')                          # the directory of the streamed trace files / default the temporary directory
     G.console=general.get('console', 'No')                                  # get console flag in order to check if console print is requested
+    ManPyObject.setConsoleTrace(G.console=='Yes')                           # bind the console trace of the objects to the flag
     G.confidenceLevel=float(general.get('confidenceLevel', '0.95'))         # get the confidence level
     G.seed = general.get('seed')                                            # the seed for random number generation
+    G.replicationProcessCount=int(general.get('replicationProcessCount') or 1)  # the number of processes the replications are spread over / default 1
+                                                                            # (multiprocessorCount is the one of the plugins that run scenarios, e.g. ACO)
+    G.rngBlockSize=int(general.get('rngBlockSize') or 0)                    # the number of numbers drawn at once by each random number generator / default 0
     G.extraPropertyDict=general.get('extraPropertyDict', {})                # a dict to put extra properties that are 
                                                                             # generic for the model
 
@@ -78,17 +91,19 @@ def createObjectResourcesAndCoreObjects():
     # nodes = json_data['nodes']                      # read from the dictionary the dicts with key 'nodes'
     nodes = json_data['graph']["node"]                      # read from the dictionary the dicts with key 'nodes'
     edges = json_data['graph']["edge"]                      # read from the dictionary the dicts with key 'edges'
-
+    # index the edges by their source so that the successors of a node are found without scanning all the edges
+    edgesBySource={}
+    for edge in edges.values():
+        edgesBySource.setdefault(edge["source"], []).append(edge)
 
     '''
     getSuccesorList method to get the successor 
     list of object with ID = id
-    XXX slow implementation
     '''
     def getSuccessorList(node_id, predicate=lambda source, destination, edge_class, edge_data: True):
       successor_list = []                           # dummy variable that holds the list to be returned
       
-      for edge in edges.values():
+      for edge in edgesBySource.get(node_id, []):
           source = edge["source"]
           destination = edge["destination"]
           edge_class = edge["_class"]
@@ -231,13 +246,22 @@ def createObjectResourcesAndCoreObjects():
             
     #                    loop through all the core objects    
     #                         to read predecessors
+    objectsById=indexObjectsById(G.ObjList)
     for element in G.ObjList:
         #loop through all the nextIds of the object
         for nextId in element.nextIds:
-            #loop through all the core objects to find the on that has the id that was read in the successorList
-            for possible_successor in G.ObjList:
-                if possible_successor.id==nextId:
-                    possible_successor.previousIds.append(element.id)            
+            #find the core objects that have the id that was read in the successorList
+            for possible_successor in objectsById.get(nextId, []):
+                possible_successor.previousIds.append(element.id)            
+
+# ===========================================================================
+#    returns a dict with the objects of objectList that have each id
+# ===========================================================================
+def indexObjectsById(objectList):
+    objectsById={}
+    for obj in objectList:
+        objectsById.setdefault(obj.id, []).append(obj)
+    return objectsById
 
 # ===========================================================================
 #                creates the object interruptions
@@ -397,7 +421,8 @@ def createWIP():
     G.CapacityProjectList=[]
     # entities that just finished processing in a station 
     # and have to enter the next machine 
-    G.pendingEntities=[]
+    G.pendingEntities=PendingEntities()
+    G.changedQueues=[]
     #Read the json data
     json_data = G.JSONData
     # read from the dictionary the dicts with key 'BOM' (if there are any)
@@ -537,10 +562,9 @@ def createWIP():
                 odAssigned=False
                 for element in route:
                     elementIds = element.get('stationIdsList',[])
-                    for obj in G.ObjList:
-                        for elementId in elementIds:
-                            if obj.id==elementId and obj.type=='OrderDecomposition':
-                                odAssigned=True 
+                    for obj in Globals.objectRegistry.findObjectsByIds(elementIds):
+                        if obj.type=='OrderDecomposition':
+                            odAssigned=True 
                 if not odAssigned:
                     odId=None
                     for obj in G.ObjList:
@@ -575,19 +599,17 @@ def createWIP():
 #    defines the topology (predecessors and successors for all the objects)
 # ===========================================================================
 def setTopology():
+    objectsById=indexObjectsById(G.ObjList)
+    # returns the objects that have the given ids
+    def getObjects(ids):
+        objects=[]
+        for id in ids:
+            objects.extend(objectsById.get(id, []))
+        return objects
     #loop through all the objects  
     for element in G.ObjList:
-        next=[]
-        previous=[]
-        for j in range(len(element.previousIds)):
-            for q in range(len(G.ObjList)):
-                if G.ObjList[q].id==element.previousIds[j]:
-                    previous.append(G.ObjList[q])
-                    
-        for j in range(len(element.nextIds)):
-            for q in range(len(G.ObjList)):
-                if G.ObjList[q].id==element.nextIds[j]:
-                    next.append(G.ObjList[q])      
+        next=getObjects(element.nextIds)
+        previous=getObjects(element.previousIds)
                              
         if element.type=="Source":
             element.defineRouting(next)
@@ -596,16 +618,8 @@ def setTopology():
         #Dismantle should be changed to identify what the the successor is.
         #nextPart and nextFrame will become problematic    
         elif element.type=="Dismantle":
-            nextPart=[]
-            nextFrame=[]
-            for j in range(len(element.nextPartIds)):
-                for q in range(len(G.ObjList)):
-                    if G.ObjList[q].id==element.nextPartIds[j]:
-                        nextPart.append(G.ObjList[q])
-            for j in range(len(element.nextFrameIds)):
-                for q in range(len(G.ObjList)):
-                    if G.ObjList[q].id==element.nextFrameIds[j]:
-                        nextFrame.append(G.ObjList[q])
+            nextPart=getObjects(element.nextPartIds)
+            nextFrame=getObjects(element.nextFrameIds)
             element.defineRouting(previous, next)            
             element.definePartFrameRouting(nextPart, nextFrame)
         else:
@@ -628,61 +642,54 @@ def activateObjects():
         G.env.process(element.run())                                             
 
 # ===========================================================================
-#                        the main script that is ran
+#            reads the input and creates the objects of the model
 # ===========================================================================
-def main(argv=[], input_data=None):
-    argv = argv or sys.argv[1:]
-
+def buildModel():
     #create an empty list to store all the objects in   
     G.ObjList=[]
     G.RouterList=[]
-
-    if input_data is None:
-      # user passes the topology filename as first argument to the program
-      filename = argv[0]
-      try:                                          # try to open the file with the inputs
-          G.JSONFile=open(filename, "r")            # global variable holding the file to be opened
-      except IOError:                               
-          print "%s could not be open" % filename
-          return "ERROR"
-      G.InputData=G.JSONFile.read()                 # pass the contents of the input file to the global var InputData
-    else:
-      G.InputData = input_data
-    start=time.time()                               # start counting execution time 
-
-    #read the input from the JSON file and create the line
-    G.JSONData=json.loads(G.InputData)              # create the dictionary JSONData
+    G.replicationIndex=None
+    G.rngStreamCounts={}
     readGeneralInput()
     createObjectResourcesAndCoreObjects()
     createObjectInterruptions()
     setTopology()
 
-    #run the experiment (replications)          
-    for i in xrange(G.numberOfReplications):
-        G.env=simpy.Environment()                       # initialize the environment
-        G.maxSimTime=float(G.JSONData['general'].get('maxSimTime', '100'))     # read the maxSimTime in each replication 
-                                                                               # since it may be changed for infinite ones
-        if G.RouterList:
-            G.RouterList[0].isActivated=False
-            G.RouterList[0].isInitialized=False
-        
-        if G.seed:
-            G.Rnd=Random('%s%s' % (G.seed, i))
-            G.numpyRnd.random.seed(G.seed+i)
-        else:
-            G.Rnd=Random()
-            G.numpyRnd.random.seed()
+# ===========================================================================
+#        runs the replication with the given index on the built model
+#          returns the encoded trace if the trace is requested
+# ===========================================================================
+def runReplication(i):
+    encodedTrace=None
+    G.env=simpy.Environment()                       # initialize the environment
+    G.replicationIndex=i
+    G.maxSimTime=float(G.JSONData['general'].get('maxSimTime', '100'))     # read the maxSimTime in each replication 
+                                                                           # since it may be changed for infinite ones
+    if G.RouterList:
+        G.RouterList[0].isActivated=False
+        G.RouterList[0].isInitialized=False
+    
+    if G.seed:
+        G.Rnd=Random('%s%s' % (G.seed, i))
+        G.numpyRnd.random.seed(G.seed+i)
+    else:
+        G.Rnd=Random()
+        G.numpyRnd.random.seed()
+    # stream the trace to a file if it is not kept in the excel workbook
+    if G.trace=="Yes" and not G.traceFormat=='xls':
+        G.traceSink=TraceSink.createTraceSink(G.traceFormat, 'trace'+str(i), G.traceDirectory)
+    try:
         createWIP()
         initializeObjects()
         Globals.setWIP(G.EntityList)        
         activateObjects()
-        
+    
         # if the simulation is ran until no more events are scheduled, 
         # then we have to find the end time as the time the last entity ended.
         if G.maxSimTime==-1:
             # If someone does it for a model that has always events, then it will run forever!
             G.env.run(until=float('inf'))
-                                         
+                                     
             # identify from the exits what is the time that the last entity has ended. 
             endList=[]
             for exit in G.ExitList:
@@ -697,22 +704,117 @@ def main(argv=[], input_data=None):
         #else we simulate until the given maxSimTime
         else:
             G.env.run(until=G.maxSimTime)
-        
+    
         #carry on the post processing operations for every object in the topology       
         for element in G.ObjList+G.ObjectResourceList+G.RouterList:
             element.postProcessing()
-                       
+                   
         # added for debugging, print the Route of the Jobs on the same G.traceFile
         PrintRoute.outputRoute()
-            
+        
+        # close the streamed trace and return its file encoded, the file is removed
+        if G.traceSink:
+            G.traceSink.close()
+            encodedTrace=TraceSink.encodeTraceFile(G.traceSink.path)
+            G.traceSink=None
         #output trace to excel      
-        if(G.trace=="Yes"):
+        elif(G.trace=="Yes"):
             ExcelHandler.outputTrace('trace'+str(i))  
             import StringIO
             traceStringIO = StringIO.StringIO()
             G.traceFile.save(traceStringIO)
             encodedTrace=traceStringIO.getvalue().encode('base64')
             ExcelHandler.resetTrace()
+    finally:
+        # a replication that failed does not leave its trace to the next run 
+        # of the process (e.g. a worker of the platform runs many models)
+        if G.traceSink:
+            if not G.traceSink.file.closed:
+                G.traceSink.file.close()
+            if os.path.exists(G.traceSink.path):
+                os.remove(G.traceSink.path)
+            G.traceSink=None
+        elif G.trace=="Yes" and G.traceIndex:
+            ExcelHandler.resetTrace()
+    return encodedTrace
+
+# ===========================================================================
+#                        the main script that is ran
+# ===========================================================================
+def main(argv=[], input_data=None):
+    argv = argv or sys.argv[1:]
+
+    if input_data is None:
+      # user passes the topology filename as first argument to the program
+      filename = argv[0]
+      try:                                          # try to open the file with the inputs
+          G.JSONFile=open(filename, "r")            # global variable holding the file to be opened
+      except IOError:                               
+          print "%s could not be open" % filename
+          return "ERROR"
+      G.InputData=G.JSONFile.read()                 # pass the contents of the input file to the global var InputData
+    else:
+      G.InputData = input_data
+
+    #read the input from the JSON file and create the line
+    G.JSONData=json.loads(G.InputData)              # create the dictionary JSONData
+    simulate()
+        
+    if not input_data:
+      # Output on stdout
+      print json.dumps(G.outputJSON, indent=True)
+      # XXX I am not sure we still need this case
+      return
+
+    # XXX result_list is not needed here, we could replace result by result_list
+    G.JSONData['result'] = {'result_list': [G.outputJSON]}
+    #logger.info("execution time="+str(time.time()-start))
+
+    return json.dumps(G.JSONData, indent=True)
+
+# ===========================================================================
+#    runs the model given as a dict and returns the dict with the results 
+#    as main does with json strings, but without the indented dumps and
+#    loads of the results. The given dict is not modified, the model is built
+#    from a copy of it, made by a compact json round trip since the model 
+#    reading relies on its conversions (e.g. tuples of the plugins to lists). 
+#    The results are copied too, since some of them are lists of the 
+#    objects that are still changed by the next runs
+# ===========================================================================
+def runModel(data):
+    G.InputData=None
+    G.JSONData=json.loads(json.dumps(data))
+    simulate(data)
+    G.JSONData['result'] = {'result_list': [copyData(G.outputJSON)]}
+    return G.JSONData
+
+# ===========================================================================
+#    returns a copy of the results. Marshal copies the plain data much 
+#    faster than deepcopy, the data that it does not support is deep copied
+# ===========================================================================
+def copyData(data):
+    try:
+        return marshal.loads(marshal.dumps(data))
+    except ValueError:
+        return deepcopy(data)
+
+# ===========================================================================
+#    builds the model of G.JSONData, runs the replications and outputs
+#    the results to G.outputJSON. The input data is the one the model was 
+#    read from, needed if the replications are spread over processes
+# ===========================================================================
+def simulate(inputData=None):
+    start=time.time()                               # start counting execution time 
+    buildModel()
+
+    #run the experiment (replications)          
+    if ReplicationExecutor.canRunInParallel():
+        encodedTrace=ReplicationExecutor.runReplications(G.InputData or json.dumps(inputData))
+        Globals.reportProgress(replication=G.numberOfReplications-1, numberOfReplications=G.numberOfReplications)
+    else:
+        for i in xrange(G.numberOfReplications):
+            encodedTrace=runReplication(G.firstReplication+i)
+            Globals.reportProgress(replication=i, numberOfReplications=G.numberOfReplications)
     
     G.outputJSON['_class'] = 'Dream.Simulation';
     G.outputJSON['general'] ={};
@@ -732,24 +834,11 @@ def main(argv=[], input_data=None):
                 'id': 'TraceFile',
                 'results': {'trace':encodedTrace}
             }
+        # a streamed trace is given as its encoded file, to be converted to excel only if requested
+        if not G.traceFormat=='xls':
+            jsonTRACE['results']={'trace_data':encodedTrace,
+                                  'trace_format':G.traceFormat}
         G.outputJSON['elementList'].append(jsonTRACE)
-        
-        
-    outputJSONString=json.dumps(G.outputJSON, indent=True)
-    if 0:
-      G.outputJSONFile=open('outputJSON.json', mode='w')
-      G.outputJSONFile.write(outputJSONString)
-    if not input_data:
-      # Output on stdout
-      print outputJSONString
-      # XXX I am not sure we still need this case
-      return
-
-    # XXX result_list is not needed here, we could replace result by result_list
-    G.JSONData['result'] = {'result_list': [G.outputJSON]}
-    #logger.info("execution time="+str(time.time()-start))
-
-    return json.dumps(G.JSONData, indent=True)
 
 
 if __name__ == '__main__':
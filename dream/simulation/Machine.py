@@ -266,15 +266,21 @@ class Machine(CoreObject):
             from Globals import G
             # if there is no router
             if not G.RouterList:
-                # TODO if the dedicatedOperator flag is raised then create a SkilledRouter (temp)
-                if self.dedicatedOperator:
-                    self.router=SkilledRouter()
-                else:
-                    self.router=Router()
+                self.router=self.getRouterClass()()
                 G.RouterList[0]=self.router
             # otherwise set the already existing router as the machines Router
             else:
                 self.router=G.RouterList[0]
+    
+    #===========================================================================
+    # the class of the router created for the operated machines
+    #===========================================================================
+    def getRouterClass(self):
+        # TODO if the dedicatedOperator flag is raised then create a SkilledRouter (temp)
+        if self.dedicatedOperator:
+            return SkilledRouter
+        return Router
+    
     #===========================================================================
     # initialise broker if needed
     #===========================================================================
@@ -237,6 +237,7 @@ class MachineJobShop(Machine):
         assert callerObject!=None, 'the caller of readLoadTime cannot be None'
         thecaller=callerObject
         thecaller.sortEntities()
+        thecaller.markQueueChanged()
         activeEntity=thecaller.Res.users[0]
         # read the load time from the corresponding remainingRoute entry
         loadTime=activeEntity.remainingRoute[0].get('loadTime',{})
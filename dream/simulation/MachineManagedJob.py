@@ -67,11 +67,17 @@ class MachineManagedJob(MachineJobShop):
         #create a Router
         from Globals import G
         if not G.RouterList:
-            self.router=RouterManaged()
+            self.router=self.getRouterClass()()
             G.RouterList[0]=self.router          
         # otherwise set the already existing router as the machines Router
         else:
             self.router=G.RouterList[0]
+    
+    #===========================================================================
+    # the class of the router created for the operated machines
+    #===========================================================================
+    def getRouterClass(self):
+        return RouterManaged
             
     #===========================================================================
     # initialize broker if needed
@@ -100,35 +100,48 @@ class ManPyObject(object):
         # flag used to inform if the operators assigned to the station are skilled (skillsList)
         return any(operator.skillsList for operator in G.OperatorsList)
     
+    #===========================================================================
+    # prints the phrase to the console if the user has selected to. 
+    # It is rebound at model build time by setConsoleTrace, so that it costs
+    # an empty call when console output is disabled
+    #===========================================================================
     @staticmethod
     def printTrace(entity='', **kw):
+        from Globals import G
+        if(G.console=='Yes'):
+            ManPyObject.printConsoleTrace(entity, **kw)
+
+    #===========================================================================
+    # prints the phrase to the console
+    #===========================================================================
+    @staticmethod
+    def printConsoleTrace(entity='', **kw):
         assert len(kw)==1, 'only one phrase per printTrace supported for the moment'
         from Globals import G
         import Globals
         time=G.env.now
         charLimit=60
         remainingChar=charLimit-len(entity)-len(str(time))
-        if(G.console=='Yes'):
-            print time,entity,
-            for key in kw:
-                if key not in Globals.getSupportedPrintKwrds():
-                    raise ValueError("Unsupported phrase %s for %s" % (key, entity))
-                element=Globals.getPhrase()[key]
-                phrase=element['phrase']
-                prefix=element.get('prefix',None)
-                suffix=element.get('suffix',None)
-                arg=kw[key]
-                if prefix:
-                    print prefix*remainingChar,phrase,arg
-                elif suffix:
-                    remainingChar-=len(phrase)+len(arg)
-                    suffix*=remainingChar
-                    if key=='enter':
-                        suffix=suffix+'>'
-                    print phrase,arg,suffix
-                else:
-                    print phrase,arg
-                    
+        print time,entity,
+        for key in kw:
+            if key not in Globals.getSupportedPrintKwrds():
+                raise ValueError("Unsupported phrase %s for %s" % (key, entity))
+            element=Globals.getPhrase()[key]
+            phrase=element['phrase']
+            prefix=element.get('prefix',None)
+            suffix=element.get('suffix',None)
+            arg=kw[key]
+            if prefix:
+                print prefix*remainingChar,phrase,arg
+            elif suffix:
+                remainingChar-=len(phrase)+len(arg)
+                suffix*=remainingChar
+                if key=='enter':
+                    suffix=suffix+'>'
+                print phrase,arg,suffix
+            else:
+                print phrase,arg
+                
     # =======================================================================
     # outputs message to the trace.xls 
     # outputs message to the trace.xls. Format is (Simulation Time | Entity or Frame Name | message)
@@ -137,6 +150,10 @@ class ManPyObject(object):
     def outputTrace(entityName, message):
         from Globals import G
         if(G.trace=="Yes"):         #output only if the user has selected to
+            # if the trace is streamed write the row to the sink
+            if G.traceSink:
+                G.traceSink.write(str(G.env.now), entityName, message)
+                return
             #handle the 3 columns
             G.traceSheet.write(G.traceIndex,0,str(G.env.now))
             G.traceSheet.write(G.traceIndex,1,entityName)
@@ -161,8 +178,9 @@ class ManPyObject(object):
         # send the signal
         signal.succeed(succeedTuple)
         # reset the expected signals of the receiver to 0
-        for key, value in receiver.expectedSignals.iteritems():
-            receiver.expectedSignals[key]=0
+        expectedSignals=receiver.expectedSignals
+        for key in expectedSignals:
+            expectedSignals[key]=0
           
     #===========================================================================
     # actions to be performed after the end of the simulation
@@ -205,3 +223,23 @@ class ManPyObject(object):
             if len(object.getActiveObjectQueue()):
                 return False
         return True
+
+# ===========================================================================
+# the trace used when console output is disabled, it does nothing
+# ===========================================================================
+def noTrace(*args, **kw):
+    pass
+
+# ===========================================================================
+# binds the printTrace of the ManPy objects according to the console flag.
+# When console output is disabled printTrace does nothing at all,
+# otherwise it prints without checking the flag again
+# ===========================================================================
+def setConsoleTrace(console):
+    from ObjectInterruption import ObjectInterruption
+    if console:
+        ManPyObject.printTrace=staticmethod(ManPyObject.printConsoleTrace)
+        ObjectInterruption.printTrace=ObjectInterruption.printConsoleTrace.im_func
+    else:
+        ManPyObject.printTrace=staticmethod(noTrace)
+        ObjectInterruption.printTrace=staticmethod(noTrace)
@@ -152,7 +152,17 @@ class ObjectInterruption(ManPyObject):
     # prints message to the console
     #===========================================================================
     #print message in the console. Format is (Simulation Time | Entity or Frame Name | message)
+    #it is rebound at model build time by setConsoleTrace (see ManPyObject)
     def printTrace(self, entityName, message):
         from Globals import G
         if(G.console=="Yes"):         #output only if the user has selected to
-            print self.env.now, entityName, message
\ No newline at end of file
+            self.printConsoleTrace(entityName, message)
+    
+    #===========================================================================
+    # prints message to the console. The message can be given as a callable
+    # so that it is formatted only when it is printed
+    #===========================================================================
+    def printConsoleTrace(self, entityName, message):
+        if callable(message):
+            message=message()
+        print self.env.now, entityName, message
\ No newline at end of file
@@ -204,54 +204,37 @@ class Operator(ObjectResource):
         elif criterion=="RPC":
             
             for entity in activeObjectQ:
-                RPT=0
-                for step in entity.remainingRoute:
-                    processingTime=step.get('processingTime',{})
-                    if processingTime:
-                        RPT+=float(processingTime.get('Fixed',{}).get('mean',0))           
-                entity.totalRemainingProcessingTime=RPT
+                entity.totalRemainingProcessingTime=entity.getRemainingProcessingTime()
             activeObjectQ.sort(key=lambda x: x.totalRemainingProcessingTime, reverse=True)     
         #if the schedulingRule is to sort Entities according to longest processing time first in the next station
         elif criterion=="LPT":
             for entity in activeObjectQ:
-                processingTime = entity.remainingRoute[0].get('processingTime',{})
-                entity.processingTimeInNextStation=float(processingTime.get('Fixed',{}).get('mean',0))
-                if processingTime:
-                    entity.processingTimeInNextStation=float(processingTime.get('Fixed',{}).get('mean',0))
-                else:
-                    entity.processingTimeInNextStation=0
+                entity.processingTimeInNextStation=entity.getProcessingTimeInNextStep()
             activeObjectQ.sort(key=lambda x: x.processingTimeInNextStation, reverse=True)             
         #if the schedulingRule is to sort Entities according to shortest processing time first in the next station
         elif criterion=="SPT":
             
             for entity in activeObjectQ:
-                processingTime = entity.remainingRoute[0].get('processingTime',{})
-                if processingTime:
-                    entity.processingTimeInNextStation=float(processingTime.get('Fixed',{}).get('mean',0))
-                else:
-                    entity.processingTimeInNextStation=0
+                entity.processingTimeInNextStation=entity.getProcessingTimeInNextStep()
             activeObjectQ.sort(key=lambda x: x.processingTimeInNextStation) 
         #if the schedulingRule is to sort Entities based on the minimum slackness
         elif criterion=="MS":
             
             for entity in activeObjectQ:
-                RPT=0
-                for step in entity.remainingRoute:
-                    processingTime=step.get('processingTime',{})
-                    if processingTime:
-                        RPT+=float(processingTime.get('Fixed',{}).get('mean',0))              
-                entity.totalRemainingProcessingTime=RPT
+                entity.totalRemainingProcessingTime=entity.getRemainingProcessingTime()
             activeObjectQ.sort(key=lambda x: (x.dueDate-x.totalRemainingProcessingTime))  
         #if the schedulingRule is to sort Entities based on the length of the following Queue
         elif criterion=="WINQ":
-            from Globals import G
+            from Globals import objectRegistry
             for entity in activeObjectQ:
                 if len(entity.remainingRoute)>1:
                     nextObjIds=entity.remainingRoute[1].get('stationIdsList',[])
-                    for obj in G.ObjList:
-                        if obj.id in nextObjIds:
-                            nextObject=obj
-                    entity.nextQueueLength=len(nextObject.getActiveObjectQueue())
+                    # the last of the next objects in the order of G.ObjList
+                    nextObjects=objectRegistry.findObjectsByIds(nextObjIds)
+                    if nextObjects:
+                        entity.nextQueueLength=len(nextObjects[-1].getActiveObjectQueue())
+                    else:
+                        entity.nextQueueLength = 0
                 else:
                     entity.nextQueueLength = 0
             activeObjectQ.sort(key=lambda x: x.nextQueueLength)
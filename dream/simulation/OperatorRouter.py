@@ -26,6 +26,7 @@ Created on 19 Feb 2013
 Models an Interruption that schedules the operation of the machines by different managers
 '''
 import simpy
+import time
 
 from ObjectInterruption import ObjectInterruption
 
@@ -39,7 +40,7 @@ class Router(ObjectInterruption):
     #     The Broker is initiated within the Machine and considered as 
     #                black box for the ManPy end Developer
     # ======================================================================= 
-    def __init__(self,id='Router01',name='Router01',**kw):
+    def __init__(self,id='Router01',name='Router01',outputStatistics=False,**kw):
         ObjectInterruption.__init__(self)
         self.type = "Router"
         self.isInitialized=False
@@ -54,6 +55,12 @@ class Router(ObjectInterruption):
         self.pending=[]                              # list of entities that require operators now
         self.id=id
         self.name=name
+        # flag to output the number of invocations and the time spent in every phase of the allocation
+        self.outputStatistics=outputStatistics
+        # lists to hold the statistics of multiple runs
+        self.Invocations=[]
+        self.SkippedSorts=[]
+        self.PhaseTime=[]
         from Globals import G
         G.RouterList.append(self)
         
@@ -76,6 +83,12 @@ class Router(ObjectInterruption):
         self.toBeSignalled=[]
         self.criticalQueues=[]
         self.pending=[]                              # list of entities that require operators now
+        # the objects whose queues are sorted in every invocation, found in the first one
+        self.dynamicSortingObjects=None
+        # statistics of the allocation
+        self.invocations=0
+        self.skippedSorts=0
+        self.phaseTime=dict.fromkeys(self.allocationPhases, 0)
         
     # =======================================================================
     #                          the run method
@@ -121,16 +134,22 @@ class Router(ObjectInterruption):
     
     #===========================================================================
     # routing performed to define the candidate operators the pending entities and how the operators should be allocated
+    # the phases are: find the pending objects, find the operators that can start working now, 
+    # sort the operators according to their idle time and find working stations for the candidate operators
     #===========================================================================
+    allocationPhases=('findPending', 'findCandidateOperators', 'sortOperators', 'findStationsForOperators')
     def allocateOperators(self):
-        # find the pending objects
-        self.findPending()
-        # find the operators that can start working now 
-        self.findCandidateOperators()
-        # sort the operators according to their idle time
-        self.sortOperators()
-        # find working stations for the candidate operators
-        self.findStationsForOperators()
+        self.invocations+=1
+        if not self.outputStatistics:
+            self.findPending()
+            self.findCandidateOperators()
+            self.sortOperators()
+            self.findStationsForOperators()
+            return
+        for phase in self.allocationPhases:
+            start=time.time()
+            getattr(self, phase)()
+            self.phaseTime[phase]+=time.time()-start
     
     #===========================================================================
     # unassigns exits of queues that are not to be signalled 
@@ -172,7 +191,7 @@ class Router(ObjectInterruption):
                         operator.assignTo(operator.candidateStation)
                     if not operator.candidateStation in self.toBeSignalled:
                         self.toBeSignalled.append(operator.candidateStation)
-        self.printTrace('objects to be signaled:'+' '*11, [str(object.id) for object in self.toBeSignalled])
+        self.printTrace('objects to be signaled:'+' '*11, lambda: [str(object.id) for object in self.toBeSignalled])
     
     #===========================================================================
     # entry actions 
@@ -247,18 +266,16 @@ class Router(ObjectInterruption):
     def findPending(self):
         from Globals import G
         # first sort the queues according to their sorting rule
-        for object in G.ObjList:
-            object.sortEntities()
-            object.getActiveObjectQueue().sort(key=lambda x:x.isCritical, reverse=True)
+        self.sortQueues()
         # search among the pendingEntities
-        for entity in G.pendingEntities:
+        for entity in self.getPendingCandidates():
             # if the entity resides in a machine that waits for load operation
             if entity.currentStation in G.MachineList:
                 if entity.currentStation.broker.waitForOperator and entity.currentStation.checkIfActive():
                     self.pendingMachines.append(entity.currentStation)
                     self.pending.append(entity)
             # otherwise proceed only if the entity is at the head of the "queue" it resides
-            if entity.currentStation.getActiveObjectQueue().index(entity)==0:
+            if entity.currentStation.getActiveObjectQueue()[0] is entity:
                 # check the next stations
                 for machine in entity.currentStation.next:
                     if machine in G.MachineList and entity.checkIfRequiredPartsReady() and entity.currentStation.haveToDispose():
@@ -281,9 +298,51 @@ class Router(ObjectInterruption):
 #                         break
         # figure out which queues are holding critical pending entities 
         self.findCriticalQueues()
-        self.printTrace('pendingMachines'+'-'*19+'>', [str(object.id) for object in self.pendingMachines])
-        self.printTrace('pendingQueues'+'-'*21+'>', [str(object.id) for object in self.pendingQueues])
-        self.printTrace('found pending entities'+'-'*12+'>', [str(entity.id) for entity in self.pending if not entity.type=='Part'])
+        self.printTrace('pendingMachines'+'-'*19+'>', lambda: [str(object.id) for object in self.pendingMachines])
+        self.printTrace('pendingQueues'+'-'*21+'>', lambda: [str(object.id) for object in self.pendingQueues])
+        self.printTrace('found pending entities'+'-'*12+'>', lambda: [str(entity.id) for entity in self.pending if not entity.type=='Part'])
+    
+    #===========================================================================
+    # sorts the queues of the objects according to their sorting rule, the critical entities first. 
+    # All the queues are sorted in the first invocation. After that, the queues whose order depends 
+    # only on their entities (hasStaticSorting) are sorted only if they changed since (G.changedQueues)
+    #===========================================================================
+    def sortQueues(self):
+        from Globals import G
+        if self.dynamicSortingObjects is None:
+            self.dynamicSortingObjects=[object for object in G.ObjList if not object.hasStaticSorting()]
+            objectsToSort=G.ObjList
+        else:
+            objectsToSort=self.dynamicSortingObjects+[object for object in G.changedQueues if object.hasStaticSorting()]
+        for object in objectsToSort:
+            activeObjectQueue=object.getActiveObjectQueue()
+            object.sortEntities()
+            activeObjectQueue.sort(key=lambda x:x.isCritical, reverse=True)
+        # the queues are sorted, they are marked as changed again only by the objects
+        for object in G.changedQueues:
+            object.queueChanged=False
+        del G.changedQueues[:]
+        self.skippedSorts+=len(G.ObjList)-len(objectsToSort)
+    
+    #===========================================================================
+    # returns the pending entities that may be found pending, in the order they 
+    # were added: the ones in machines and the ones at the head of the other stations.
+    # The other entities wait behind them and are not looked at
+    #===========================================================================
+    def getPendingCandidates(self):
+        from Globals import G
+        pendingEntities=G.pendingEntities
+        machines=set(G.MachineList)
+        candidates=[]
+        for station in pendingEntities.getStations():
+            if station in machines:
+                candidates.extend(pendingEntities.atStation(station))
+            else:
+                activeObjectQueue=station.getActiveObjectQueue()
+                if activeObjectQueue and pendingEntities.isAtStation(activeObjectQueue[0], station):
+                    candidates.append(activeObjectQueue[0])
+        candidates.sort(key=pendingEntities.position)
+        return candidates
     
     #===========================================================================
     # find the pending queues that hold critical pending entities 
@@ -335,7 +394,7 @@ class Router(ObjectInterruption):
         # if there are candidate operators
         if self.candidateOperators:
             self.printTrace('router found candidate operators'+' '*3,
-                            [(operator.id, [station.id for station in operator.candidateStations]) for operator in self.candidateOperators])
+                            lambda: [(operator.id, [station.id for station in operator.candidateStations]) for operator in self.candidateOperators])
         else:    
             self.printTrace('router', 'found NO candidate operators')
             
@@ -366,6 +425,9 @@ class Router(ObjectInterruption):
     # Sort candidateOperators
     # sort the operators according to their idle time
     #=======================================================================
+    # the last record of the schedule of an operator is kept from the previous replication, 
+    # so the sorting of the operators depends on it (see ReplicationExecutor.canRunInParallel)
+    dependsOnPreviousReplication=True
     def sortOperators(self):
         if self.candidateOperators:
             # calculate the time the operators have been waiting
@@ -478,3 +540,26 @@ class Router(ObjectInterruption):
                                 break
                     occupiedStations.append(operator.candidateStation)
                     occupiedEntities.append(operator.candidateEntity)
+    
+    #===========================================================================
+    # actions to be performed after the end of the simulation
+    #===========================================================================
+    def postProcessing(self):
+        # hold the statistics of each replication
+        self.Invocations.append(self.invocations)
+        self.SkippedSorts.append(self.skippedSorts)
+        self.PhaseTime.append(dict(self.phaseTime))
+    
+    # =======================================================================
+    #                       outputs results to JSON File
+    # =======================================================================
+    def outputResultsJSON(self):
+        if self.outputStatistics:
+            from Globals import G
+            json = {'_class': 'Dream.%s' % self.__class__.__name__,
+                    'id': self.id,
+                    'results': {}}
+            json['results']['invocations'] = self.Invocations
+            json['results']['skipped_sorts'] = self.SkippedSorts
+            json['results']['phase_time'] = self.PhaseTime
+            G.outputJSON['elementList'].append(json)
@@ -117,6 +117,8 @@ class RouterManaged(Router):
     #===========================================================================
     # routine to allocate the operators to the stations
     #===========================================================================
+    # the operators are not sorted by their schedule (Router.sortOperators)
+    dependsOnPreviousReplication=False
     def allocateOperators(self):
         # find the pending objects
         self.findPendingObjects()
@@ -176,7 +178,7 @@ class RouterManaged(Router):
                         operator.assignTo(operator.candidateEntity.candidateReceiver)
                         if not operator.candidateEntity.currentStation in self.toBeSignalled:
                             self.toBeSignalled.append(operator.candidateEntity.currentStation)
-        self.printTrace('objects to be signalled:'+' '*11, [str(object.id) for object in self.toBeSignalled])
+        self.printTrace('objects to be signalled:'+' '*11, lambda: [str(object.id) for object in self.toBeSignalled])
     
     #===========================================================================
     # signal stations that wait for load operators
@@ -220,9 +222,9 @@ class RouterManaged(Router):
                         self.pendingObjects.append(entity.currentStation)
                         break
         self.pendingObjects=self.pendingQueues+self.pendingMachines
-        self.printTrace('router found pending objects'+'-'*6+'>', [str(object.id) for object in self.pendingObjects])
-        self.printTrace('pendingMachines'+'-'*19+'>', [str(object.id) for object in self.pendingMachines])
-        self.printTrace('pendingQueues'+'-'*21+'>', [str(object.id) for object in self.pendingQueues])
+        self.printTrace('router found pending objects'+'-'*6+'>', lambda: [str(object.id) for object in self.pendingObjects])
+        self.printTrace('pendingMachines'+'-'*19+'>', lambda: [str(object.id) for object in self.pendingMachines])
+        self.printTrace('pendingQueues'+'-'*21+'>', lambda: [str(object.id) for object in self.pendingQueues])
     
     #===========================================================================
     # finding the entities that require manager now
@@ -238,7 +240,7 @@ class RouterManaged(Router):
                     if any(type=='Load' for type in machine.multOperationTypeList):
                         self.pending.append(entity)
                         break
-        self.printTrace('found pending entities'+'-'*12+'>', [str(entity.id) for entity in self.pending if not entity.type=='Part'])
+        self.printTrace('found pending entities'+'-'*12+'>', lambda: [str(entity.id) for entity in self.pending if not entity.type=='Part'])
         
     #========================================================================
     # Find candidate Operators
@@ -263,7 +265,7 @@ class RouterManaged(Router):
             # find the candidateEntities for each operator
             self.findCandidateEntities()
         self.printTrace('router found candidate operators'+' '*3,
-                        [(operator.id, [station.id for station in operator.candidateStations]) for operator in self.candidateOperators])
+                        lambda: [(operator.id, [station.id for station in operator.candidateStations]) for operator in self.candidateOperators])
     
     #===========================================================================
     # find the candidate entities for each candidateOperator
@@ -339,7 +341,7 @@ class RouterManaged(Router):
                     if conflictingGroup.index(operator)!=0:
                         self.candidateOperators.remove(operator)
             
-        self.printTrace('candidateReceivers for each entity ',[(str(entity.id),\
+        self.printTrace('candidateReceivers for each entity ',lambda: [(str(entity.id),\
                                                                             str(entity.candidateReceiver.id))
                                                                             for entity in self.pending if entity.candidateReceiver])
         
\ No newline at end of file
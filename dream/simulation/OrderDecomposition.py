@@ -191,6 +191,7 @@ class OrderDecomposition(CoreObject):
             if entity.type=='OrderDesign':
                 self.orderToBeDecomposed=entity.order
                 activeObjectQueue.remove(entity)            #remove the order from the internal Queue
+                self.markQueueChanged()
                 entity.currentStation=None                  # reset the currentStation of the entity
                 self.printTrace(entity.id, destroy=self.id)
                 # if the entity is in G.pendingEntities list remove it from there
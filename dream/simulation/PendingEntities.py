@@ -0,0 +1,135 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 17 Oct 2026
+
+'''
+'''
+the entities that finished processing in a station and have to enter the next one (G.pendingEntities).
+They are kept in the order they were added with an index of their positions, so adding, removing and 
+looking up an entity take constant time, and they are grouped by the station they are at. An entity 
+that is pending tells the groups when its currentStation changes
+'''
+
+from collections import OrderedDict
+from itertools import count
+
+# ===========================================================================
+# the insertion ordered set of the pending entities
+# ===========================================================================
+class PendingEntities(object):
+    def __init__(self, entities=()):
+        self.positions=OrderedDict()    # for every pending entity, the number of the addition that added it, in the order they were added
+        self.stations={}                # for every station, the pending entities at the station and their positions
+        self.counter=count()
+        for entity in entities:
+            self.append(entity)
+    
+    def __contains__(self, entity):
+        return entity in self.positions
+    
+    def __len__(self):
+        return len(self.positions)
+    
+    def __nonzero__(self):
+        return bool(self.positions)
+    
+    # the entities may be removed while they are iterated, as from a list that is iterated on a copy
+    def __iter__(self):
+        return iter(list(self.positions))
+    
+    def __repr__(self):
+        return 'PendingEntities(%r)' % list(self.positions)
+    
+    # =======================================================================
+    # adds the entity at the end, an entity that is already pending keeps its position
+    # =======================================================================
+    def append(self, entity):
+        if entity in self.positions:
+            return
+        position=next(self.counter)
+        self.positions[entity]=position
+        self.stations.setdefault(entity.currentStation, {})[entity]=position
+        entity.pendingEntities=self
+    
+    def extend(self, entities):
+        for entity in entities:
+            self.append(entity)
+    
+    # =======================================================================
+    # removes the entity, raises ValueError if it is not pending as list.remove does
+    # =======================================================================
+    def remove(self, entity):
+        if not entity in self.positions:
+            raise ValueError('%r is not pending' % entity)
+        self.discard(entity)
+    
+    def discard(self, entity):
+        if self.positions.pop(entity, None) is None:
+            return
+        self.removeFromStation(entity, entity.currentStation)
+        if entity.__dict__.get('pendingEntities') is self:
+            entity.pendingEntities=None
+    
+    def clear(self):
+        for entity in list(self.positions):
+            self.discard(entity)
+    
+    def removeFromStation(self, entity, station):
+        stationEntities=self.stations.get(station)
+        if stationEntities is not None:
+            stationEntities.pop(entity, None)
+            if not stationEntities:
+                del self.stations[station]
+    
+    # =======================================================================
+    # moves the pending entity from the group of its current station to the one of
+    # the given station, called by the entity when its currentStation is set
+    # =======================================================================
+    def moveEntity(self, entity, station):
+        position=self.positions.get(entity)
+        if position is None:
+            return
+        self.removeFromStation(entity, entity.currentStation)
+        self.stations.setdefault(station, {})[entity]=position
+    
+    # =======================================================================
+    # returns the position of a pending entity, the entities added earlier have lower positions
+    # =======================================================================
+    def position(self, entity):
+        return self.positions[entity]
+    
+    # =======================================================================
+    # returns the pending entities at the station in the order they were added
+    # =======================================================================
+    def atStation(self, station):
+        stationEntities=self.stations.get(station, {})
+        return sorted(stationEntities, key=stationEntities.get)
+    
+    # =======================================================================
+    # checks if the entity is pending at the station
+    # =======================================================================
+    def isAtStation(self, entity, station):
+        return entity in self.stations.get(station, ())
+    
+    # =======================================================================
+    # returns the stations that have pending entities
+    # =======================================================================
+    def getStations(self):
+        return [station for station in self.stations if station is not None]
@@ -1,6 +1,7 @@
 import Globals
 import xlwt
 from Globals import G
+from TraceSink import TraceSinkSheet
 
 import OrderComponent
 import Mould
@@ -56,9 +57,13 @@ def outputRoute():
     
     if G.trace=='Yes':
         if G.JobList:
-            G.routeSheetIndex=G.sheetIndex+1
-            # add one more sheet to the trace file
-            G.routeTraceSheet=G.traceFile.add_sheet('sheet '+str(G.routeSheetIndex)+' route', cell_overwrite_ok=True)
+            # a streamed trace keeps the cells of the route, the sheet is added when the trace is read
+            if G.traceSink:
+                G.routeTraceSheet=TraceSinkSheet(G.traceSink)
+            else:
+                G.routeSheetIndex=G.sheetIndex+1
+                # add one more sheet to the trace file
+                G.routeTraceSheet=G.traceFile.add_sheet('sheet '+str(G.routeSheetIndex)+' route', cell_overwrite_ok=True)
             number_of_machines=len(G.MachineList)
             sortMachines()  # sort the machines according to the priority specified in JOB_SHOP_TECHNOLOGY_SEQ
             # get the events list
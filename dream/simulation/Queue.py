@@ -27,6 +27,7 @@ Models a FIFO queue where entities can wait in order to get into a server
 
 
 import simpy
+from operator import attrgetter
 from CoreObject import CoreObject
 # ===========================================================================
 #                            the Queue object
@@ -237,13 +238,35 @@ class Queue(CoreObject):
     #    sorts the Entities of the Queue according to the scheduling rule
     # =======================================================================
     def sortEntities(self):
-        #if we have sorting according to multiple criteria we have to call the sorter many times
+        #if we have sorting according to multiple criteria we sort once by the keys of all the criteria,
+        #which gives the same order as sorting by each of them starting from the last
         if self.schedulingRule=="MC":
-            for criterion in reversed(self.multipleCriterionList):
-               self.activeQSorter(criterion=criterion) 
+            criteria=[criterion for criterion in self.multipleCriterionList if not criterion=="FIFO"]
+            if not criteria:
+                return
+            #the criteria that sort by an attribute of the Entities are read all together
+            if all(criterion in self.schedulingAttributes for criterion in criteria):
+                self.Res.users.sort(key=attrgetter(*[self.schedulingAttributes[criterion] for criterion in criteria]))
+            else:
+                keys=map(self.getSchedulingKey, criteria)
+                self.Res.users.sort(key=lambda x: tuple([key(x) for key in keys]))
         #else we just use the default scheduling rule
         else:
             self.activeQSorter()
+    
+    # =======================================================================
+    #    checks if the order given by the scheduling rule depends only on the 
+    #    Entities of the Queue and not on the state of other objects (e.g. WINQ)
+    # =======================================================================
+    staticSchedulingRules=('FIFO', 'Priority', 'EDD', 'EOD', 'NumStages', 'RPC', 'LPT', 'SPT', 'MS')
+    def hasStaticSorting(self):
+        if type(self).sortEntities.im_func is not Queue.sortEntities.im_func:
+            return False
+        if self.schedulingRule=="MC":
+            criteria=self.multipleCriterionList
+        else:
+            criteria=[self.schedulingRule]
+        return all(criterion in self.staticSchedulingRules for criterion in criteria)
             
     # =======================================================================
     #    sorts the Entities of the Queue according to the scheduling rule
@@ -251,75 +274,58 @@ class Queue(CoreObject):
     def activeQSorter(self, criterion=None):
         activeObjectQ=self.Res.users
         if criterion==None:
-            criterion=self.schedulingRule           
+            criterion=self.schedulingRule
+        key=self.getSchedulingKey(criterion)
+        #the sort is stable, the Entities with equal keys stay in the order they are
+        if key:
+            activeObjectQ.sort(key=key)
+    
+    # =======================================================================
+    #    returns the function that gives the sorting key of an Entity for the 
+    #    scheduling criterion. The descending orders are given by negative keys
+    # =======================================================================
+    #the scheduling rules based on a pre-defined priority, the earliest due date and the earliest order date
+    schedulingAttributes={"Priority":'priority', "EDD":'dueDate', "EOD":'orderDate'}
+    def getSchedulingKey(self, criterion):
         #if the schedulingRule is first in first out
         if criterion=="FIFO": 
-            pass
-        #if the schedulingRule is based on a pre-defined priority
-        elif criterion=="Priority":
-            activeObjectQ.sort(key=lambda x: x.priority)
-        #if the schedulingRule is earliest due date
-        elif criterion=="EDD":
-            activeObjectQ.sort(key=lambda x: x.dueDate)   
-        #if the schedulingRule is earliest order date
-        elif criterion=="EOD":
-            activeObjectQ.sort(key=lambda x: x.orderDate)      
+            return None
+        #if the schedulingRule sorts by an attribute of the Entities
+        elif criterion in self.schedulingAttributes:
+            return attrgetter(self.schedulingAttributes[criterion])
         #if the schedulingRule is to sort Entities according to the stations they have to visit
         elif criterion=="NumStages":
-            activeObjectQ.sort(key=lambda x: len(x.remainingRoute), reverse=True)  
+            return lambda x: -len(x.remainingRoute)
         #if the schedulingRule is to sort Entities according to the their remaining processing time in the system
         elif criterion=="RPC":
-            for entity in activeObjectQ:
-                RPT=0
-                for step in entity.remainingRoute:
-                    processingTime=step.get('processingTime',None)
-                    if processingTime:
-                        RPT+=float(processingTime.get('Fixed',{}).get('mean',0))               
-                entity.totalRemainingProcessingTime=RPT
-            activeObjectQ.sort(key=lambda x: x.totalRemainingProcessingTime, reverse=True)     
+            return lambda x: -x.getRemainingProcessingTime()
         #if the schedulingRule is to sort Entities according to longest processing time first in the next station
         elif criterion=="LPT":
-            for entity in activeObjectQ:
-                processingTime = entity.remainingRoute[0].get('processingTime',None)
-                if processingTime:
-                    entity.processingTimeInNextStation=float(processingTime.get('Fixed',{}).get('mean',0))
-                else:
-                    entity.processingTimeInNextStation=0
-            activeObjectQ.sort(key=lambda x: x.processingTimeInNextStation, reverse=True)             
+            return lambda x: -x.getProcessingTimeInNextStep()
         #if the schedulingRule is to sort Entities according to shortest processing time first in the next station
         elif criterion=="SPT":
-            for entity in activeObjectQ:
-                processingTime = entity.remainingRoute[0].get('processingTime',None)
-                if processingTime:
-                    entity.processingTimeInNextStation=float(processingTime.get('Fixed',{}).get('mean',0))
-                else:
-                    entity.processingTimeInNextStation=0
-            activeObjectQ.sort(key=lambda x: x.processingTimeInNextStation) 
+            return lambda x: x.getProcessingTimeInNextStep()
         #if the schedulingRule is to sort Entities based on the minimum slackness
         elif criterion=="MS":
-            for entity in activeObjectQ:
-                RPT=0
-                for step in entity.remainingRoute:
-                    processingTime=step.get('processingTime',None)
-                    if processingTime:
-                        RPT+=float(processingTime.get('Fixed',{}).get('mean',0))              
-                entity.totalRemainingProcessingTime=RPT
-            activeObjectQ.sort(key=lambda x: (x.dueDate-x.totalRemainingProcessingTime))  
+            return lambda x: x.dueDate-x.getRemainingProcessingTime()
         #if the schedulingRule is to sort Entities based on the length of the following Queue
         elif criterion=="WINQ":
-            from Globals import G
-            for entity in activeObjectQ:
-                if len(entity.remainingRoute)>1:
-                    nextObjIds=entity.remainingRoute[1].get('stationIdsList',[])
-                    for obj in G.ObjList:
-                        if obj.id in nextObjIds:
-                            nextObject=obj
-                    entity.nextQueueLength=len(nextObject.Res.users) 
-                else:
-                    entity.nextQueueLength=0          
-            activeObjectQ.sort(key=lambda x: x.nextQueueLength)
+            return self.getNextQueueLength
         else:
             assert False, "Unknown scheduling criterion %r" % (criterion, )
+    
+    # =======================================================================
+    #    returns the length of the queue of the station the Entity visits after the next one
+    # =======================================================================
+    def getNextQueueLength(self, entity):
+        if len(entity.remainingRoute)>1:
+            from Globals import objectRegistry
+            nextObjIds=entity.remainingRoute[1].get('stationIdsList',[])
+            # the last of the next objects in the order of G.ObjList
+            nextObjects=objectRegistry.findObjectsByIds(nextObjIds)
+            if nextObjects:
+                return len(nextObjects[-1].Res.users)
+        return 0
 
     def outputResultsJSON(self):
         from Globals import G
@@ -23,10 +23,16 @@ Created on 14 Feb 2013
 '''
 
 '''
-holds methods for generations of numbers from different distributions
+holds methods for generations of numbers from different distributions.
+The sampler of the distribution is resolved once when the generator is created.
+If G.rngBlockSize is set, the numbers are drawn in blocks from a stream of the generator 
+that is seeded by the seed, the replication and the id of the object, so that adding 
+an object to the model does not change the numbers drawn by the others
 '''
 
 import math
+import hashlib
+import numpy
 
 class RandomNumberGenerator(object):
     # data should be given as a dict:
@@ -83,64 +89,186 @@ class RandomNumberGenerator(object):
         self.location=float(parameters.get('location',0))
         self.rate=float(parameters.get('rate',0))
         self.obj = obj
-
-    def generateNumber(self):
-        from Globals import G
-        if(self.distributionType=="Fixed"):     #if the distribution is Fixed 
-            return self.mean
-        elif(self.distributionType=="Exp"):     #if the distribution is Exponential
-            return G.Rnd.expovariate(1.0/(self.mean))
-        elif(self.distributionType=="Normal"):      #if the distribution is Normal
-            if self.max < self.min:
-                 raise ValueError("Normal distribution for %s uses wrong "
-                                  "parameters. max (%s) > min (%s)" % (
-                                    self.obj.id, self.max, self.min))
-            while 1:
-                number=G.Rnd.normalvariate(self.mean, self.stdev)
-                if number>self.max or number<self.min and max!=0:  #if the number is out of bounds repeat the process                                                                      #if max=0 this means that we did not have time "time" bounds             
-                    continue
-                else:           #if the number is in the limits stop the process
-                    return number
-        elif self.distributionType=="Gamma" or self.distributionType=="Erlang":    #if the distribution is gamma or erlang
-            # in case shape is given instead of alpha
+        # in case shape is given instead of alpha
+        if self.distributionType in ["Gamma", "Erlang"]:
             if not self.alpha:
                 self.alpha=self.shape
             # in case rate is given instead of beta
-            if not self.beta:
-                self.beta=1/float(self.rate)          
-            return G.Rnd.gammavariate(self.alpha, self.beta)
-        elif(self.distributionType=="Logistic"):     #if the distribution is Logistic
+            if not self.beta and self.rate:
+                self.beta=1/float(self.rate)
+        from Globals import G
+        if G.rngBlockSize and self.distributionType!="Fixed":
+            self.streamKey=self.getStreamKey()
+            self.generateNumber=self.getBlockSampler(G.rngBlockSize)
+        else:
+            self.generateNumber=self.getSampler()
+
+    # =======================================================================
+    # returns a function that draws one number of the distribution
+    # from the random number generator of G
+    # =======================================================================
+    def getSampler(self):
+        from Globals import G
+        distributionType=self.distributionType
+        if(distributionType=="Fixed"):     #if the distribution is Fixed 
+            mean=self.mean
+            return lambda: mean
+        elif(distributionType=="Exp"):     #if the distribution is Exponential
+            mean=self.mean
+            return lambda: G.Rnd.expovariate(1.0/mean)
+        elif(distributionType=="Normal"):      #if the distribution is Normal
+            if self.max < self.min:
+                return self.raiseNormalBoundsError
+            mean, stdev, minimum, maximum=self.mean, self.stdev, self.min, self.max
+            def sampleNormal():
+                while 1:
+                    number=G.Rnd.normalvariate(mean, stdev)
+                    if number>maximum or number<minimum:  #if the number is out of bounds repeat the process
+                        continue
+                    else:           #if the number is in the limits stop the process
+                        return number
+            return sampleNormal
+        elif distributionType=="Gamma" or distributionType=="Erlang":    #if the distribution is gamma or erlang
+            alpha, beta=self.alpha, self.beta
+            return lambda: G.Rnd.gammavariate(alpha, beta)
+        elif(distributionType=="Logistic"):     #if the distribution is Logistic
             # XXX from http://stackoverflow.com/questions/3955877/generating-samples-from-the-logistic-distribution
             # to check
-            while 1:
-                x = G.Rnd.random()
-                number=self.location + self.scale * math.log(x / (1-x))
-                if number>0:
-                    return number
-                else:
-                    continue
-        elif(self.distributionType=="Geometric"):     #if the distribution is Geometric
-            return G.numpyRnd.random.geometric(self.probability)
-        elif(self.distributionType=="Lognormal"):     #if the distribution is Lognormal
+            location, scale=self.location, self.scale
+            def sampleLogistic():
+                while 1:
+                    x = G.Rnd.random()
+                    number=location + scale * math.log(x / (1-x))
+                    if number>0:
+                        return number
+            return sampleLogistic
+        elif(distributionType=="Geometric"):     #if the distribution is Geometric
+            probability=self.probability
+            return lambda: G.numpyRnd.random.geometric(probability)
+        elif(distributionType=="Lognormal"):     #if the distribution is Lognormal
             # XXX from the files lognormvariate(mu, sigma)
             # it would be better to use same mean,stdev
-            return G.Rnd.lognormvariate(self.logmean, self.logsd)
-        elif(self.distributionType=="Weibull"):     #if the distribution is Weibull
-            return G.Rnd.weibullvariate(self.scale, self.shape)
-        elif(self.distributionType=="Cauchy"):     #if the distribution is Cauchy
+            logmean, logsd=self.logmean, self.logsd
+            return lambda: G.Rnd.lognormvariate(logmean, logsd)
+        elif(distributionType=="Weibull"):     #if the distribution is Weibull
+            scale, shape=self.scale, self.shape
+            return lambda: G.Rnd.weibullvariate(scale, shape)
+        elif(distributionType=="Cauchy"):     #if the distribution is Cauchy
             # XXX from http://www.johndcook.com/python_cauchy_rng.html
-            while 1:
-                p = 0.0
-                while p == 0.0:
-                    p = G.Rnd.random()     
-                number=self.location + self.scale*math.tan(math.pi*(p - 0.5))
-                if number>0:
-                    return number
-                else:
-                    continue
-        elif(self.distributionType=="Triangular"):     #if the distribution is Triangular
-            return G.numpyRnd.random.triangular(left=self.min, right=self.max, mode=self.mean)
+            location, scale=self.location, self.scale
+            def sampleCauchy():
+                while 1:
+                    p = 0.0
+                    while p == 0.0:
+                        p = G.Rnd.random()     
+                    number=location + scale*math.tan(math.pi*(p - 0.5))
+                    if number>0:
+                        return number
+            return sampleCauchy
+        elif(distributionType=="Triangular"):     #if the distribution is Triangular
+            minimum, maximum, mean=self.min, self.max, self.mean
+            return lambda: G.numpyRnd.random.triangular(left=minimum, right=maximum, mode=mean)
+        else:
+            raise ValueError("Unknown distribution %r used in %s %s" %
+                            (distributionType, self.obj.__class__, self.obj.id))
+
+    # =======================================================================
+    # returns a function that draws a block of size numbers of the 
+    # distribution from the given numpy RandomState. Numbers out of the 
+    # bounds of the distribution are dropped, so the block may be shorter
+    # =======================================================================
+    def getBlockDrawer(self):
+        distributionType=self.distributionType
+        if(distributionType=="Exp"):
+            mean=self.mean
+            return lambda stream, size: stream.exponential(mean, size)
+        elif(distributionType=="Normal"):
+            if self.max < self.min:
+                return lambda stream, size: self.raiseNormalBoundsError()
+            mean, stdev, minimum, maximum=self.mean, self.stdev, self.min, self.max
+            def drawNormal(stream, size):
+                numbers=stream.normal(mean, stdev, size)
+                return numbers[(numbers<=maximum)&(numbers>=minimum)]
+            return drawNormal
+        elif distributionType=="Gamma" or distributionType=="Erlang":
+            alpha, beta=self.alpha, self.beta
+            return lambda stream, size: stream.gamma(alpha, beta, size)
+        elif(distributionType=="Logistic"):
+            location, scale=self.location, self.scale
+            def drawLogistic(stream, size):
+                numbers=stream.logistic(location, scale, size)
+                return numbers[numbers>0]
+            return drawLogistic
+        elif(distributionType=="Geometric"):
+            probability=self.probability
+            return lambda stream, size: stream.geometric(probability, size)
+        elif(distributionType=="Lognormal"):
+            logmean, logsd=self.logmean, self.logsd
+            return lambda stream, size: stream.lognormal(logmean, logsd, size)
+        elif(distributionType=="Weibull"):
+            scale, shape=self.scale, self.shape
+            return lambda stream, size: scale*stream.weibull(shape, size)
+        elif(distributionType=="Cauchy"):
+            location, scale=self.location, self.scale
+            def drawCauchy(stream, size):
+                numbers=location + scale*stream.standard_cauchy(size)
+                return numbers[numbers>0]
+            return drawCauchy
+        elif(distributionType=="Triangular"):
+            minimum, maximum, mean=self.min, self.max, self.mean
+            return lambda stream, size: stream.triangular(minimum, mean, maximum, size)
         else:
             raise ValueError("Unknown distribution %r used in %s %s" %
-                            (self.distributionType, self.obj.__class__, self.obj.id))
+                            (distributionType, self.obj.__class__, self.obj.id))
+
+    # =======================================================================
+    # returns a function that serves the numbers from a buffer that is 
+    # refilled with blocks of blockSize numbers drawn from the stream of the 
+    # generator. The stream is restarted from its seed in every replication
+    # =======================================================================
+    def getBlockSampler(self, blockSize):
+        from Globals import G
+        drawBlock=self.getBlockDrawer()
+        buffer=[]
+        state={'rnd':None, 'stream':None}
+        def sampleFromBuffer():
+            # G.Rnd is created again in every replication
+            if state['rnd'] is not G.Rnd:
+                state['rnd']=G.Rnd
+                state['stream']=self.getStream()
+                del buffer[:]
+            while not buffer:
+                # reversed so that the numbers are popped in the order they were drawn
+                buffer.extend(reversed(drawBlock(state['stream'], blockSize).tolist()))
+            return buffer.pop()
+        return sampleFromBuffer
+
+    # =======================================================================
+    # returns the key of the stream of the generator. Every generator of an object
+    # gets the next index among the generators created for the object in the same 
+    # replication (or while building the model)
+    # =======================================================================
+    def getStreamKey(self):
+        from Globals import G
+        key=(G.replicationIndex, self.obj.id)
+        index=G.rngStreamCounts.get(key, 0)
+        G.rngStreamCounts[key]=index+1
+        return key+(index,)
+
+    # =======================================================================
+    # returns the numpy RandomState of the generator for the current replication
+    # =======================================================================
+    def getStream(self):
+        from Globals import G
+        if not G.seed:
+            return numpy.random.RandomState()
+        seed=hashlib.md5('%s/%s/%s' % (G.seed, G.replicationIndex, self.streamKey)).digest()
+        return numpy.random.RandomState(numpy.frombuffer(seed, dtype=numpy.uint32))
 
+    # =======================================================================
+    # the sampler of a Normal distribution with max < min
+    # =======================================================================
+    def raiseNormalBoundsError(self):
+        raise ValueError("Normal distribution for %s uses wrong "
+                         "parameters. max (%s) > min (%s)" % (
+                            self.obj.id, self.max, self.min))
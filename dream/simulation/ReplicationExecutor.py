@@ -0,0 +1,225 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 17 Oct 2026
+
+'''
+'''
+runs the replications of a model over a pool of processes. Every worker builds 
+the model again from the input and runs one replication with the seed of its index. 
+The per-replication results that the objects append to their lists in postProcessing 
+(Working, Blockage, Exits, Lifespan, ...) and the records they keep (e.g. the schedule 
+of the operators) are merged back in replication order.
+The number of processes is given by replicationProcessCount in general, apart from 
+the multiprocessorCount of the plugins that run several scenarios in their own pools
+'''
+
+import json
+import multiprocessing
+from Globals import G
+
+# the input of the model, held by every worker of the pool
+_inputData=None
+
+# ===========================================================================
+# checks if the replications of the built model can be spread over processes
+# ===========================================================================
+def canRunInParallel():
+    if G.replicationProcessCount<=1 or G.numberOfReplications<=1:
+        return False
+    # daemonic processes (e.g. the workers of a pool) are not allowed to have children
+    if multiprocessing.current_process().daemon:
+        return False
+    # the routers that sort the operators by the last record of their schedule use 
+    # the records of the previous replication, so every replication needs the previous one
+    if any(router.dependsOnPreviousReplication for router in getRouters()):
+        return False
+    return True
+
+# ===========================================================================
+# the routers of the built model. The routers of the operated machines
+# are only created when the model is initialized, so their classes are returned
+# ===========================================================================
+def getRouters():
+    if G.RouterList:
+        return G.RouterList
+    return [obj.getRouterClass() for obj in G.ObjList if hasattr(obj, 'getRouterClass')]
+
+# ===========================================================================
+# the objects that keep results of multiple replications 
+# ===========================================================================
+def getResultObjects():
+    return G.ObjList+G.ObjectResourceList+G.RouterList
+
+# ===========================================================================
+# takes a snapshot of the lists of the objects, so that the items 
+# appended by a replication can be identified afterwards
+# ===========================================================================
+def getResultLists():
+    resultLists=[]
+    for obj in getResultObjects():
+        objectLists={}
+        for name, value in vars(obj).iteritems():
+            if isinstance(value, list):
+                objectLists[name]=(value, len(value))
+        resultLists.append(objectLists)
+    return resultLists
+
+# ===========================================================================
+# returns the results that were appended to the lists of the snapshot. 
+# Lists that were replaced (e.g. in initialize) only hold the state of the last replication
+# ===========================================================================
+def getAppendedResults(resultLists):
+    appendedResults=[]
+    for obj, objectLists in zip(getResultObjects(), resultLists):
+        objectResults={}
+        for name, (value, length) in objectLists.iteritems():
+            if getattr(obj, name, None) is value and len(value)>length:
+                appended=value[length:]
+                # lists of objects (e.g. objectInterruptions) are part of the model, not results
+                if isPlainData(appended):
+                    objectResults[name]=appended
+                # records that refer to objects of the model (e.g. the schedule of the operators)
+                elif isRecordList(appended):
+                    objectResults[name]=[encodeRecord(record) for record in appended]
+        appendedResults.append(objectResults)
+    return appendedResults
+
+# ===========================================================================
+# checks if the value is data that can be sent across processes as it is
+# ===========================================================================
+def isPlainData(value):
+    if value is None or isinstance(value, (bool, int, long, float, basestring)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(isPlainData(item) for item in value)
+    if isinstance(value, dict):
+        return all(isPlainData(key) and isPlainData(item) for key, item in value.iteritems())
+    return False
+
+# ===========================================================================
+# checks if the value is a list of records whose items are either plain data 
+# or objects of the model with an id, e.g. {"station": machine, "entranceTime": 10}
+# ===========================================================================
+def isRecordList(value):
+    for record in value:
+        if not isinstance(record, dict):
+            return False
+        for key, item in record.iteritems():
+            if not isPlainData(key):
+                return False
+            if isPlainData(item):
+                continue
+            if not (hasattr(item, 'id') and isPlainData(item.id)):
+                return False
+    return True
+
+# ===========================================================================
+# refers to an object of the model by its class and id, so that the records 
+# that hold it can be sent across processes
+# ===========================================================================
+class ObjectReference(object):
+    def __init__(self, obj):
+        self.objectClass=obj.__class__
+        self.id=obj.id
+    
+    # returns the object of the built model with the same id and class. If the model 
+    # of this process has no such object (e.g. an entity created during the replication) 
+    # an empty object of the class that holds only the id is returned
+    def getObject(self):
+        from Globals import findObjectById
+        obj=findObjectById(self.id)
+        if obj.__class__ is not self.objectClass:
+            obj=self.objectClass.__new__(self.objectClass)
+            obj.id=self.id
+        return obj
+
+# ===========================================================================
+# replaces the objects of a record by references to them
+# ===========================================================================
+def encodeRecord(record):
+    encodedRecord={}
+    for key, item in record.iteritems():
+        if not isPlainData(item):
+            item=ObjectReference(item)
+        encodedRecord[key]=item
+    return encodedRecord
+
+# ===========================================================================
+# replaces the references of a record sent by a worker by the objects of this process
+# ===========================================================================
+def decodeRecord(record):
+    if not isinstance(record, dict):
+        return record
+    decodedRecord={}
+    for key, item in record.iteritems():
+        if isinstance(item, ObjectReference):
+            item=item.getObject()
+        decodedRecord[key]=item
+    return decodedRecord
+
+# ===========================================================================
+# initializes a worker of the pool
+# ===========================================================================
+def initializeWorker(inputData):
+    global _inputData
+    _inputData=inputData
+
+# ===========================================================================
+# builds the model in the worker and runs the given replication
+# ===========================================================================
+def runReplicationInWorker(i):
+    from dream.simulation import LineGenerationJSON
+    G.InputData=_inputData
+    G.JSONData=json.loads(_inputData)
+    LineGenerationJSON.buildModel()
+    resultLists=getResultLists()
+    LineGenerationJSON.runReplication(i)
+    return getAppendedResults(resultLists)
+
+# ===========================================================================
+# runs all the replications of the built model. The last replication is run 
+# in this process while the others run in the pool, so that the state of the 
+# model (entities, trace etc) is the one of the last replication as in a serial run.
+# returns the encoded trace of the last replication
+# ===========================================================================
+def runReplications(inputData):
+    from dream.simulation import LineGenerationJSON
+    lastReplication=G.firstReplication+G.numberOfReplications-1
+    pool=multiprocessing.Pool(processes=min(G.replicationProcessCount, G.numberOfReplications-1),
+                              initializer=initializeWorker, initargs=(inputData,))
+    try:
+        asyncResults=pool.map_async(runReplicationInWorker, range(G.firstReplication, lastReplication))
+        resultLists=getResultLists()
+        encodedTrace=LineGenerationJSON.runReplication(lastReplication)
+        workerResults=asyncResults.get()
+    finally:
+        pool.close()
+        pool.join()
+    # insert the results of the workers in replication order before the ones of the last replication
+    for index, (obj, objectLists) in enumerate(zip(getResultObjects(), resultLists)):
+        for name, (value, length) in objectLists.iteritems():
+            if getattr(obj, name, None) is not value:
+                continue
+            merged=[]
+            for appendedResults in workerResults:
+                merged.extend(decodeRecord(item) for item in appendedResults[index].get(name, []))
+            if merged:
+                value[length:length]=merged
+    return encodedTrace
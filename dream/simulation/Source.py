@@ -60,6 +60,7 @@ class EntityGenerator(object):
                 G.EntityList.append(entity)
                 self.victim.outputTrace(entity.name, "generated")       # output the trace
                 self.victim.getActiveObjectQueue().append(entity)            # append the entity to the resource 
+                self.victim.markQueueChanged()
                 self.victim.numberOfArrivals+=1                              # we have one new arrival
                 G.numberOfEntities+=1
                 self.victim.appendEntity(entity)
@@ -200,6 +201,7 @@ class Source(CoreObject):
             newEntity.currentStation=self                            # update the current station of the Entity
             G.EntityList.append(newEntity)
             self.getActiveObjectQueue().append(newEntity)            # append the entity to the resource 
+            self.markQueueChanged()
             self.numberOfArrivals+=1                              # we have one new arrival
             G.numberOfEntities+=1
             self.appendEntity(newEntity)  
@@ -0,0 +1,315 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 17 Oct 2026
+
+'''
+'''
+sinks that stream the trace of the simulation to a file instead of keeping it in memory,
+and a reader that gives the rows of a trace file back one at a time. 
+The rows are (Simulation Time | Entity Name | message) as in the trace.xls. The cells of the
+route sheet (see PrintRoute) are kept as (firstRow, lastRow, firstColumn, lastColumn, value) 
+and written after the rows when the sink is closed.
+Supported formats:
+    csv        gzip compressed comma separated values, the cells as rows starting with 'cell'
+    jsonl      gzip compressed json lines, one [time, entityName, message] list per line,
+               the cells as {"cell": [...]} lines
+    columnar   binary file of chunks holding the times as float64 and the names and messages
+               as int32 codes of a dictionary that is written along with every chunk. The
+               times that are not written back the same from the float are coded as well.
+               The cells are written in a last chunk as json
+'''
+
+import os
+import gzip
+import StringIO
+import csv
+import json
+import struct
+import tempfile
+import numpy
+
+# the number of rows kept in memory before they are written to the file
+CHUNK_SIZE=10000
+
+# ===========================================================================
+# the abstract trace sink
+# ===========================================================================
+class TraceSink(object):
+    format=None
+    extension=None
+    
+    def __init__(self, path, chunkSize=CHUNK_SIZE):
+        self.path=path
+        self.chunkSize=chunkSize
+        self.rows=[]                # the rows not yet written to the file
+        self.numberOfRows=0         # the total number of rows written
+        self.cells=[]               # the cells of the route sheet, written when the sink is closed
+    
+    # =======================================================================
+    # adds a row to the trace, writing the rows to the file every chunkSize rows
+    # =======================================================================
+    def write(self, time, entityName, message):
+        self.rows.append((time, entityName, message))
+        if len(self.rows)>=self.chunkSize:
+            self.flush()
+    
+    # =======================================================================
+    # writes the rows kept in memory to the file
+    # =======================================================================
+    def flush(self):
+        if self.rows:
+            self.writeChunk(self.rows)
+            self.numberOfRows+=len(self.rows)
+            self.rows=[]
+    
+    def writeChunk(self, rows):
+        raise NotImplementedError("Subclass must define 'writeChunk' method")
+    
+    # =======================================================================
+    # adds a cell, merged over the given rows and columns, to the route sheet
+    # =======================================================================
+    def writeCell(self, firstRow, lastRow, firstColumn, lastColumn, value):
+        self.cells.append((firstRow, lastRow, firstColumn, lastColumn, value))
+    
+    def writeCells(self, cells):
+        raise NotImplementedError("Subclass must define 'writeCells' method")
+    
+    def close(self):
+        self.flush()
+        if self.cells:
+            self.writeCells(self.cells)
+            self.cells=[]
+        self.file.close()
+
+# ===========================================================================
+# a sheet whose cells are written to a sink. It is used as G.routeTraceSheet 
+# so that PrintRoute writes the route of the jobs along with the streamed trace
+# ===========================================================================
+class TraceSinkSheet(object):
+    def __init__(self, sink):
+        self.sink=sink
+    
+    def write(self, row, column, value):
+        self.sink.writeCell(row, row, column, column, value)
+    
+    def write_merge(self, firstRow, lastRow, firstColumn, lastColumn, value):
+        self.sink.writeCell(firstRow, lastRow, firstColumn, lastColumn, value)
+
+# ===========================================================================
+# gzip compressed csv trace
+# ===========================================================================
+class CSVTraceSink(TraceSink):
+    format='csv'
+    extension='.csv.gz'
+    
+    def __init__(self, path, chunkSize=CHUNK_SIZE):
+        TraceSink.__init__(self, path, chunkSize)
+        self.file=gzip.open(path, 'wb')
+        self.writer=csv.writer(self.file)
+    
+    def writeChunk(self, rows):
+        self.writer.writerows([[encode(value) for value in row] for row in rows])
+    
+    # the value is written as json so that numbers are read back as numbers
+    def writeCells(self, cells):
+        self.writer.writerows([['cell']+list(cell[:4])+[json.dumps(cell[4])] for cell in cells])
+
+# ===========================================================================
+# gzip compressed json lines trace
+# ===========================================================================
+class JSONLinesTraceSink(TraceSink):
+    format='jsonl'
+    extension='.jsonl.gz'
+    
+    def __init__(self, path, chunkSize=CHUNK_SIZE):
+        TraceSink.__init__(self, path, chunkSize)
+        self.file=gzip.open(path, 'wb')
+    
+    def writeChunk(self, rows):
+        self.file.write(''.join([json.dumps(row)+'\n' for row in rows]))
+    
+    def writeCells(self, cells):
+        self.file.write(''.join([json.dumps({'cell': cell})+'\n' for cell in cells]))
+
+# ===========================================================================
+# binary columnar trace. Every chunk is written as
+#     'CHNK' | number of rows | size of the new dictionary entries 
+#     | new dictionary entries as a json list | times | time codes | name codes | message codes
+# the time code is -1 if the time is the float written back as a string. The cells are
+# written in a last chunk
+#     'CELL' | number of cells | size of the cells | the cells as a json list
+# ===========================================================================
+class ColumnarTraceSink(TraceSink):
+    format='columnar'
+    extension='.trace'
+    magic='MPTRACE2'
+    
+    def __init__(self, path, chunkSize=CHUNK_SIZE):
+        TraceSink.__init__(self, path, chunkSize)
+        self.file=open(path, 'wb')
+        self.file.write(self.magic)
+        self.codes={}               # the code of every name or message written
+        self.newEntries=[]          # the names and messages coded since the last chunk
+    
+    def getCode(self, value):
+        code=self.codes.get(value)
+        if code is None:
+            code=self.codes[value]=len(self.codes)
+            self.newEntries.append(value)
+        return code
+    
+    # the code of a time that is not the string of its float (e.g. '0' and not '0.0'), -1 if it is
+    def getTimeCode(self, time, floatTime):
+        if str(floatTime)==time:
+            return -1
+        return self.getCode(time)
+    
+    def writeChunk(self, rows):
+        times=numpy.array([float(time) for (time, entityName, message) in rows], dtype='<f8')
+        timeCodes=numpy.array([self.getTimeCode(row[0], time) for (row, time) in zip(rows, times.tolist())], dtype='<i4')
+        names=numpy.array([self.getCode(entityName) for (time, entityName, message) in rows], dtype='<i4')
+        messages=numpy.array([self.getCode(message) for (time, entityName, message) in rows], dtype='<i4')
+        entries=json.dumps(self.newEntries)
+        self.newEntries=[]
+        self.file.write(struct.pack('<4sII', 'CHNK', len(rows), len(entries)))
+        self.file.write(entries)
+        self.file.write(times.tostring())
+        self.file.write(timeCodes.tostring())
+        self.file.write(names.tostring())
+        self.file.write(messages.tostring())
+    
+    def writeCells(self, cells):
+        entries=json.dumps(cells)
+        self.file.write(struct.pack('<4sII', 'CELL', len(cells), len(entries)))
+        self.file.write(entries)
+
+traceSinkClasses=dict((sinkClass.format, sinkClass) 
+                      for sinkClass in (CSVTraceSink, JSONLinesTraceSink, ColumnarTraceSink))
+
+# ===========================================================================
+# returns the supported streaming trace formats
+# ===========================================================================
+def getSupportedTraceFormats():
+    return tuple(sorted(traceSinkClasses))
+
+# ===========================================================================
+# creates a sink of the given format writing to a new file in directory 
+# (the temporary directory if not given) whose name starts with name
+# ===========================================================================
+def createTraceSink(format, name='trace', directory=None, chunkSize=CHUNK_SIZE):
+    sinkClass=traceSinkClasses.get(format)
+    if sinkClass is None:
+        raise ValueError("Unknown trace format %r, supported formats are %s" % 
+                         (format, ', '.join(getSupportedTraceFormats())))
+    fd, path=tempfile.mkstemp(suffix=sinkClass.extension, prefix=name+'_', dir=directory or None)
+    os.close(fd)
+    return sinkClass(path, chunkSize)
+
+# ===========================================================================
+# reads the closed trace file of a sink and removes it. Returns its content
+# encoded so that it is given in the results as the excel trace is
+# ===========================================================================
+def encodeTraceFile(path):
+    traceFile=open(path, 'rb')
+    try:
+        encodedTrace=traceFile.read().encode('base64')
+    finally:
+        traceFile.close()
+    os.remove(path)
+    return encodedTrace
+
+# ===========================================================================
+# gives lazily the records of a trace, as ('row', (time, entityName, message))
+# and ('cell', (firstRow, lastRow, firstColumn, lastColumn, value)). 
+# The trace is given as the path of its file or as its encoded content
+# ===========================================================================
+def readTraceRecords(path=None, format=None, encodedTrace=None):
+    if encodedTrace is not None:
+        traceFile=StringIO.StringIO(encodedTrace.decode('base64'))
+    else:
+        traceFile=open(path, 'rb')
+    try:
+        if format=='csv':
+            for row in csv.reader(gzip.GzipFile(fileobj=traceFile, mode='rb')):
+                if len(row)==6 and row[0]=='cell':
+                    yield ('cell', tuple([int(value) for value in row[1:5]]+[json.loads(row[5])]))
+                else:
+                    yield ('row', tuple([value.decode('utf-8') for value in row]))
+        elif format=='jsonl':
+            for line in gzip.GzipFile(fileobj=traceFile, mode='rb'):
+                record=json.loads(line)
+                if isinstance(record, dict):
+                    yield ('cell', tuple(record['cell']))
+                else:
+                    yield ('row', tuple(record))
+        elif format=='columnar':
+            assert traceFile.read(len(ColumnarTraceSink.magic))==ColumnarTraceSink.magic, \
+                    '%s is not a columnar trace file' % (path or 'the trace')
+            entries=[]
+            header=traceFile.read(struct.calcsize('<4sII'))
+            while header:
+                tag, numberOfRows, entriesSize=struct.unpack('<4sII', header)
+                if tag=='CELL':
+                    for cell in json.loads(traceFile.read(entriesSize)):
+                        yield ('cell', tuple(cell))
+                    header=traceFile.read(struct.calcsize('<4sII'))
+                    continue
+                entries.extend(json.loads(traceFile.read(entriesSize)))
+                times=numpy.frombuffer(traceFile.read(8*numberOfRows), dtype='<f8')
+                timeCodes=numpy.frombuffer(traceFile.read(4*numberOfRows), dtype='<i4')
+                names=numpy.frombuffer(traceFile.read(4*numberOfRows), dtype='<i4')
+                messages=numpy.frombuffer(traceFile.read(4*numberOfRows), dtype='<i4')
+                for time, timeCode, name, message in zip(times.tolist(), timeCodes.tolist(), 
+                                                         names.tolist(), messages.tolist()):
+                    if timeCode<0:
+                        time=str(time)
+                    else:
+                        time=entries[timeCode]
+                    yield ('row', (time, entries[name], entries[message]))
+                header=traceFile.read(struct.calcsize('<4sII'))
+        else:
+            raise ValueError("Unknown trace format %r" % (format, ))
+    finally:
+        traceFile.close()
+
+# ===========================================================================
+# gives lazily the (time, entityName, message) rows of a trace
+# ===========================================================================
+def readTrace(path=None, format=None, encodedTrace=None):
+    for kind, record in readTraceRecords(path, format, encodedTrace):
+        if kind=='row':
+            yield record
+
+# ===========================================================================
+# gives the (firstRow, lastRow, firstColumn, lastColumn, value) cells 
+# of the route sheet of a trace
+# ===========================================================================
+def readTraceCells(path=None, format=None, encodedTrace=None):
+    for kind, record in readTraceRecords(path, format, encodedTrace):
+        if kind=='cell':
+            yield record
+
+# ===========================================================================
+# encodes the unicode values as utf-8 for the csv writer
+# ===========================================================================
+def encode(value):
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value
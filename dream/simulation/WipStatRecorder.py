@@ -0,0 +1,109 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+'''
+Created on 17 Oct 2026
+
+'''
+'''
+records the WIP level time series of a station. The samples are appended in amortized 
+constant time to a preallocated array that doubles its size when full. The series can be 
+given back downsampled to a maximum number of points or aggregated to time buckets
+'''
+
+import numpy
+
+# ===========================================================================
+# the WIP time series recorder
+# ===========================================================================
+class WipStatRecorder(object):
+    # the time of the sample and the number of units held at that time
+    dtype=numpy.dtype([('time', numpy.float64), ('wip', numpy.float32)])
+
+    def __init__(self, size=64):
+        self.samples=numpy.empty(size, dtype=self.dtype)
+        self.length=0                           # the number of the samples recorded
+    
+    # =======================================================================
+    # appends a sample, doubling the size of the array if it is full
+    # =======================================================================
+    def record(self, time, wip):
+        if self.length==len(self.samples):
+            samples=numpy.empty(2*len(self.samples), dtype=self.dtype)
+            samples[:self.length]=self.samples
+            self.samples=samples
+        self.samples[self.length]=(time, wip)
+        self.length+=1
+    
+    def __len__(self):
+        return self.length
+    
+    def __getitem__(self, index):
+        time, wip=self.samples[:self.length][index]
+        return [float(time), float(wip)]
+    
+    # =======================================================================
+    # returns the recorded samples as a list of [time, wip] lists. 
+    # If bucketSize is given the series is aggregated to time buckets and
+    # if maxPoints is given it is downsampled to at most maxPoints samples
+    # =======================================================================
+    def tolist(self, maxPoints=None, bucketSize=None):
+        samples=self.samples[:self.length]
+        series=[list(sample) for sample in zip(samples['time'].tolist(), samples['wip'].tolist())]
+        if bucketSize:
+            series=bucketSeries(series, bucketSize)
+        if maxPoints:
+            series=downsampleSeries(series, maxPoints)
+        return series
+
+# ===========================================================================
+# aggregates a WIP series to one sample per time bucket. Every sample 
+# holds the start of the bucket and the time-weighted mean WIP over it
+# ===========================================================================
+def bucketSeries(series, bucketSize):
+    series=[(time, wip) for (time, wip) in series if not time==float('inf')]
+    if len(series)<2:
+        return [list(sample) for sample in series]
+    bucketed=[]
+    bucketStart=series[0][0]
+    area=0
+    for (time, wip), (nextTime, nextWip) in zip(series, series[1:]):
+        # the WIP level holds from time until nextTime, split it over the buckets it covers
+        while nextTime>bucketStart+bucketSize:
+            area+=wip*(bucketStart+bucketSize-max(time, bucketStart))
+            bucketed.append([bucketStart, area/float(bucketSize)])
+            bucketStart+=bucketSize
+            area=0
+        area+=wip*(nextTime-max(time, bucketStart))
+    # the last bucket may be only partly covered
+    lastTime=series[-1][0]
+    if lastTime>bucketStart:
+        bucketed.append([bucketStart, area/float(lastTime-bucketStart)])
+    return bucketed
+
+# ===========================================================================
+# downsamples a WIP series to at most maxPoints samples evenly spread 
+# over it, keeping always the first and the last sample
+# ===========================================================================
+def downsampleSeries(series, maxPoints):
+    if len(series)<=maxPoints:
+        return [list(sample) for sample in series]
+    if maxPoints<2:
+        return [list(series[-1])]
+    indices=numpy.unique(numpy.linspace(0, len(series)-1, maxPoints).round().astype(int))
+    return [list(series[index]) for index in indices]
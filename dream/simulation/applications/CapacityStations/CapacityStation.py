@@ -75,7 +75,9 @@ class CapacityStation(Queue):
         self.detailedWorkPlan=[]    # a list of dicts to keep detailed data
         from dream.simulation.Globals import G
         if hasattr(G, 'CapacityStationList'):
-            G.CapacityStationList.append(self)
+            # the station may be already in the list from a previous replication
+            if not self in G.CapacityStationList:
+                G.CapacityStationList.append(self)
         else:
             G.CapacityStationList=[]
             G.CapacityStationList.append(self)
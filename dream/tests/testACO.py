@@ -0,0 +1,86 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+
+import os
+import json
+import logging
+from unittest import TestCase
+
+from dream.plugins import ACO
+from dream.plugins.plugin import PluginRegistry
+
+project_path = os.path.split(os.path.split(os.path.split(__file__)[0])[0])[0]
+
+class CountingACO(ACO.ACO):
+    """ACO picking the rule of one queue, whose ants are scored by the rule
+    without running the simulation
+    """
+    def __init__(self, logger, configuration_dict):
+        ACO.ACO.__init__(self, logger, configuration_dict)
+        self.run_list = []
+        self.score_list = []
+
+    def createCollatedScenarios(self, data):
+        return {'Q1': ['EDD', 'SPT']}
+
+    def createAntData(self, data, ant):
+        return dict(ant)
+
+    def runOneScenario(self, data):
+        self.run_list.append(data['Q1'])
+        return {'result': {'result_list': [{'general': {}, 'rule': data['Q1']}]}}
+
+    def _calculateAntScore(self, ant):
+        self.score_list.append(ant['Q1'])
+        return ant['Q1'] == 'SPT' and 1 or 2
+
+class ACOTestCase(TestCase):
+    def tearDown(self):
+        ACO.ant_memo.result_dict.clear()
+
+    def runModel(self, antMemoSize):
+        data = json.load(open(os.path.join(project_path, "dream", "plugins",
+                  "testModels", "GUIBOMOpsComplex2ordersACOcomparisonWIPfullShifts.json")))
+        data['general']['antMemoSize'] = antMemoSize
+        result_list = PluginRegistry(logging.getLogger(), data).run(data)['result']['result_list']
+        return json.dumps(result_list, sort_keys=True)
+
+    def testKnownAnts(self):
+        aco = CountingACO(logging.getLogger(), {})
+        data = {'general': {'numberOfGenerations': 4, 'numberOfAntsPerGenerations': 3,
+                            'numberOfSolutions': 2, 'seed': 1},
+                'result': {}}
+        result_list = aco.run(data)['result']['result_list']
+        # every genotype is simulated once, the ants that pick it again
+        # are part of their generation with its result
+        self.assertEquals(sorted(aco.run_list), ['EDD', 'SPT'])
+        self.assertEquals(len(aco.score_list), 4 * 3)
+        self.assertEquals([result['rule'] for result in result_list], ['SPT', 'EDD'])
+
+    def testAntMemo(self):
+        result = self.runModel(0)
+        self.assertFalse(ACO.ant_memo.result_dict)
+        self.assertEquals(self.runModel(10), result)
+        self.assertTrue(ACO.ant_memo.result_dict)
+        # the second run reuses the results of the ants of the first one
+        misses = ACO.ant_memo.misses
+        self.assertEquals(self.runModel(10), result)
+        self.assertEquals(ACO.ant_memo.misses, misses)
+        self.assertTrue(ACO.ant_memo.hits)
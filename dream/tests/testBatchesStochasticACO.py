@@ -0,0 +1,111 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+import logging
+from unittest import TestCase
+
+from dream.plugins.Batches.BatchesStochasticACO import BatchesStochasticACO
+
+class Sheet(object):
+  def write(self, row, column, value):
+    pass
+
+class RacingACO(BatchesStochasticACO):
+  """ACO picking the rule of one queue, whose ants give the units throughput
+  of every replication from a table without running the simulation
+  """
+  throughput_dict = {'A': [10] * 6,
+                     'B': [1] * 6,
+                     'C': [9, 11, 9, 10, 9, 11]}
+
+  def __init__(self, logger, configuration_dict):
+    BatchesStochasticACO.__init__(self, logger, configuration_dict)
+    self.outputSheet = Sheet()
+    self.rowIndex = 0
+    self.run_list = []
+
+  def createCollatedScenarios(self, data):
+    return {'Q1': ['A', 'C']}
+
+  def createAntData(self, data, ant):
+    return dict(ant, general={}, graph={'node': {}, 'edge': {}})
+
+  def runOneScenario(self, data):
+    first_replication = data['general'].get('firstReplication', 0)
+    number_of_replications = data['general'].get('numberOfReplications', 1)
+    self.run_list.append((data['Q1'], first_replication, number_of_replications))
+    units_throughput = self.throughput_dict[data['Q1']][
+      first_replication:first_replication + number_of_replications]
+    return {'result': {'result_list': [{'rule': data['Q1'],
+      'elementList': [{'id': 'E1', '_class': 'Dream.Exit', 'family': 'Exit',
+                       'results': {'unitsThroughput': units_throughput}}]}]}}
+
+  # the interval of an ant is the range of its units throughput
+  def getConfidenceIntervalList(self, value_list_list, confidenceLevel):
+    return [{'lb': min(value_list), 'ub': max(value_list)}
+            for value_list in value_list_list]
+
+class BatchesStochasticACOTestCase(TestCase):
+  """
+  With racing, the ants run more replications only as long as they are not
+  dominated by another ant and the replication budget is not spent.
+  """
+
+  def getAnt(self, rule):
+    return {'Q1': rule, 'key': rule,
+            'input': {'Q1': rule, 'general': {}, 'graph': {'node': {}, 'edge': {}}}}
+
+  def testDominatedAnts(self):
+    aco = RacingACO(logging.getLogger(), {})
+    ant_list = [self.getAnt(rule) for rule in 'ABC']
+    self.assertEquals(aco.raceAnts(ant_list, 6, .95, 100), 14)
+    # B is dropped after the first round, A and C race up to 6 replications
+    self.assertEquals([len(ant['unitsThroughputList']) for ant in ant_list], [6, 2, 6])
+    self.assertEquals([ant['score'] for ant in ant_list], [-10, -1, -59 / 6.])
+    # the replications that follow run with the seeds of their index
+    self.assertEquals([run for run in aco.run_list if run[0] == 'C'],
+                      [('C', 0, 2), ('C', 2, 1), ('C', 3, 1), ('C', 4, 1), ('C', 5, 1)])
+    self.assertEquals(ant_list[2]['unitsThroughputList'], RacingACO.throughput_dict['C'])
+
+  def testReplicationBudget(self):
+    aco = RacingACO(logging.getLogger(), {})
+    ant_list = [self.getAnt(rule) for rule in 'AC']
+    # one more round would go over the budget of 7 replications
+    self.assertEquals(aco.raceAnts(ant_list, 6, .95, 7), 6)
+    self.assertEquals([len(ant['unitsThroughputList']) for ant in ant_list], [3, 3])
+    # the budget is at least the one of the first round
+    aco = RacingACO(logging.getLogger(), {})
+    ant_list = [self.getAnt(rule) for rule in 'AC']
+    self.assertEquals(aco.raceAnts(ant_list, 6, .95, 1), 4)
+
+  def testReturnedAnts(self):
+    aco = RacingACO(logging.getLogger(), {})
+    data = {'general': {'numberOfGenerations': 1, 'numberOfAntsPerGenerations': 2,
+                        'numberOfSolutions': 1, 'seed': 1,
+                        'numberOfAntsForStochasticEvaluationInGeneration': 0,
+                        'numberOfAntsForStochasticEvaluationInTheEnd': 2,
+                        'numberOfReplicationsInTheEnd': 4,
+                        'stochasticEvaluation': 'racing'},
+            'graph': {'node': {}, 'edge': {}},
+            'result': {}}
+    result, = aco.run(data)['result']['result_list']
+    # the returned ant is run again for all the replications it was scored with
+    self.assertEquals(aco.run_list[-1], ('A', 0, 4))
+    self.assertEquals(result['rule'], 'A')
+    self.assertEquals(result['score'], -10)
+    self.assertEquals(result['elementList'][0]['results']['unitsThroughput'], [10] * 4)
@@ -0,0 +1,68 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from unittest import TestCase
+
+import numpy
+
+from dream.KnowledgeExtraction.CleaningPipeline import CleaningPipeline
+from dream.KnowledgeExtraction.DetectOutliers import DetectOutliers
+from dream.KnowledgeExtraction.ReplaceMissingValues import ReplaceMissingValues
+
+class CleaningPipelineTestCase(TestCase):
+    def testReplaceMissingValues(self):
+        # the empty cells read by xlrd are unicode strings
+        data = ['', 1., u'', 3.]
+        self.assertEquals(ReplaceMissingValues().DeleteMissingValue(data), [1., 3.])
+        self.assertTrue(ReplaceMissingValues().ReplaceWithMean(data) is data)
+        self.assertEquals(data, [2., 1., 2., 3.])
+        self.assertEquals(ReplaceMissingValues().ReplaceWithZero(['2', '', '5']), ['2', 0., '5'])
+        self.assertEquals(ReplaceMissingValues().ReplaceWithMedian([4., '', 1., 2.]), [4., 2., 1., 2.])
+
+    def testDetectOutliers(self):
+        # Q1=2.75 and Q3=9.5, so the inner fences are [-7.375,19.625] and the outer fences [-17.5,29.75]
+        data = [1, 2, 3, 4, 5, 6, 20, 100]
+        self.assertEquals(DetectOutliers().DeleteOutliers(data), [1, 2, 3, 4, 5, 6])
+        self.assertEquals(DetectOutliers().DeleteExtremeOutliers(data), [1, 2, 3, 4, 5, 6, 20])
+        self.assertEquals(DetectOutliers().DeleteOutliers(['1', '2', '3', '40']), ['1', '2', '3'])
+
+    def testPipeline(self):
+        random = numpy.random.RandomState(4)
+        columns = {}
+        for name, length in [('M1', 200), ('M2', 200), ('M3', 57), ('M4', 1)]:
+            values = list(random.lognormal(1, 1, length))
+            for i in random.randint(0, length, length // 10):
+                values[i] = ''
+            columns[name] = values
+        # the steps on all the columns at once give the same values as the methods on every column
+        for steps, methods in [(['deleteMissingValues', 'deleteOutliers'], ['DeleteMissingValue', 'DeleteOutliers']),
+                               (['replaceWithMean', 'deleteExtremeOutliers'], ['ReplaceWithMean', 'DeleteExtremeOutliers']),
+                               (['replaceWithMedian'], ['ReplaceWithMedian']),
+                               (['replaceWithZero', 'deleteOutliers'], ['ReplaceWithZero', 'DeleteOutliers'])]:
+            cleaned = CleaningPipeline(steps).run(columns)
+            for name, values in columns.iteritems():
+                values = list(values)
+                for method in methods:
+                    if hasattr(DetectOutliers, method):
+                        values = getattr(DetectOutliers(), method)(values)
+                    else:
+                        values = getattr(ReplaceMissingValues(), method)(values)
+                numpy.testing.assert_allclose(cleaned[name], values, rtol=1e-15)
+        self.assertEquals(CleaningPipeline().deleteMissingValues().run([[], ['', u'']])[1].tolist(), [])
+        self.assertRaises(ValueError, CleaningPipeline, ['deleteEverything'])
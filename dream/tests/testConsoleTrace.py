@@ -0,0 +1,52 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import sys
+import StringIO
+from unittest import TestCase
+
+from dream.simulation.Globals import G
+from dream.simulation.ManPyObject import ManPyObject, setConsoleTrace
+from dream.simulation.ObjectInterruption import ObjectInterruption
+
+class ConsoleTraceTestCase(TestCase):
+    def tearDown(self):
+        G.console = 'No'
+        setConsoleTrace(False)
+
+    def testDisabledTraceDoesNotFormat(self):
+        setConsoleTrace(False)
+        interruption = ObjectInterruption(id='I1')
+        def message():
+            raise AssertionError('the message should not be formatted')
+        interruption.printTrace('router', message)
+        ManPyObject.printTrace('E1', received='')
+
+    def testEnabledTracePrints(self):
+        setConsoleTrace(True)
+        interruption = ObjectInterruption(id='I1')
+        interruption.env = type('Environment', (object, ), {'now': 5})()
+        stdout = sys.stdout
+        sys.stdout = StringIO.StringIO()
+        try:
+            interruption.printTrace('router', lambda: ['M1', 'M2'])
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+        self.assertEquals(output, "5 router ['M1', 'M2']\n")
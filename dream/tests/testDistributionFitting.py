@@ -0,0 +1,60 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from unittest import TestCase
+
+import numpy
+
+from dream.KnowledgeExtraction.DistributionFitting import Distributions
+from dream.KnowledgeExtraction.DistributionFitting import DistFittest
+from dream.KnowledgeExtraction.DistributionFitting import kstest
+
+class DistributionFittingTestCase(TestCase):
+    def setUp(self):
+        DistFittest.cache.clear()
+
+    def testFittedParameters(self):
+        random = numpy.random.RandomState(1)
+        distributions = Distributions()
+        fit = distributions.Normal_distrfit(random.normal(10, 2, 2000))
+        self.assertAlmostEquals(fit['mean'], 10, places=0)
+        self.assertAlmostEquals(fit['stdev'], 2, places=0)
+        fit = distributions.Gamma_distrfit(random.gamma(3, 1 / 2., 2000))
+        self.assertAlmostEquals(fit['shape'], 3, places=0)
+        self.assertAlmostEquals(fit['rate'], 2, places=0)
+        fit = distributions.Weibull_distrfit(5 * random.weibull(1.5, 2000))
+        self.assertAlmostEquals(fit['shape'], 1.5, places=1)
+        self.assertAlmostEquals(fit['scale'], 5, places=0)
+        self.assertEquals(distributions.Lognormal_distrfit([-1, 2, 3]), None)
+
+    def testKolmogorovSmirnovTest(self):
+        random = numpy.random.RandomState(2)
+        data = list(random.gamma(2, 4, 500))
+        distFittest = DistFittest()
+        fit = distFittest.ks_test(data)
+        # the best fitting distribution is the one with the minimum D parameter
+        DList = [kstest(data, methodName)[1] for distributionType, methodName in DistFittest.distributionList]
+        self.assertEquals(fit['distributionType'], DistFittest.distributionList[DList.index(min(DList))][0])
+        self.assertEquals(distFittest.Gam_kstest(data)[0], kstest(data, 'Gamma_distrfit')[1])
+        # the result is cached and the callers get a copy of it
+        distributionType = fit['distributionType']
+        fit['distributionType'] = 'Fixed'
+        self.assertEquals(DistFittest().ks_test(data)['distributionType'], distributionType)
+        DistFittest.cache.clear()
+        self.assertEquals(DistFittest(processes=2).ks_test(data), DistFittest().ks_test(data))
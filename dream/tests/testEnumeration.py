@@ -0,0 +1,44 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+
+import os
+import json
+import logging
+from unittest import TestCase
+
+from dream.plugins.plugin import PluginRegistry
+
+project_path = os.path.split(os.path.split(os.path.split(__file__)[0])[0])[0]
+
+class EnumerationTestCase(TestCase):
+    def runModel(self, multiprocessorCount):
+        data = json.load(open(os.path.join(project_path, "dream", "plugins",
+                  "testModels", "CapacityProjectEnumeration7orders.json")))
+        data['general']['multiprocessorCount'] = multiprocessorCount
+        result_list = PluginRegistry(logging.getLogger(), data).run(data)['result']['result_list']
+        # the order of the elements follows the one of the graph nodes, which
+        # is not stable across copies of the data
+        return [(result['key'], result['score'],
+                 sorted(result['elementList'], key=lambda element: element['id']))
+                    for result in result_list]
+
+    def testParallelScenarios(self):
+        # scenarios run in a pool give the same results than the ones run in this process
+        self.assertEquals(self.runModel(3), self.runModel(1))
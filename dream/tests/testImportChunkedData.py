@@ -0,0 +1,129 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import os
+import sqlite3
+import tempfile
+import zipfile
+from unittest import TestCase
+
+import numpy
+import xlrd
+
+from dream.KnowledgeExtraction.ImportChunkedData import ImportChunkedData, toChunks
+from dream.KnowledgeExtraction.CleaningPipeline import CleaningPipeline
+from dream.KnowledgeExtraction.ImportCSVdata import ImportCSVdata
+from dream.KnowledgeExtraction.ImportExceldata import ImportExceldata
+from dream.KnowledgeExtraction.StatisticalMeasures import RunningMeasures
+
+PILOT_CASES = os.path.join(os.path.dirname(__file__), '..', 'KnowledgeExtraction', 'PilotCases')
+
+class ImportChunkedDataTestCase(TestCase):
+    def testCSVChunks(self):
+        fd, fileName = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w') as csvFile:
+            csvFile.write('MA,Part,ProcTime\n')
+            for i in range(10):
+                csvFile.write('M%d,P%d,%s\n' % (i % 2, i, '' if i == 4 else i * 1.5))
+        try:
+            chunks = list(ImportChunkedData().CSV_chunks(fileName, chunkSize=4))
+            self.assertEquals([len(chunk['ProcTime']) for chunk in chunks], [4, 4, 2])
+            columns = ImportChunkedData().Input_data(chunks)
+            self.assertEquals(columns['MA'].dtype, object)
+            self.assertTrue(numpy.isnan(columns['ProcTime'][4]))
+            # the same values as ImportCSVdata
+            dictData = ImportCSVdata().Input_data(fileName)
+            self.assertEquals(list(columns['Part']), dictData['Part'])
+            self.assertEquals(list(columns['ProcTime'][5:]), map(float, dictData['ProcTime'][5:]))
+            chunks = list(ImportChunkedData().CSV_chunks(fileName, columns=['ProcTime']))
+            self.assertEquals(chunks[0].keys(), ['ProcTime'])
+        finally:
+            os.remove(fileName)
+
+    def testDatabaseChunks(self):
+        connection = sqlite3.connect(':memory:')
+        connection.execute('create table ProcessingTimes (station text, duration real)')
+        connection.executemany('insert into ProcessingTimes values (?, ?)',
+                               [('St%d' % (i % 3), None if i == 7 else i / 2.) for i in range(20)])
+        chunks = list(ImportChunkedData().Database_chunks(connection.cursor(),
+                            'select station, duration from ProcessingTimes where station != ?', ('St2',), chunkSize=5))
+        self.assertEquals(len(chunks), 3)
+        columns = ImportChunkedData().Input_data(chunks)
+        self.assertEquals(len(columns['duration']), 14)
+        self.assertEquals(numpy.isnan(columns['duration']).sum(), 1)
+
+    def testXLSXChunks(self):
+        fileName = os.path.join(PILOT_CASES, 'DemandPlanning', 'Input7PPOS.xlsx')
+        workbook = xlrd.open_workbook(fileName)
+        sheetName = workbook.sheet_names()[0]
+        # the same columns as the ones read by xlrd
+        columns = ImportChunkedData().Input_data(ImportChunkedData().XLSX_chunks(fileName, sheetName, chunkSize=10))
+        dictData = ImportExceldata().Input_data(sheetName, workbook)
+        self.assertEquals(set(columns), set(dictData))
+        for name, values in dictData.iteritems():
+            self.assertEquals(len(columns[name]), len(values))
+            # the empty cells are NaN in the numeric columns
+            if columns[name].dtype == float:
+                numpy.testing.assert_array_equal(columns[name],
+                                                 [numpy.nan if value == '' else value for value in values])
+            else:
+                self.assertEquals(list(columns[name]), values)
+
+    def testRunningMeasures(self):
+        data = numpy.random.RandomState(3).normal(100, 15, 1000)
+        data[10] = numpy.nan
+        runningMeasures = RunningMeasures()
+        for chunk in numpy.array_split(data, 7):
+            runningMeasures.update(chunk)
+        values = data[~numpy.isnan(data)]
+        self.assertEquals((runningMeasures.length, runningMeasures.missing), (999, 1))
+        self.assertAlmostEquals(runningMeasures.mean, values.mean(), places=10)
+        self.assertAlmostEquals(runningMeasures.var(), values.var(ddof=1), places=8)
+        self.assertEquals((runningMeasures.min, runningMeasures.max), (values.min(), values.max()))
+
+    def testMissingRelationship(self):
+        fd, fileName = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
+        archive = zipfile.ZipFile(fileName, 'w')
+        archive.writestr('xl/workbook.xml',
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>')
+        archive.writestr('xl/_rels/workbook.xml.rels',
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"/>')
+        archive.close()
+        try:
+            self.assertRaises(ValueError, list, ImportChunkedData().XLSX_chunks(fileName, 'Sheet1'))
+        finally:
+            os.remove(fileName)
+
+    def testReplaceMissing(self):
+        rows = [['Part', 'ProcTime']] + [['P%d' % i, '' if i % 4 == 1 else i * 1.5] for i in range(10)]
+        columns = ImportChunkedData().Input_data(toChunks(rows, 3))
+        # the mean is read in a first pass, the missing values are replaced in a second one
+        measuresDict = ImportChunkedData().Running_measures(toChunks(rows, 3))
+        self.assertEquals(measuresDict.keys(), ['ProcTime'])
+        replaced = ImportChunkedData().Input_data(
+            ImportChunkedData().Replace_with_mean(toChunks(rows, 3), measuresDict))
+        cleaned = CleaningPipeline(['replaceWithMean']).run([columns['ProcTime']])[0]
+        numpy.testing.assert_array_almost_equal(replaced['ProcTime'], cleaned)
+        self.assertEquals(list(replaced['Part']), list(columns['Part']))
+        replaced = ImportChunkedData().Input_data(
+            ImportChunkedData().Replace_with_zero(toChunks(rows, 3), ['ProcTime']))
+        self.assertEquals(list(replaced['ProcTime']), [0 if i % 4 == 1 else i * 1.5 for i in range(10)])
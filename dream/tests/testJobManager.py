@@ -0,0 +1,127 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import time
+from unittest import TestCase
+
+from dream.simulation.Globals import reportProgress
+from dream.platform.JobManager import JobManager, PENDING, RUNNING, SUCCEEDED, \
+    FAILED, CANCELLED, TIMEOUT, FINISHED_STATE_LIST
+
+def reportingJob(count):
+  for i in range(count):
+    reportProgress(replication=i, numberOfReplications=count)
+  return dict(success=True, data=count)
+
+def sleepingJob(duration):
+  time.sleep(duration)
+  return dict(success=True, data=duration)
+
+def failingJob():
+  raise ValueError("failed")
+
+class JobManagerTestCase(TestCase):
+  """
+  The jobs run in their own processes, at most max_running at the same time,
+  and report their progress events until they finish, are cancelled or time out.
+  """
+
+  def setUp(self):
+    self.job_manager = JobManager(max_running=1)
+
+  def waitForJob(self, job, timeout=30):
+    deadline = time.time() + timeout
+    while job.state not in FINISHED_STATE_LIST:
+      self.assertTrue(time.time() < deadline, "job %s did not finish" % job.id)
+      time.sleep(.05)
+
+  def waitForState(self, job, state, timeout=30):
+    deadline = time.time() + timeout
+    while job.state != state:
+      self.assertTrue(time.time() < deadline, "job %s is %s" % (job.id, job.state))
+      time.sleep(.05)
+
+  def testSubmit(self):
+    job = self.job_manager.submit(reportingJob, (3, ))
+    self.assertTrue(self.job_manager.getJob(job.id) is job)
+    self.waitForJob(job)
+    self.assertEquals(job.state, SUCCEEDED)
+    self.assertEquals(job.result, dict(success=True, data=3))
+
+  def testProgressEvents(self):
+    job = self.job_manager.submit(reportingJob, (3, ))
+    self.waitForJob(job)
+    status = job.getStatus()
+    self.assertEquals([event['replication'] for event in status['events']], [0, 1, 2])
+    self.assertEquals(status['progress']['replication'], 2)
+    self.assertEquals(status['next'], 3)
+    # only the events after since are given
+    status = job.getStatus(since=2)
+    self.assertEquals([event['replication'] for event in status['events']], [2])
+    self.assertEquals(job.getStatus(since=3)['events'], [])
+
+  def testFailure(self):
+    job = self.job_manager.submit(failingJob)
+    self.waitForJob(job)
+    self.assertEquals(job.state, FAILED)
+    self.assertTrue('ValueError' in job.result['error'])
+
+  def testCancel(self):
+    job = self.job_manager.submit(sleepingJob, (30, ))
+    self.waitForState(job, RUNNING)
+    job.cancel()
+    self.assertEquals(job.state, CANCELLED)
+    job.process.join(5)
+    self.assertFalse(job.process.is_alive())
+
+  def testTimeout(self):
+    start = time.time()
+    job = self.job_manager.submit(sleepingJob, (30, ), timeout=1)
+    self.waitForJob(job)
+    self.assertEquals(job.state, TIMEOUT)
+    self.assertTrue(time.time() - start < 10)
+
+  def testQueuedJobs(self):
+    first_job = self.job_manager.submit(sleepingJob, (30, ))
+    second_job = self.job_manager.submit(sleepingJob, (0, ), timeout=5)
+    third_job = self.job_manager.submit(sleepingJob, (0, ))
+    # only one job runs, the others wait for its slot
+    self.assertEquals(first_job.state, RUNNING)
+    self.assertEquals((second_job.state, third_job.state), (PENDING, PENDING))
+    self.assertEquals(self.job_manager.getStatistics(),
+                      dict(max_running=1, running=1, pending=2))
+    # a pending job that is cancelled is never started
+    third_job.cancel()
+    self.assertEquals(third_job.process, None)
+    first_job.cancel()
+    self.waitForJob(second_job)
+    self.assertEquals(second_job.state, SUCCEEDED)
+    self.assertEquals(third_job.state, CANCELLED)
+    # the slot is given back once the job has finished
+    deadline = time.time() + 5
+    while self.job_manager.getStatistics()['running'] and time.time() < deadline:
+      time.sleep(.05)
+    self.assertEquals(self.job_manager.getStatistics(),
+                      dict(max_running=1, running=0, pending=0))
+
+  def testFinishedJobs(self):
+    job = self.job_manager.submitFinished(dict(success=True, data=1))
+    self.assertEquals(job.state, SUCCEEDED)
+    self.assertTrue(self.job_manager.getJob(job.id) is job)
+    self.assertEquals(self.job_manager.getStatistics()['running'], 0)
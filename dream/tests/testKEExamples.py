@@ -109,8 +109,8 @@ class KnowledgeExtractionExamples(TestCase):
         result1,result2,result3 = main(test=1,csvFile=csvFile)
         self.assertEquals(result1[0],0.0)
         self.assertEquals(result1[1],1.0)
-        self.assertEquals(result2[0],0.4719902587261917)
-        self.assertEquals(result2[1],0.5545222108338084)
+        self.assertAlmostEquals(result2[0],0.4719902587261917,places=14)
+        self.assertAlmostEquals(result2[1],0.5545222108338084,places=14)
         self.assertEquals(result3[0],1.0)
         self.assertEquals(result3[1],1.0)
         
@@ -0,0 +1,137 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import threading
+import urllib
+from unittest import TestCase
+
+import xlrd
+
+from dream import platform
+from dream.platform.ResultCache import ResultCache, getCodeVersion
+from dream.platform.KnowledgeExtractionExecutor import KnowledgeExtractionExecutor, \
+    getKnowledgeExtractionColumns, fitColumn, getColumnKey, FIT_CODE_PACKAGE_LIST
+
+project_path = os.path.split(os.path.split(os.path.split(__file__)[0])[0])[0]
+workbook_path = os.path.join(project_path, "dream", "KnowledgeExtraction",
+                             "KEtool_examples", "AssembleDismantle", "inputData.xls")
+
+def sleepingFitColumn(args):
+  time.sleep(30)
+  return fitColumn(args)
+
+class KnowledgeExtractionExecutorTestCase(TestCase):
+  """
+  The columns fitted over a pool of processes must have the same fits as the
+  columns fitted one after another, and the cached fits are not fitted again.
+  """
+
+  def setUp(self):
+    self.cache_dir = tempfile.mkdtemp()
+    self.column_dict = getKnowledgeExtractionColumns(
+      xlrd.open_workbook(workbook_path), ['M1'])
+
+  def tearDown(self):
+    shutil.rmtree(self.cache_dir)
+
+  def testColumns(self):
+    # the worksheets of the times to failure and to repair are named TTFs and TTR
+    self.assertEquals(sorted(self.column_dict),
+                      [('M1', 'TTF'), ('M1', 'TTR'), ('M1', 'processingTime')])
+    # the empty cells are not fitted
+    self.assertFalse([value for value in self.column_dict[('M1', 'TTF')]
+                      if not isinstance(value, float)])
+
+  def testParallelFits(self):
+    serial_result = dict((column_id, fit) for column_id, fit, error in
+      KnowledgeExtractionExecutor(processes=1).run(self.column_dict))
+    parallel_result = dict((column_id, fit) for column_id, fit, error in
+      KnowledgeExtractionExecutor(processes=3).run(self.column_dict))
+    self.assertEquals(serial_result, parallel_result)
+    self.assertEquals(len(parallel_result), 3)
+
+  def testFitCache(self):
+    executor = KnowledgeExtractionExecutor(processes=2,
+                                           fit_cache=ResultCache(self.cache_dir))
+    first_result = dict((column_id, fit) for column_id, fit, error in
+                        executor.run(self.column_dict))
+    # only the edited column is fitted again
+    column_dict = dict(self.column_dict)
+    column_dict[('M1', 'TTR')] = column_dict[('M1', 'TTR')][:-1]
+    second_result = dict((column_id, fit) for column_id, fit, error in
+                         executor.run(column_dict))
+    statistics = executor.getStatistics()
+    self.assertEquals((statistics['fitted'], statistics['cached']), (4, 2))
+    self.assertEquals(second_result[('M1', 'processingTime')],
+                      first_result[('M1', 'processingTime')])
+
+  def testColumnKey(self):
+    values = self.column_dict[('M1', 'TTR')]
+    key = getColumnKey(values)
+    self.assertNotEquals(getColumnKey(values[:-1]), key)
+    # the fits of another version of the fitting code are not used
+    self.assertEquals(getColumnKey(values, getCodeVersion(FIT_CODE_PACKAGE_LIST)), key)
+    self.assertNotEquals(getColumnKey(values, 'other version'), key)
+    self.assertNotEquals(getCodeVersion(FIT_CODE_PACKAGE_LIST), getCodeVersion())
+
+  def testPartialResult(self):
+    parameter_dict = dict(general=dict(ke_url=urllib.pathname2url(workbook_path)),
+                          graph=dict(node=dict(M1=dict(processingTime={}))))
+    # no column is fitted in no time, the result is partial
+    result = platform._runKnowledgeExtraction(parameter_dict, timeout=0)
+    self.assertTrue(result['success'])
+    self.assertEquals(result['unfitted'], ['M1/TTF', 'M1/TTR', 'M1/processingTime'])
+    result = platform._runKnowledgeExtraction(parameter_dict)
+    self.assertFalse(result.get('partial'))
+    node = result['data']['graph']['node']['M1']
+    self.assertTrue(node['processingTime']['distribution'] in node['processingTime'])
+    self.assertTrue('TTR' in node['interruptions']['failure'])
+
+  def testSingleColumnTimeout(self):
+    # a single column fitted by a single process is terminated at the timeout too
+    module = sys.modules['dream.platform.KnowledgeExtractionExecutor']
+    module.fitColumn = sleepingFitColumn
+    try:
+      executor = KnowledgeExtractionExecutor(processes=1)
+      start = time.time()
+      column_dict = {('M1', 'TTR'): self.column_dict[('M1', 'TTR')]}
+      self.assertEquals(list(executor.run(column_dict, timeout=1)), [])
+      self.assertTrue(time.time() - start < 10)
+      self.assertEquals(executor.getStatistics()['timeouts'], 1)
+    finally:
+      module.fitColumn = fitColumn
+
+  def testBusy(self):
+    # the requests are refused while --keruns extractions run
+    slots = platform.knowledge_extraction_slots
+    platform.knowledge_extraction_slots = threading.BoundedSemaphore(1)
+    try:
+      platform.knowledge_extraction_slots.acquire()
+      response = platform.app.test_client().post('/runKnowledgeExtraction',
+        data=json.dumps(dict(general=dict(ke_url=urllib.pathname2url(workbook_path)))),
+        content_type='application/json')
+      self.assertEquals(response.status_code, 503)
+    finally:
+      platform.knowledge_extraction_slots = slots
@@ -0,0 +1,70 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from dream.simulation.Globals import G, ObjectRegistry
+from unittest import TestCase
+
+class DummyObject(object):
+    def __init__(self, id):
+        self.id = id
+
+class ObjectRegistryTestCase(TestCase):
+    def setUp(self):
+        self.savedLists = dict((name, getattr(G, name)) for name in ObjectRegistry.listNames)
+        for name in ObjectRegistry.listNames:
+            setattr(G, name, [])
+        self.registry = ObjectRegistry()
+
+    def tearDown(self):
+        for name, objectList in self.savedLists.items():
+            setattr(G, name, objectList)
+
+    def testFirstMatchOrder(self):
+        machine, entity, otherMachine = DummyObject('M1'), DummyObject('M1'), DummyObject('M1')
+        G.EntityList.append(entity)
+        self.assertTrue(self.registry.findObjectById('M1') is entity)
+        G.ObjList.extend([machine, otherMachine])
+        self.assertTrue(self.registry.findObjectById('M1') is machine)
+        self.assertEquals(self.registry.findObjectById('missing'), None)
+
+    def testFollowsAppendedAndReplacedLists(self):
+        G.EntityList.append(DummyObject('E1'))
+        self.assertEquals(self.registry.findObjectById('E2'), None)
+        G.EntityList.append(DummyObject('E2'))
+        self.assertEquals(self.registry.findObjectById('E2').id, 'E2')
+        G.EntityList = [DummyObject('E3')]
+        self.assertEquals(self.registry.findObjectById('E1'), None)
+        self.assertEquals(self.registry.findObjectById('E3').id, 'E3')
+
+    def testFollowsRemovedObjects(self):
+        first, second = DummyObject('E1'), DummyObject('E2')
+        G.EntityList.extend([first, second])
+        self.assertTrue(self.registry.findObjectById('E1') is first)
+        # a removal followed by an append keeps the length of the list
+        G.EntityList.remove(first)
+        G.EntityList.append(DummyObject('E3'))
+        self.assertEquals(self.registry.findObjectById('E1'), None)
+        self.assertEquals(self.registry.findObjectById('E3').id, 'E3')
+        self.assertEquals(self.registry.findObjectsByIds(['E2', 'E3'], 'EntityList'),
+                          G.EntityList)
+
+    def testFindObjectsByIds(self):
+        G.ObjList.extend([DummyObject('Q1'), DummyObject('M1'), DummyObject('M2')])
+        found = self.registry.findObjectsByIds(['M2', 'Q1', 'missing'])
+        self.assertEquals([obj.id for obj in found], ['Q1', 'M2'])
@@ -0,0 +1,49 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from dream.simulation import LineGenerationJSON
+import json
+import os
+from unittest import TestCase
+
+project_path = os.path.split(os.path.split(os.path.split(__file__)[0])[0])[0]
+
+class OperatorRouterTestCase(TestCase):
+    def runModel(self, outputStatistics):
+        file_path = os.path.join(project_path, "dream", "simulation", "JSONInputs", "BOMOps2.json")
+        input_data = json.load(open(file_path))
+        for node in input_data['graph']['node'].values():
+            if node['_class'] == 'dream.simulation.OperatorRouter.Router':
+                node['outputStatistics'] = outputStatistics
+        result = json.loads(LineGenerationJSON.main(input_data=json.dumps(input_data)))
+        return result['result']['result_list'][0]['elementList']
+
+    def testStatistics(self):
+        elementList = self.runModel(True)
+        routerResults = [element['results'] for element in elementList if element['_class'] == 'Dream.Router']
+        self.assertEquals(len(routerResults), 1)
+        results = routerResults[0]
+        self.assertTrue(results['invocations'][0] > 0)
+        # the queues that did not change since the previous invocation are not sorted again
+        self.assertTrue(results['skipped_sorts'][0] > 0)
+        self.assertEquals(sorted(results['phase_time'][0]),
+                          ['findCandidateOperators', 'findPending', 'findStationsForOperators', 'sortOperators'])
+        # the statistics are only output if requested and do not change the results
+        self.assertEquals([element for element in elementList if element['_class'] != 'Dream.Router'],
+                          self.runModel(False))
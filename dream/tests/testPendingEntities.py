@@ -0,0 +1,54 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+from dream.simulation.PendingEntities import PendingEntities
+from dream.simulation.Entity import Entity
+from unittest import TestCase
+
+class PendingEntitiesTestCase(TestCase):
+    def testInsertionOrder(self):
+        first, second, third = Entity('E1'), Entity('E2'), Entity('E3')
+        pendingEntities = PendingEntities([first, second])
+        pendingEntities.append(third)
+        pendingEntities.append(first)
+        self.assertEquals(list(pendingEntities), [first, second, third])
+        pendingEntities.remove(second)
+        self.assertFalse(second in pendingEntities)
+        self.assertRaises(ValueError, pendingEntities.remove, second)
+        # an entity added again goes to the end
+        pendingEntities.append(second)
+        self.assertEquals(list(pendingEntities), [first, third, second])
+        self.assertEquals(len(pendingEntities), 3)
+
+    def testStationViews(self):
+        queue, machine = object(), object()
+        first, second = Entity('E1', currentStation=queue), Entity('E2', currentStation=queue)
+        pendingEntities = PendingEntities([first, second])
+        self.assertEquals(pendingEntities.atStation(queue), [first, second])
+        # the entities that move are found at their new station, in the order they were added
+        second.currentStation = machine
+        first.currentStation = machine
+        self.assertEquals(pendingEntities.atStation(queue), [])
+        self.assertEquals(pendingEntities.atStation(machine), [first, second])
+        self.assertTrue(pendingEntities.isAtStation(second, machine))
+        self.assertEquals(pendingEntities.getStations(), [machine])
+        # the entities that are not pending any more are not followed
+        pendingEntities.remove(first)
+        first.currentStation = queue
+        self.assertEquals(pendingEntities.atStation(queue), [])
+        self.assertEquals(pendingEntities.atStation(machine), [second])
@@ -0,0 +1,63 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+
+import os
+import json
+import logging
+from copy import deepcopy
+from unittest import TestCase
+
+from dream.plugins.plugin import PluginRegistry, copyMutatedData
+
+project_path = os.path.split(os.path.split(os.path.split(__file__)[0])[0])[0]
+
+class PluginRegistryTestCase(TestCase):
+    def loadModel(self, filename):
+        return json.load(open(os.path.join(project_path, "dream", "plugins",
+                                           "testModels", filename)))
+
+    def testCopyMutatedData(self):
+        data = {'graph': {'node': {}}, 'input': {'BOM': []}}
+        copied = copyMutatedData(data, ('input',))
+        self.assertTrue(copied['graph'] is data['graph'])
+        self.assertFalse(copied['input'] is data['input'])
+        copied = copyMutatedData(data, None)
+        self.assertFalse(copied['graph'] is data['graph'])
+
+    def testDeclaredPluginsKeepOtherKeys(self):
+        for filename in ('GUIJobShop2ordersWIPSetupWIP.json', 'GUICapacityProject01.json'):
+            data = self.loadModel(filename)
+            registry = PluginRegistry(logging.getLogger(), data)
+            for plugin in registry.input_preparation_list:
+                before = deepcopy(data)
+                data = plugin.preprocess(data)
+                for key in set(before) - set(plugin.mutated_key_list or before):
+                    self.assertEquals(before[key], data[key],
+                      '%s modified %s' % (plugin.__class__.__name__, key))
+
+    def testStatistics(self):
+        data = self.loadModel('GUIJobShop2ordersWIPSetupWIP.json')
+        registry = PluginRegistry(logging.getLogger(), data)
+        registry.run(data)
+        self.assertEquals(len(registry.statistics_list),
+                          len(registry.input_preparation_list) +
+                          len(registry.output_preparation_list) + 1)
+        for statistics in registry.statistics_list:
+            self.assertTrue(statistics['time'] >= 0)
@@ -0,0 +1,85 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from random import Random
+from unittest import TestCase
+
+import simpy
+
+from dream.simulation.Job import Job
+from dream.simulation.Queue import Queue
+
+class QueueDisciplinesTestCase(TestCase):
+    def makeJobs(self, number, seed=1):
+        random = Random(seed)
+        jobs = []
+        for i in range(number):
+            route = [{'stationIdsList': ['M%d' % step],
+                      'processingTime': {'Fixed': {'mean': random.choice([0.1, 0.5, 1, 2])}}}
+                     for step in range(random.randint(1, 4))]
+            jobs.append(Job('J%d' % i, route=route, priority=random.randint(0, 2), dueDate=random.randint(0, 5)))
+        return jobs
+
+    def makeQueue(self, schedulingRule, jobs):
+        queue = Queue('Q1', 'Queue', schedulingRule=schedulingRule)
+        queue.Res = simpy.Resource(simpy.Environment())
+        queue.Res.users.extend(jobs)
+        return queue
+
+    def testRemainingProcessingTime(self):
+        job = self.makeJobs(1)[0]
+        job.remainingRoute = [{'processingTime': {'Fixed': {'mean': 0.1}}}, {'processingTime': {}},
+                              {'processingTime': {'Fixed': {'mean': '0.2'}}}, {}]
+        self.assertEquals(job.getRemainingProcessingTime(), 0.1 + 0.2)
+        self.assertEquals(job.getProcessingTimeInNextStep(), 0.1)
+        # the times follow the steps removed from or inserted in the remaining route
+        firstStep = job.remainingRoute.pop(0)
+        self.assertEquals(job.getRemainingProcessingTime(), 0.2)
+        self.assertEquals(job.getProcessingTimeInNextStep(), 0)
+        job.remainingRoute.insert(0, {'processingTime': {'Fixed': {'mean': 3}}})
+        self.assertEquals(job.getRemainingProcessingTime(), 3.2)
+        job.remainingRoute = [firstStep]
+        self.assertEquals(job.getRemainingProcessingTime(), 0.1)
+        job.remainingRoute.pop(0)
+        self.assertEquals(job.getRemainingProcessingTime(), 0)
+        self.assertRaises(IndexError, job.getProcessingTimeInNextStep)
+
+    def testSingleCriterion(self):
+        jobs = self.makeJobs(50)
+        descending = {'NumStages': lambda x: len(x.remainingRoute),
+                      'RPC': lambda x: sum([float(step['processingTime']['Fixed']['mean']) for step in x.remainingRoute]),
+                      'LPT': lambda x: x.remainingRoute[0]['processingTime']['Fixed']['mean']}
+        for criterion, key in descending.items():
+            queue = self.makeQueue(criterion, jobs)
+            queue.sortEntities()
+            self.assertEquals(queue.Res.users, sorted(jobs, key=key, reverse=True))
+        queue = self.makeQueue('FIFO', jobs)
+        queue.sortEntities()
+        self.assertEquals(queue.Res.users, jobs)
+
+    def testMultipleCriteria(self):
+        jobs = self.makeJobs(200)
+        for schedulingRule in ('MC-Priority-EDD', 'MC-NumStages-RPC', 'MC-Priority-MS-FIFO', 'MC-SPT-LPT-EDD'):
+            queue = self.makeQueue(schedulingRule, jobs)
+            queue.sortEntities()
+            # the same order as sorting by each criterion, starting from the last
+            expected = self.makeQueue(schedulingRule, jobs)
+            for criterion in reversed(expected.multipleCriterionList):
+                expected.activeQSorter(criterion)
+            self.assertEquals(queue.Res.users, expected.Res.users)
@@ -18,6 +18,8 @@
 # ===========================================================================
 
 from dream.simulation.RandomNumberGenerator import RandomNumberGenerator
+from dream.simulation.Globals import G
+from random import Random
 from unittest import TestCase
 
 from dream.simulation.Source import Source
@@ -84,3 +86,28 @@ class RandomNumberGeneratorTestCase(TestCase):
         self.assertRaises(ValueError, RandomNumberGenerator,
             obj, distribution='Unknown')
 
+    def testBlockSampling(self):
+        saved = (G.rngBlockSize, G.seed, G.replicationIndex, G.rngStreamCounts, G.Rnd)
+        try:
+            G.rngBlockSize, G.seed, G.replicationIndex = 8, 1, 0
+            G.rngStreamCounts = {}
+            G.Rnd = Random(1)
+            rng = RandomNumberGenerator(obj, distribution={'Exp': {'mean':10}})
+            numbers = [rng.generateNumber() for i in range(20)]
+            self.assertTrue(min(numbers) >= 0)
+            # adding the generator of an other object does not change the stream
+            G.rngStreamCounts = {}
+            G.Rnd = Random(1)
+            other = Source(id='other_obj', name="Other obj")
+            RandomNumberGenerator(other, distribution={'Exp': {'mean':10}}).generateNumber()
+            rng = RandomNumberGenerator(obj, distribution={'Exp': {'mean':10}})
+            self.assertEquals([rng.generateNumber() for i in range(20)], numbers)
+            # a new replication restarts the stream from the seed of the replication
+            G.Rnd = Random(2)
+            G.replicationIndex = 1
+            self.assertNotEquals([rng.generateNumber() for i in range(20)], numbers)
+            G.Rnd = Random(3)
+            G.replicationIndex = 0
+            self.assertEquals([rng.generateNumber() for i in range(20)], numbers)
+        finally:
+            G.rngBlockSize, G.seed, G.replicationIndex, G.rngStreamCounts, G.Rnd = saved
@@ -0,0 +1,94 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from dream.simulation import LineGenerationJSON
+from dream.simulation.Globals import G
+import json
+import os
+from unittest import TestCase
+
+
+project_path = os.path.split(os.path.split(os.path.split(__file__)[0])[0])[0]
+
+class ReplicationExecutorTestCase(TestCase):
+  """
+  Replications spread over a pool of processes (replicationProcessCount in general)
+  must give the same output as the replications ran one after another.
+  """
+
+  def runTopology(self, filename, numberOfReplications, replicationProcessCount, firstReplication=0):
+    file_path = os.path.join(project_path, "dream", "simulation",
+                             "JSONInputs", filename)
+    input_file = open(file_path, "r")
+    input_data = json.loads(input_file.read())
+    input_file.close()
+    input_data['general']['numberOfReplications'] = numberOfReplications
+    input_data['general']['replicationProcessCount'] = replicationProcessCount
+    input_data['general']['firstReplication'] = firstReplication
+    result = LineGenerationJSON.main(input_data=json.dumps(input_data))
+    result_data = json.loads(result)['result']['result_list'][0]
+    del result_data["general"]["totalExecutionTime"]
+    return json.dumps(result_data, indent=True, sort_keys=True)
+
+  def checkTopology(self, filename, numberOfReplications=4):
+    serial_result = self.runTopology(filename, numberOfReplications, 1)
+    parallel_result = self.runTopology(filename, numberOfReplications, 3)
+    self.assertEquals(serial_result, parallel_result, "outputs are different")
+
+  def testStochasticLine(self):
+    self.checkTopology("Topology63.json")
+
+  def testOperatedJobShop(self):
+    # the router sorts the operators by the last record of their schedule, 
+    # kept from the previous replication, so the replications are run one after another
+    self.checkTopology("BOMOps1.json", numberOfReplications=3)
+
+  def getOperatorSchedules(self):
+    schedules = {}
+    for operator in G.OperatorsList:
+      schedule = schedules[operator.id] = []
+      for record in operator.schedule:
+        try:
+          station_id = record["station"].id
+        except AttributeError:
+          station_id = record["station"]["id"]
+        entity = record.get("entity")
+        schedule.append((station_id, record["entranceTime"], record.get("exitTime"),
+                         entity is not None and entity.id))
+    return schedules
+
+  def testOperatorSchedules(self):
+    # the records of the schedules of the operators refer to the objects of the model
+    self.checkTopology("Topology46.json", numberOfReplications=3)
+    self.runTopology("Topology46.json", 3, 1)
+    serial_schedules = self.getOperatorSchedules()
+    self.runTopology("Topology46.json", 3, 3)
+    parallel_schedules = self.getOperatorSchedules()
+    self.assertTrue(all(serial_schedules.values()))
+    self.assertEquals(serial_schedules, parallel_schedules)
+
+  def testFirstReplication(self):
+    # the replications following the ones already run can be run later
+    def getThroughput(result):
+      return [element['results']['throughput'] for element in json.loads(result)['elementList']
+                if element.get('family') == 'Exit']
+    serial_result = getThroughput(self.runTopology("Topology63.json", 4, 1))
+    for replicationProcessCount in (1, 3):
+      result = getThroughput(self.runTopology("Topology63.json", 2, replicationProcessCount, firstReplication=2))
+      self.assertEquals(result, [throughput[2:] for throughput in serial_result])
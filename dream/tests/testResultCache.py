@@ -0,0 +1,115 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import os
+import json
+import shutil
+import tempfile
+from unittest import TestCase
+
+import dream.platform
+from dream.platform.ResultCache import ResultCache, getCacheKey, \
+    getCodeVersion, isDeterministic
+
+def fakeRunSimulation(parameter_dict):
+  return dict(success=True, data=parameter_dict['general'].get('seed'))
+
+class ResultCacheTestCase(TestCase):
+  """
+  The results are kept by the hash of the model and of the code, the least
+  recently used are evicted once the cache is over its size.
+  """
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def testHitAndMiss(self):
+    cache = ResultCache(self.directory)
+    self.assertEquals(cache.get('key'), None)
+    cache.put('key', dict(success=True, data=1))
+    self.assertEquals(cache.get('key'), dict(success=True, data=1))
+    statistics = cache.getStatistics()
+    self.assertEquals((statistics['hits'], statistics['misses'], statistics['entries']),
+                      (1, 1, 1))
+    self.assertEquals(statistics['hit_ratio'], .5)
+
+  def testEviction(self):
+    result = dict(success=True, data='x' * 100)
+    entry_size = len(json.dumps(result))
+    cache = ResultCache(self.directory, max_size=2 * entry_size)
+    cache.put('first', result)
+    cache.put('second', result)
+    # the first result was used last, the second one is evicted
+    os.utime(cache.getPath('second'), (1, 1))
+    os.utime(cache.getPath('first'), (2, 2))
+    cache.put('third', result)
+    self.assertEquals(cache.get('second'), None)
+    self.assertEquals(cache.get('first'), result)
+    self.assertEquals(cache.get('third'), result)
+    statistics = cache.getStatistics()
+    self.assertEquals((statistics['evictions'], statistics['entries']), (1, 2))
+    self.assertEquals(statistics['size'], 2 * entry_size)
+
+  def testCacheKey(self):
+    data = dict(general=dict(seed=1, processTimeout=10), nodes={}, result={})
+    key = getCacheKey(data)
+    # the volatile fields are left out
+    self.assertEquals(getCacheKey(dict(general=dict(seed=1), nodes={})), key)
+    self.assertNotEquals(getCacheKey(dict(general=dict(seed=2), nodes={})), key)
+    # the results of another version of the code are not used
+    self.assertEquals(getCacheKey(data, getCodeVersion()), key)
+    self.assertNotEquals(getCacheKey(data, 'other version'), key)
+
+  def testDeterministic(self):
+    self.assertTrue(isDeterministic(dict(general=dict(seed=1))))
+    self.assertFalse(isDeterministic(dict(general=dict(seed=''))))
+    self.assertFalse(isDeterministic(dict(general={})))
+
+  def runSimulation(self, parameter_dict):
+    response = dream.platform.app.test_client().post('/runSimulation',
+      data=json.dumps(parameter_dict), content_type='application/json')
+    return json.loads(response.data)
+
+  def testRunSimulation(self):
+    saved = (dream.platform.result_cache, dream.platform.worker_pool,
+             dream.platform._runSimulation)
+    cache = ResultCache(self.directory)
+    dream.platform.result_cache = cache
+    dream.platform.worker_pool = None
+    dream.platform._runSimulation = fakeRunSimulation
+    try:
+      # the models without a seed are always run and never cached
+      self.assertEquals(self.runSimulation(dict(general={})),
+                        dict(success=True, data=None))
+      self.assertEquals(cache.getStatistics()['entries'], 0)
+      self.assertEquals(cache.getStatistics()['misses'], 0)
+      # the models with a seed are cached after their first run
+      self.assertEquals(self.runSimulation(dict(general=dict(seed=1))),
+                        dict(success=True, data=1))
+      self.assertEquals(self.runSimulation(dict(general=dict(seed=1))),
+                        dict(success=True, data=1))
+      statistics = cache.getStatistics()
+      self.assertEquals((statistics['hits'], statistics['misses'], statistics['entries']),
+                        (1, 1, 1))
+    finally:
+      (dream.platform.result_cache, dream.platform.worker_pool,
+       dream.platform._runSimulation) = saved
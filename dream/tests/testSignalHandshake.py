@@ -0,0 +1,82 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from random import Random
+from unittest import TestCase
+
+from dream.simulation.CoreObject import CoreObject
+from dream.simulation.Globals import G
+from dream.simulation.Globals import getClassFromName
+from dream.simulation.Globals import getMethodFromName
+from dream.simulation.Machine import Machine
+
+class Environment(object):
+    now = 0
+
+class Station(object):
+    def __init__(self, timeLastEntityLeft, timeLastEntityEnded):
+        self.timeLastEntityLeft = timeLastEntityLeft
+        self.timeLastEntityEnded = timeLastEntityEnded
+
+class LastReceiverFirst(CoreObject):
+    def selectReceiver(self, possibleReceivers=[]):
+        return possibleReceivers[-1]
+
+class SignalHandshakeTestCase(TestCase):
+    def setUp(self):
+        self.env = G.env = Environment()
+
+    def createObject(self, objectClass=CoreObject):
+        activeObject = objectClass.__new__(objectClass)
+        activeObject.env = self.env
+        return activeObject
+
+    def getSelectionOrder(self, select, candidates):
+        candidates = list(candidates)
+        order = []
+        while candidates:
+            order.append(select(candidates))
+            candidates.remove(order[-1])
+        return order
+
+    def testSelectionOrder(self):
+        random = Random(1)
+        activeObject = self.createObject()
+        for i in range(2000):
+            self.env.now = random.choice([0, 5, 10.5])
+            times = [0, self.env.now, self.env.now - 1, self.env.now - 2.5]
+            candidates = [Station(random.choice(times), random.choice(times)) for j in range(random.randint(1, 6))]
+            # the same order as selecting again among the ones that are left
+            self.assertEquals(list(activeObject.iterateReceivers(candidates)),
+                              self.getSelectionOrder(CoreObject.selectReceiver, candidates))
+            self.assertEquals(list(activeObject.iterateGivers(candidates)),
+                              self.getSelectionOrder(CoreObject.selectGiver, candidates))
+
+    def testOverriddenSelection(self):
+        candidates = [Station(0, 0) for i in range(3)]
+        activeObject = self.createObject(LastReceiverFirst)
+        self.assertEquals(list(activeObject.iterateReceivers(candidates)), candidates[::-1])
+        self.assertEquals(len(candidates), 3)
+
+    def testResolvedNames(self):
+        # the names are resolved once and the same objects are returned afterwards
+        self.assertTrue(getClassFromName('Dream.Machine') is Machine)
+        method = getMethodFromName('Dream.Machine.isOperated')
+        self.assertEquals(method, Machine.isOperated)
+        self.assertTrue(getMethodFromName('Dream.Machine.isOperated') is method)
@@ -0,0 +1,56 @@
+# ===========================================================================
+# Copyright 2013 University of Limerick
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import math
+from unittest import TestCase
+
+from dream.KnowledgeExtraction.StatisticalMeasures import StatisticalMeasures
+from dream.KnowledgeExtraction.StatisticalMeasures import tQuantile
+from dream.KnowledgeExtraction.ConfidenceIntervals import ConfidenceIntervals
+
+class StatisticalMeasuresTestCase(TestCase):
+    def testTQuantile(self):
+        # the t distribution has closed form quantiles for one and two degrees of freedom
+        for p in (0.6, 0.9, 0.95, 0.975, 0.995):
+            self.assertAlmostEquals(tQuantile(p, 1) / math.tan(math.pi * (p - 0.5)), 1, places=14)
+            self.assertAlmostEquals(tQuantile(p, 2) / ((2 * p - 1) / math.sqrt(2 * p * (1 - p))), 1, places=14)
+        self.assertAlmostEquals(tQuantile(0.975, 9), 2.262157162798, places=12)
+        self.assertEquals(tQuantile(0.025, 9), -tQuantile(0.975, 9))
+
+    def testMeasures(self):
+        data = [3., 1., 4., 1., 5., 9., 2., 6.]
+        measures = StatisticalMeasures().measures(data)
+        # the same definitions as the R functions
+        self.assertEquals(measures['quantile'], [1., 1.75, 3.5, 5.25, 9.])
+        self.assertEquals(measures['IQR'], 3.5)
+        self.assertEquals(measures['mean'], 3.875)
+        self.assertAlmostEquals(measures['var'], 7.553571428571429, places=14)
+        self.assertAlmostEquals(measures['mad'], 1.4826 * 2, places=14)
+        self.assertEquals(StatisticalMeasures().frequency(data)[1.], 2)
+
+    def testBatchedMeasures(self):
+        dataList = [[1., 2., 4.], [3., 5., 6., 10.], [7., 7.5, 9.], [2.]]
+        measuresList = StatisticalMeasures().measuresList(dataList)
+        for data, measures in zip(dataList[:3], measuresList):
+            self.assertEquals(measures, StatisticalMeasures().measures(data))
+        # the variance of one value is not defined
+        self.assertTrue(math.isnan(measuresList[3]['var']))
+        intervalList = ConfidenceIntervals().ConfidIntervalsList(dataList[:3], 0.95)
+        for data, interval in zip(dataList, intervalList):
+            self.assertEquals(interval, ConfidenceIntervals().ConfidIntervals(data, 0.95))
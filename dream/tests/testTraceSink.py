@@ -0,0 +1,84 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import os
+import json
+import shutil
+import tempfile
+from unittest import TestCase
+
+from dream.simulation.TraceSink import createTraceSink, readTrace, readTraceCells, getSupportedTraceFormats
+from dream.simulation.TraceSink import encodeTraceFile, TraceSinkSheet
+from dream.simulation.LineGenerationJSON import main as simulate_line_json
+from dream.plugins.ParseTraceFile import ParseTraceFile
+
+class TraceSinkTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testRoundTrip(self):
+        rows = [(str(float(i)), u'Part%s' % (i % 3), u'ended processing in M\xe1 %s' % i)
+                    for i in range(25)]
+        # the times are read back as they were written, as in the excel trace
+        rows[:2] = [('0', u'Part0', u'got into Q1'), ('1e-07', u'Part0', u'released Q1')]
+        cells = [(0, 0, 0, 0, 'Time/Machines'), (0, 0, 1, 3, 'M1'), (1, 1, 0, 0, 0.5), (1, 1, 1, 1, u'J\xe1')]
+        for format in getSupportedTraceFormats():
+            sink = createTraceSink(format, 'trace', self.directory, chunkSize=10)
+            for row in rows:
+                sink.write(*row)
+            sheet = TraceSinkSheet(sink)
+            sheet.write(0, 0, 'Time/Machines')
+            sheet.write_merge(0, 0, 1, 3, 'M1')
+            sheet.write(1, 0, 0.5)
+            sheet.write(1, 1, u'J\xe1')
+            sink.close()
+            self.assertEquals(list(readTrace(sink.path, format)), rows, format)
+            self.assertEquals(list(readTraceCells(sink.path, format)), cells, format)
+            # the encoded trace is read the same and its file is removed
+            encodedTrace = encodeTraceFile(sink.path)
+            self.assertEquals(list(readTrace(format=format, encodedTrace=encodedTrace)), rows, format)
+            self.assertEquals(list(readTraceCells(format=format, encodedTrace=encodedTrace)), cells, format)
+        self.assertEquals(os.listdir(self.directory), [])
+
+    def testStreamedSimulationTrace(self):
+        data = json.loads(open(os.path.join(os.path.dirname(__file__),
+                      '..', 'simulation', 'JSONInputs', 'Topology01.json')).read())
+        data['general']['trace'] = 'Yes'
+        data['general']['traceFormat'] = 'jsonl'
+        data['general']['traceDirectory'] = self.directory
+        data['general']['numberOfReplications'] = 3
+        result = json.loads(simulate_line_json(input_data=json.dumps(data)))
+        traceRecord = [record for record in result['result']['result_list'][0]['elementList']
+                          if record['id'] == 'TraceFile'][0]
+        self.assertEquals(traceRecord['results']['trace_format'], 'jsonl')
+        rows = list(readTrace(format='jsonl', encodedTrace=traceRecord['results']['trace_data']))
+        self.assertTrue(rows)
+        self.assertEquals(len(rows[0]), 3)
+        # the trace is given in the results, no file is left
+        self.assertEquals(os.listdir(self.directory), [])
+        # the excel file is produced only when the trace is parsed
+        result = ParseTraceFile(None, {'output_id': 'trace'}).postprocess(result)
+        self.assertTrue(result['result']['result_list'][0]['trace']['data'])
+        # the replications spread over processes do not leave their files either
+        data['general']['replicationProcessCount'] = 2
+        result = json.loads(simulate_line_json(input_data=json.dumps(data)))
+        self.assertEquals(os.listdir(self.directory), [])
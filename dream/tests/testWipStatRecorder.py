@@ -0,0 +1,83 @@
+# ===========================================================================
+# Copyright 2014 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+from dream.simulation.WipStatRecorder import WipStatRecorder, bucketSeries, downsampleSeries
+from dream.simulation.CoreObject import CoreObject
+from unittest import TestCase
+
+class Environment(object):
+    now = 0
+
+class Resource(object):
+    def __init__(self):
+        self.users = []
+
+class Entity(object):
+    def __init__(self, numberOfUnits):
+        self.numberOfUnits = numberOfUnits
+
+class WipStatRecorderTestCase(TestCase):
+    def testRecordGrowsBuffer(self):
+        recorder = WipStatRecorder(size=2)
+        for i in range(100):
+            recorder.record(i, i % 7)
+        self.assertEquals(len(recorder), 100)
+        self.assertEquals(recorder[0], [0., 0.])
+        self.assertEquals(recorder[-1], [99., 1.])
+        self.assertEquals(recorder.tolist()[50], [50., 1.])
+
+    def testBucketSeries(self):
+        series = [[0, 0], [1, 2], [2.5, 1], [4, 3], [4, 2], [10, 0]]
+        bucketed = bucketSeries(series, 3)
+        self.assertEquals([time for (time, wip) in bucketed], [0, 3, 6, 9])
+        self.assertAlmostEquals(bucketed[0][1], 3.5 / 3)
+        self.assertAlmostEquals(bucketed[1][1], 5. / 3)
+        self.assertAlmostEquals(bucketed[3][1], 2)
+
+    def testDownsampleSeries(self):
+        series = [[i, i] for i in range(1000)]
+        downsampled = downsampleSeries(series, 10)
+        self.assertEquals(len(downsampled), 10)
+        self.assertEquals(downsampled[0], [0, 0])
+        self.assertEquals(downsampled[-1], [999, 999])
+        self.assertEquals(downsampleSeries(series[:5], 10), series[:5])
+
+    def testRecordWipStatCountsQueue(self):
+        station = CoreObject.__new__(CoreObject)
+        station.env = Environment()
+        station.Res = Resource()
+        station.wipStatList = WipStatRecorder()
+        station.wipUnits = None
+        # the initial WIP is counted from the queue at the first record
+        station.Res.users.extend([Entity(10), Entity(1)])
+        station.recordWipStat()
+        # then the units of the moves are added to the running count
+        station.env.now = 2
+        station.Res.users.append(Entity(3))
+        station.recordWipStat(3)
+        # the queue changed directly, as the batches are reassembled in place
+        station.env.now = 5
+        station.Res.users[:] = [Entity(4)]
+        station.recountWipUnits()
+        station.recordWipStat()
+        station.env.now = 6
+        station.Res.users.pop()
+        station.recordWipStat(-4)
+        self.assertEquals(station.wipStatList.tolist(),
+                          [[0., 11.], [2., 14.], [5., 4.], [6., 0.]])
@@ -0,0 +1,117 @@
+# ===========================================================================
+# Copyright 2013 Nexedi SA
+#
+# This file is part of DREAM.
+#
+# DREAM is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# DREAM is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with DREAM.  If not, see <http://www.gnu.org/licenses/>.
+# ===========================================================================
+
+import os
+import time
+import threading
+import multiprocessing
+from unittest import TestCase
+
+from dream.platform.WorkerPool import WorkerPool, TimeoutError, QueueFullError
+
+def getProcessId():
+  return os.getpid()
+
+def sleepingJob(duration):
+  time.sleep(duration)
+  return os.getpid()
+
+def failingJob():
+  raise ValueError("failed")
+
+def poolJob(value_list):
+  # the jobs may run their own pools of processes, e.g. ACO
+  pool = multiprocessing.Pool(2)
+  try:
+    return pool.map(abs, value_list)
+  finally:
+    pool.close()
+    pool.join()
+
+class WorkerPoolTestCase(TestCase):
+  """
+  The jobs run in pre-forked workers, the requests over the queue are rejected,
+  the workers of the jobs that time out are killed and the workers are recycled.
+  """
+
+  def setUp(self):
+    self.worker_pool = None
+
+  def tearDown(self):
+    if self.worker_pool is not None:
+      self.worker_pool.close()
+
+  def testRun(self):
+    self.worker_pool = WorkerPool(1)
+    process_id = self.worker_pool.run(getProcessId, 10)
+    self.assertNotEquals(process_id, os.getpid())
+    # the same worker runs the next job
+    self.assertEquals(self.worker_pool.run(getProcessId, 10), process_id)
+    self.assertTrue('ValueError' in self.worker_pool.run(failingJob, 10)['error'])
+    self.assertEquals(self.worker_pool.getStatistics()['completed'], 3)
+
+  def testChildProcesses(self):
+    self.worker_pool = WorkerPool(1)
+    self.assertEquals(self.worker_pool.run(poolJob, 30, [-1, 2, -3]), [1, 2, 3])
+
+  def testClose(self):
+    self.worker_pool = WorkerPool(2)
+    process_id_list = [worker.process.pid for worker in self.worker_pool.worker_set]
+    self.worker_pool.close()
+    for process_id in process_id_list:
+      self.assertRaises(OSError, os.kill, process_id, 0)
+    # closing again does nothing
+    self.worker_pool.close()
+
+  def testQueueFull(self):
+    self.worker_pool = WorkerPool(1, max_queue=0)
+    thread = threading.Thread(target=self.worker_pool.run, args=(sleepingJob, 10, 1))
+    thread.start()
+    try:
+      deadline = time.time() + 10
+      while not self.worker_pool.getStatistics()['busy']:
+        self.assertTrue(time.time() < deadline, "the job did not start")
+        time.sleep(.05)
+      self.assertRaises(QueueFullError, self.worker_pool.run, getProcessId, 10)
+      self.assertEquals(self.worker_pool.getStatistics()['rejected'], 1)
+    finally:
+      thread.join()
+    # the request is accepted once the worker is idle again
+    self.assertTrue(self.worker_pool.run(getProcessId, 10))
+
+  def testTimeout(self):
+    self.worker_pool = WorkerPool(1)
+    process_id = self.worker_pool.run(getProcessId, 10)
+    start = time.time()
+    self.assertRaises(TimeoutError, self.worker_pool.run, sleepingJob, 1, 30)
+    self.assertTrue(time.time() - start < 10)
+    # the worker was killed and replaced by a new one
+    self.assertRaises(OSError, os.kill, process_id, 0)
+    self.assertNotEquals(self.worker_pool.run(getProcessId, 10), process_id)
+    self.assertEquals(self.worker_pool.getStatistics()['timeouts'], 1)
+
+  def testRecycling(self):
+    self.worker_pool = WorkerPool(1, max_jobs=2)
+    first_process_id = self.worker_pool.run(getProcessId, 10)
+    self.assertEquals(self.worker_pool.run(getProcessId, 10), first_process_id)
+    # the worker ran max_jobs jobs, the next job runs in a new one
+    second_process_id = self.worker_pool.run(getProcessId, 10)
+    self.assertNotEquals(second_process_id, first_process_id)
+    self.assertRaises(OSError, os.kill, first_process_id, 0)
+    self.assertEquals(self.worker_pool.getStatistics()['recycled'], 1)